@@ -0,0 +1,49 @@
+"""
+Measures the time taken by each incremental step of accumulators,
+with accumulated points which are observed (notified on every append)
+and unobserved (appended in place).
+
+Bulk scans are disabled to measure the incremental path.
+
+Usage: python -m benchmarks.accumulator_step
+"""
+import timeit
+from curvepy.points import Points
+from curvepy.reducer import Mean
+
+COUNT = 20000
+
+
+def _accumulators(points):
+    return {
+        'ema': points.ema(0.1),
+        'integral': points.integral(),
+        'accumulator_map': points.accumulator_map(lambda ys: max(ys), 10),
+        'reducer': points.accumulator_map(Mean(), 10),
+    }
+
+
+def _scan(f, observed):
+    f.reset_scan()
+    f.tfm_many = None
+    token = None
+    if observed:
+        token = f.accumulated_points.add_observer(begin=lambda: None, end=lambda: None)
+    try:
+        f.scan(COUNT - 1)
+    finally:
+        if token is not None:
+            f.accumulated_points.remove_observer(token)
+
+
+def main():
+    points = Points([(i, float((i * 7) % 13)) for i in range(COUNT)])
+    print(f'{"accumulator":>16} {"observed (us)":>14} {"unobserved (us)":>16}')
+    for name, f in _accumulators(points).items():
+        observed = timeit.timeit(lambda: _scan(f, True), number=3) / 3
+        unobserved = timeit.timeit(lambda: _scan(f, False), number=3) / 3
+        print(f'{name:>16} {observed / COUNT * 1e6:>14.2f} {unobserved / COUNT * 1e6:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
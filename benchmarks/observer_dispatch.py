@@ -0,0 +1,69 @@
+"""
+Measures the time taken to notify observers of a small update
+as the number of observers with bounded domains grows, and the time
+taken to add and remove an observer.
+
+The index groups bounded domains by length into buckets of powers of 2,
+each sorted by start, so a notification visits O(b log n + m) observers,
+where b is the number of buckets and m is the number of observers
+starting within the longest domain of their bucket before the update.
+Adding or removing an observer is a bisection and a list insertion
+or deletion. The last column is the time taken to notify observers
+after an observer with a long domain is added and removed.
+
+Usage: python -m benchmarks.observer_dispatch
+"""
+import timeit
+from intervalpy import Interval
+from curvepy import curve
+from curvepy.curve import Curve
+
+
+def _observed_curve(count):
+    f = Curve()
+    for i in range(count):
+        f.add_observer(domain=Interval.closed(i, i + 10), begin=lambda: None, end=lambda: None)
+    return f
+
+
+def _notify(f, domain):
+    f.begin_update(domain)
+    f.end_update(domain)
+
+
+def _add_remove(f, count):
+    token = f.add_observer(domain=Interval.closed(count / 2, count / 2 + 10), begin=lambda: None)
+    f.remove_observer(token)
+
+
+def _add_remove_long(f, count):
+    token = f.add_observer(domain=Interval.closed(0, count), begin=lambda: None)
+    f.remove_observer(token)
+
+
+def main():
+    domain = Interval.closed(5, 6)
+    print(f'{"observers":>10} {"linear (us)":>12} {"indexed (us)":>13} {"add/remove (us)":>16} {"after long (us)":>16}')
+    for count in [10, 100, 1000, 10000]:
+        f = _observed_curve(count)
+        number = max(10, 100000 // count)
+        min_count = curve.OBSERVER_INDEX_MIN_COUNT
+        try:
+            curve.OBSERVER_INDEX_MIN_COUNT = count + 1
+            linear = timeit.timeit(lambda: _notify(f, domain), number=number)
+            curve.OBSERVER_INDEX_MIN_COUNT = 0
+            indexed = timeit.timeit(lambda: _notify(f, domain), number=number)
+        finally:
+            curve.OBSERVER_INDEX_MIN_COUNT = min_count
+        observe = timeit.timeit(lambda: _add_remove(f, count), number=number)
+        _add_remove_long(f, count)
+        try:
+            curve.OBSERVER_INDEX_MIN_COUNT = 0
+            after_long = timeit.timeit(lambda: _notify(f, domain), number=number)
+        finally:
+            curve.OBSERVER_INDEX_MIN_COUNT = min_count
+        print(f'{count:>10} {linear / number * 1e6:>12.1f} {indexed / number * 1e6:>13.1f} {observe / number * 1e6:>16.1f} {after_long / number * 1e6:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
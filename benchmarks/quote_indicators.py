@@ -0,0 +1,41 @@
+"""
+Measures the time taken to sample indicators of quotes, including
+indicators of the midpoint of each quote (hl2).
+
+Usage: python -m benchmarks.quote_indicators
+"""
+import timeit
+import numpy as np
+from curvepy.quotes import Quotes
+
+DEGREE = 200
+
+
+def _quotes(count):
+    t = np.arange(count) * 60.0
+    closes = (np.arange(count) % 17).astype(float)
+    return Quotes.from_arrays(t, closes, closes + 1, closes - 1, closes, duration='1m')
+
+
+def _indicators(quotes):
+    return {
+        'close.sma': lambda: quotes.close.sma(DEGREE).sample_points(),
+        'hl2.sma': lambda: quotes.hl2.sma(DEGREE).sample_points(),
+        'ao': lambda: quotes.ao().sample_points(),
+        'alligator': lambda: [f.sample_points() for f in quotes.alligator()],
+    }
+
+
+def main():
+    counts = [3000, 20000]
+    print(f'{"indicator":>10} ' + ' '.join(f'{f"{count} bars (ms)":>16}' for count in counts))
+    results = {}
+    for count in counts:
+        for name, sample in _indicators(_quotes(count)).items():
+            results.setdefault(name, []).append(timeit.timeit(sample, number=3) / 3)
+    for name, times in results.items():
+        print(f'{name:>10} ' + ' '.join(f'{t * 1e3:>16.2f}' for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@ from .extension.tangent import TangentExtension
 from .extension.constant import ConstantExtension
 from .accumulator import Accumulator
 from .aggregate import Aggregate
+from .cache import Cache
+from .compiled import Compiled
 from .constant import Constant
 from .ema import EMA
 from .empty import Empty
@@ -16,8 +18,11 @@ from .offset import Offset
 from .piecewise import Piecewise
 from .points import Points
 from .quotes import Quotes
+from .reducer import Reducer, Sum, Mean, Variance, StandardDeviation, ZScore, LinearWeightedSum, Quantile
+from .registry import Registry
 from .scan import Scan
 from .sin import Sin
 from .sma import SMA
+from .trailing import TrailingExtreme
 from .trend import Trend
 from .accumulator_map import AccumulatorMap
@@ -1,7 +1,9 @@
 import math
+import numpy as np
 from .scan import Scan
 from .points import Points
 from .curve import MIN_STEP
+from . import util
 from intervalpy import Interval
 
 class Accumulator(Scan):
@@ -12,19 +14,54 @@ class Accumulator(Scan):
             tfm,
             interpolation=None,
             uniform=True,
-            min_step=MIN_STEP):
+            min_step=MIN_STEP,
+            tfm_many=None):
+        """
+        If `tfm_many` is specified, it is called with arrays of `x` values,
+        values and the last accumulated value, and returns an array of
+        accumulated values, to accumulate many points at once.
+        """
         assert callable(tfm)
         self.accumulated_points = Points([], interpolation=interpolation, uniform=uniform)
         self.accumulator_transform = tfm
-        super().__init__(func, self._accumulate, min_step=min_step)
+        self.accumulator_transform_many = tfm_many
+        super().__init__(
+            func,
+            self._accumulate,
+            min_step=min_step,
+            tfm_many=self._accumulate_many if tfm_many is not None else None)
 
     def scanned_y(self, x):
         return self.accumulated_points.y(x)
 
+    def scanned_y_many(self, xs):
+        return self.accumulated_points.y_many(xs)
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        mask = util.interval_mask(self.curve.domain, xs) | util.interval_mask(self.domain, xs)
+        if not mask.any():
+            return np.full(len(xs), np.nan)
+        self.scan(np.min(xs[mask]))
+        self.scan(np.max(xs[mask]))
+        ys = self.scanned_y_many(xs[mask])
+        if mask.all():
+            return ys
+        all_ys = np.empty(len(xs), dtype=ys.dtype)
+        all_ys[mask] = ys
+        return util.set_missing(all_ys, ~mask)
+
     def reset_scan(self):
         super().reset_scan()
         self.accumulated_points.reset()
 
+    def get_scan_state(self):
+        # Accumulated values are kept until the state is restored
+        return {}
+
+    def restore_scan_state(self, state):
+        self.accumulated_points.reset(Interval(self.current, math.inf, start_open=True, end_open=True))
+
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         min_step = self.resolve_min_step(min_step)
         return self.accumulated_points.x_previous(x, min_step=min_step, limit=limit) or self.curve.x_previous(x, min_step=min_step, limit=limit)
@@ -33,16 +70,36 @@ class Accumulator(Scan):
         min_step = self.resolve_min_step(min_step)
         return self.accumulated_points.x_next(x, min_step=min_step, limit=limit) or self.curve.x_next(x, min_step=min_step, limit=limit)
 
+    def x_grid(self):
+        # Values are accumulated at the `x` values of the function
+        return self.curve.x_grid()
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        min_step = self.resolve_min_step(min_step)
+        return self.curve.x_range(domain, min_step=min_step)
+
     def begin_update(self, domain):
         self.accumulated_points.reset(domain)
         super().begin_update(domain)
 
     def _accumulate(self, x, y):
-        if self.accumulated_points.domain.is_empty:
+        last_point = self.accumulated_points.last_point()
+        if last_point is None:
             last_y = None
         else:
-            last_x = self.accumulated_points.domain.end
-            assert last_x < x
-            last_y = self.accumulated_points.y(last_x)
+            if last_point[0] >= x:
+                raise Exception(f'Attempting to accumulate point at {x} before the last accumulated point at {last_point[0]}')
+            last_y = last_point[1]
         new_y = self.accumulator_transform(x, y, last_y)
-        self.accumulated_points.append((x, new_y))
+        self.accumulated_points._append_point((x, new_y))
+
+    def _accumulate_many(self, xs, ys):
+        last_point = self.accumulated_points.last_point()
+        if last_point is None:
+            last_y = None
+        else:
+            if last_point[0] >= xs[0]:
+                raise Exception(f'Attempting to accumulate points from {xs[0]} before the last accumulated point at {last_point[0]}')
+            last_y = last_point[1]
+        new_ys = self.accumulator_transform_many(xs, ys, last_y)
+        self.accumulated_points.append_arrays(xs, new_ys)
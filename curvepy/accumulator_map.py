@@ -1,5 +1,8 @@
+import copy
+from collections import deque
 from .accumulator import Accumulator
 from .curve import MIN_STEP
+from .reducer import Reducer
 from intervalpy import Interval
 
 
@@ -14,19 +17,34 @@ class AccumulatorMap(Accumulator):
             interpolation=None,
             uniform=True,
             min_step=MIN_STEP):
+        """
+        `tfm` is called with the values of the window (newest first),
+        or is a `Reducer`, which is updated incrementally as the window slides.
+        A missing value ends the window of a reducer.
+        """
+        self.reducer = None
+        if isinstance(tfm, Reducer):
+            self.reducer = tfm.copy()
+            # Values in the window as (index, x, y)
+            self._window = deque()
+            self._index = 0
         super().__init__(
             func,
-            self._accumulator_map_scan,
+            self._reducer_scan if self.reducer is not None else self._accumulator_map_scan,
             interpolation=interpolation,
             uniform=uniform,
             min_step=min_step
         )
 
-        tfm_ags = type(self).count_positional_args(tfm)
-        if tfm_ags == 0 or tfm_ags > 2:
-            raise Exception('Unable to adapt function')
-        self._accumulator_map_tfm_with_x = tfm_ags > 1
-        self.accumulator_map_tfm = tfm
+        if self.reducer is not None:
+            self._accumulator_map_tfm_with_x = False
+            self.accumulator_map_tfm = None
+        else:
+            tfm_ags = type(self).count_positional_args(tfm)
+            if tfm_ags == 0 or tfm_ags > 2:
+                raise Exception('Unable to adapt function')
+            self._accumulator_map_tfm_with_x = tfm_ags > 1
+            self.accumulator_map_tfm = tfm
 
         self.degree = None
         self.period = None
@@ -39,6 +57,49 @@ class AccumulatorMap(Accumulator):
             if self.degree <= 0:
                 raise Exception('Min degree must be a positive integer')
 
+    def reset_scan(self):
+        super().reset_scan()
+        if self.reducer is not None:
+            self.reducer.reset()
+            self._window.clear()
+            self._index = 0
+
+    def get_scan_state(self):
+        state = super().get_scan_state()
+        if self.reducer is not None:
+            state['reducer'] = copy.deepcopy(self.reducer)
+            state['window'] = tuple(self._window)
+            state['index'] = self._index
+        return state
+
+    def restore_scan_state(self, state):
+        super().restore_scan_state(state)
+        if self.reducer is not None:
+            self.reducer = copy.deepcopy(state['reducer'])
+            self._window = deque(state['window'])
+            self._index = state['index']
+
+    def _reducer_scan(self, x, y, _):
+        window = self._window
+        i = self._index
+        self._index += 1
+        if y is None:
+            self.reducer.reset()
+            window.clear()
+            return None
+
+        window.append((i, x, y))
+        self.reducer.add(y)
+        if self.degree is not None:
+            while window[0][0] <= i - self.degree:
+                self.reducer.remove(window.popleft()[2])
+        elif self.period is not None:
+            while window[0][1] < x - self.period:
+                self.reducer.remove(window.popleft()[2])
+        else:
+            raise Exception('Bad config')
+        return self.reducer.result()
+
     def _accumulator_map_scan(self, x, y, _):
         points = [[x, y]]
         if self.degree is not None:
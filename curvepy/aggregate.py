@@ -1,6 +1,9 @@
+import numpy as np
 from .curve import Curve, MIN_STEP
+from .constant import Constant
 from intervalpy import Interval
 from collections.abc import Sequence
+from . import util
 
 
 class Aggregate(Curve):
@@ -12,12 +15,19 @@ class Aggregate(Curve):
         else:
             return Interval.intersection(domains)
 
-    def __init__(self, funcs, *args, tfm=None, default=None, union=False, operator=None, name=None):
+    def __init__(self, funcs, *args, tfm=None, tfm_many=None, default=None, union=False, operator=None, name=None):
+        """
+        If `tfm_many` is specified, it is used by `y_many()` as a vectorized
+        version of `tfm`. It takes an array of `x` values and a list of value
+        arrays (one per function, with `NaN` in place of `None`) and returns
+        an array.
+        """
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         super().__init__()
         self.funcs = Curve.parse_many(funcs)
         self.tfm = tfm
+        self.tfm_many = tfm_many
         self.is_union = union
         self.operator = operator
         self.name = name
@@ -55,12 +65,102 @@ class Aggregate(Curve):
             return func_vals
         return self.tfm(x, func_vals)
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        if self.tfm is None:
+            return super().y_many(xs)
+        mask = util.interval_mask(self.domain, xs)
+        inner_xs = xs[mask]
+
+        # Evaluate each unique function once
+        func_vals = {}
+        yss = []
+        for f in self.funcs:
+            if id(f) not in func_vals:
+                func_vals[id(f)] = f.y_many(inner_xs)
+            yss.append(func_vals[id(f)])
+
+        if self.tfm_many is not None and all(ys.dtype != object for ys in yss):
+            inner_ys = np.asarray(self.tfm_many(inner_xs, yss), dtype=float)
+        else:
+            # Transform each value
+            inner_ys = util.values_to_array([
+                self.tfm(x, [util.none_if_nan(ys[i]) for ys in yss])
+                for i, x in enumerate(inner_xs.tolist())
+            ])
+
+        if mask.all():
+            return inner_ys
+        ys = util.values_to_array([self.default] * len(xs))
+        if inner_ys.dtype == object and ys.dtype != object:
+            ys = ys.astype(object)
+        ys[mask] = inner_ys
+        return ys
+
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
+        f = self._grid_func(min_step)
+        if f is not None:
+            return f.x_previous(x, min_step=min_step, limit=limit)
         return max_or_none(map(lambda f: f.x_previous(x, min_step=min_step, limit=limit), self.funcs), x)
 
     def x_next(self, x, min_step=MIN_STEP, limit=None):
+        f = self._grid_func(min_step)
+        if f is not None:
+            return f.x_next(x, min_step=min_step, limit=limit)
         return min_or_none(map(lambda f: f.x_next(x, min_step=min_step, limit=limit), self.funcs), x)
 
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        f = self._grid_func(min_step)
+        if f is not None:
+            return f.x_step(x, steps, min_step=min_step, clamp=clamp)
+        return super().x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        f = self._grid_func(min_step)
+        if f is not None:
+            return f.x_range(domain, min_step=min_step)
+        # Use the range of the functions if they agree
+        xs = None
+        for f in self.funcs:
+            if isinstance(f, Constant) and f.domain.is_infinite:
+                continue
+            f_xs = f.x_range(domain, min_step=min_step)
+            if f_xs is None:
+                return None
+            if xs is None:
+                xs = f_xs
+            elif not np.array_equal(xs, f_xs):
+                return None
+        return xs
+
+    def x_grid(self):
+        f = self._grid_func(None)
+        if f is None:
+            return None
+        return f.x_grid()
+
+    def _grid_func(self, min_step):
+        """
+        Returns a function with the same `x` values as the receiver,
+        if the functions share the same points (ignoring constants)
+        and the same step. Otherwise returns `None`.
+        """
+        grid = None
+        grid_func = None
+        for f in self.funcs:
+            if isinstance(f, Constant) and f.domain.is_infinite:
+                # Does not add any x values
+                continue
+            f_grid = f.x_grid()
+            if f_grid is None:
+                return None
+            if grid_func is None:
+                grid = f_grid
+                grid_func = f
+            elif f_grid is not grid or f.resolve_min_step(min_step) != grid_func.resolve_min_step(min_step):
+                return None
+        return grid_func
+
 
 def min_or_none(iterable, gt):
     min = None
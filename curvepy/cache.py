@@ -0,0 +1,134 @@
+import bisect
+import numpy as np
+from collections import OrderedDict
+from .curve import Curve, MIN_STEP
+from . import util
+
+DEFAULT_MAXSIZE = 1024
+
+_MISSING = object()
+
+
+class Cache(Curve):
+
+    """
+    Memoizes the values of a function.
+
+    At most `maxsize` values are kept, with the least recently used
+    values evicted first. Values are evicted when the function announces
+    an update of a domain containing them.
+    """
+
+    def get_domain(self):
+        return self.curve.domain
+
+    def __init__(self, func, maxsize=None):
+        super().__init__()
+        self.curve = Curve.parse(func)
+        if maxsize is None:
+            maxsize = DEFAULT_MAXSIZE
+        if maxsize < 1:
+            raise Exception('Cache size must be a positive integer')
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        # Cached x values in ascending order
+        self._xs = []
+        self._observer_token = self.curve.add_observer(
+            begin=self.begin_cache_update, end=self.end_cache_update, prioritize=True)
+
+    def __del__(self):
+        self.curve.remove_observer(self._observer_token)
+
+    def __repr__(self):
+        try:
+            return f'{self.curve}.cache({self.maxsize})'
+        except Exception as e:
+            return super().__repr__() + f'({e})'
+
+    def y(self, x):
+        y = self._values.get(x, _MISSING)
+        if y is not _MISSING:
+            self._values.move_to_end(x)
+            return y
+        y = self.curve.y(x)
+        self._store(x, y)
+        return y
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        x_list = xs.tolist()
+        values = [self._values.get(x, _MISSING) for x in x_list]
+        missing = [i for i, y in enumerate(values) if y is _MISSING]
+        if len(missing) != 0:
+            missing_ys = self.curve.y_many(xs[missing])
+            missing_values = util.array_to_values(missing_ys) if missing_ys.dtype != object else missing_ys.tolist()
+            for i, y in zip(missing, missing_values):
+                values[i] = y
+                self._store(x_list[i], y)
+        for x in x_list:
+            if x in self._values:
+                self._values.move_to_end(x)
+        return util.values_to_array(values)
+
+    def d_y(self, x, **kwargs):
+        return self.curve.d_y(x, **kwargs)
+
+    def x_next(self, x, min_step=MIN_STEP, limit=None):
+        return self.curve.x_next(x, min_step=min_step, limit=limit)
+
+    def x_previous(self, x, min_step=MIN_STEP, limit=None):
+        return self.curve.x_previous(x, min_step=min_step, limit=limit)
+
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        return self.curve.x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_grid(self):
+        return self.curve.x_grid()
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        return self.curve.x_range(domain, min_step=min_step)
+
+    def clear(self):
+        self._values.clear()
+        self._xs.clear()
+
+    def begin_cache_update(self, domain):
+        self._evict(domain)
+        self.begin_update(domain)
+
+    def end_cache_update(self, domain):
+        self._evict(domain)
+        self.end_update(domain)
+
+    def _store(self, x, y):
+        if self.curve.is_updating:
+            # Values may change before the update ends
+            return
+        if x != x:
+            # NaN cannot be ordered
+            return
+        if x not in self._values:
+            bisect.insort(self._xs, x)
+        self._values[x] = y
+        self._values.move_to_end(x)
+        if len(self._values) > self.maxsize:
+            x0, _ = self._values.popitem(last=False)
+            del self._xs[bisect.bisect_left(self._xs, x0)]
+
+    def _evict(self, domain):
+        if domain.is_empty or len(self._values) == 0:
+            return
+        if domain.is_negative_infinite and domain.is_positive_infinite:
+            self.clear()
+            return
+        if domain.start_open:
+            i0 = bisect.bisect_right(self._xs, domain.start)
+        else:
+            i0 = bisect.bisect_left(self._xs, domain.start)
+        if domain.end_open:
+            i1 = bisect.bisect_left(self._xs, domain.end)
+        else:
+            i1 = bisect.bisect_right(self._xs, domain.end)
+        for x in self._xs[i0:i1]:
+            del self._values[x]
+        del self._xs[i0:i1]
@@ -0,0 +1,148 @@
+import numpy as np
+from numbers import Number
+from .curve import Curve, MIN_STEP
+from .aggregate import Aggregate
+from .map import Map
+from . import util
+
+
+class Compiled(Curve):
+
+    """
+    Evaluates a function graph as a flat list of vectorized steps.
+
+    Built-in operators (those with a vectorized transform) are evaluated
+    step by step over a shared array of `x` values, with each function in
+    the graph evaluated at most once. Other functions, such as those with
+    only a scalar transform, are evaluated with their own `y_many()`.
+    """
+
+    def get_domain(self):
+        return self.curve.domain
+
+    def __init__(self, func):
+        curve = Curve.parse(func)
+        super().__init__(min_step=curve.min_step)
+        self.curve = curve
+        self._steps = _compile(self.curve)
+        self._observer_token = self.curve.add_observer(
+            begin=self.begin_update, end=self.end_update, prioritize=True)
+
+    def __del__(self):
+        self.curve.remove_observer(self._observer_token)
+
+    def __repr__(self):
+        try:
+            return f'{self.curve}.compile()'
+        except Exception as e:
+            return super().__repr__() + f'({e})'
+
+    @property
+    def step_count(self):
+        return len(self._steps)
+
+    def y(self, x):
+        return self.curve.y(x)
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        results = []
+        for func, inputs in self._steps:
+            if inputs is None:
+                ys = func.y_many(xs)
+            else:
+                yss = [results[i] for i in inputs]
+                if any(ys.dtype == object for ys in yss):
+                    ys = func.y_many(xs)
+                elif isinstance(func, Aggregate):
+                    ys = _aggregate_many(func, xs, yss)
+                else:
+                    ys = _map_many(func, xs, yss[0])
+            results.append(ys)
+        return results[-1]
+
+    def d_y(self, x, **kwargs):
+        return self.curve.d_y(x, **kwargs)
+
+    def x_next(self, x, min_step=MIN_STEP, limit=None):
+        return self.curve.x_next(x, min_step=min_step, limit=limit)
+
+    def x_previous(self, x, min_step=MIN_STEP, limit=None):
+        return self.curve.x_previous(x, min_step=min_step, limit=limit)
+
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        return self.curve.x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_grid(self):
+        return self.curve.x_grid()
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        return self.curve.x_range(domain, min_step=min_step)
+
+
+def _compile(func):
+    """
+    Returns a list of steps in topological order as `(func, inputs)` tuples,
+    where `inputs` are indexes of previous steps, or `None` if `func`
+    is evaluated on its own. The last step evaluates `func`.
+    """
+    steps = []
+    step_indexes = {}
+    # Depth first, children before parents
+    stack = [(func, False)]
+    while len(stack) != 0:
+        f, expanded = stack.pop()
+        if id(f) in step_indexes:
+            continue
+        children = _children(f)
+        if children is None:
+            step_indexes[id(f)] = len(steps)
+            steps.append((f, None))
+        elif expanded:
+            step_indexes[id(f)] = len(steps)
+            steps.append((f, [step_indexes[id(child)] for child in children]))
+        else:
+            stack.append((f, True))
+            for child in reversed(children):
+                if id(child) not in step_indexes:
+                    stack.append((child, False))
+    return steps
+
+
+def _children(func):
+    """
+    Returns the inputs of a built-in operator, or `None`
+    if the function can not be compiled.
+    """
+    if isinstance(func, Aggregate):
+        if func.tfm is None or func.tfm_many is None:
+            return None
+        if func.default is not None and not isinstance(func.default, Number):
+            return None
+        return func.funcs
+    if type(func) == Map:
+        if func.map_tfm_many is None:
+            return None
+        return [func.curve]
+    return None
+
+
+def _aggregate_many(func, xs, yss):
+    mask = util.interval_mask(func.domain, xs)
+    if mask.all():
+        return np.asarray(func.tfm_many(xs, yss), dtype=float)
+    ys = np.full(len(xs), np.nan if func.default is None else func.default, dtype=float)
+    if mask.any():
+        ys[mask] = func.tfm_many(xs[mask], [func_ys[mask] for func_ys in yss])
+    return ys
+
+
+def _map_many(func, xs, ys):
+    if func._map_tfm_many_with_x:
+        result = func.map_tfm_many(xs, ys)
+    else:
+        result = func.map_tfm_many(ys)
+    result = np.asarray(result, dtype=float)
+    if func.skip_none:
+        result = np.where(np.isnan(ys), np.nan, result)
+    return result
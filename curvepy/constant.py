@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 
@@ -41,6 +42,10 @@ class Constant(Curve):
     def y(self, x):
         return self.value
 
+    def y_many(self, xs):
+        value = self.value
+        return np.full(len(xs), np.nan if value is None else value, dtype=float)
+
     def d_y(self, x, forward=False, min_step=MIN_STEP, limit=None):
         return 0.0
 
@@ -1,8 +1,10 @@
 import math
+import bisect
 import weakref
 import inspect
 import arrow
 import numpy as np
+from contextlib import contextmanager
 from numbers import Number
 from collections.abc import Sequence, Mapping
 from intervalpy import Interval
@@ -11,6 +13,15 @@ from . import util
 
 MIN_STEP = 1e-5
 
+# Updates deferred by `Curve.batch_update()`
+_batch_depth = 0
+_batch_updates = {}
+# Functions which completed their update while flushing a batch
+_batch_flushed = None
+
+# Observers are looked up with an index when there are at least this many
+OBSERVER_INDEX_MIN_COUNT = 16
+
 # TODO: Implement Duration and use its next ad previous methods
 # Or make a super class which is not tied to a time interval.
 
@@ -45,13 +56,13 @@ class Curve:
 
     @property
     def is_updating(self):
-        return not self.update_interval.is_empty
+        return not self.update_interval.is_empty or id(self) in _batch_updates
 
     def __init__(self, min_step=None):
         self.name = None
         self._domain = None
         self._observer_data = {}
-        self._ordered_observer_tokens = []
+        self._observer_index = _ObserverIndex()
         self._begin_update_interval = Interval.empty()
         self._end_update_interval = Interval.empty()
         self.min_step = min_step
@@ -70,6 +81,17 @@ class Curve:
     def y(self, x):
         raise Exception("Not implemented")
 
+    def y_many(self, xs):
+        """
+        Returns the values at `xs` as a float array with `NaN`
+        in place of missing values.
+
+        Subclasses should override this method if the values
+        can be evaluated with array operations.
+        """
+        xs = np.asarray(xs, dtype=float)
+        return util.values_to_array([self.y(x) for x in xs.tolist()])
+
     def y_start(self):
         return self.y(self.domain.start)
 
@@ -138,6 +160,40 @@ class Curve:
             return None
         return x1
 
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        """
+        Returns the `x` value after calling `x_next()` (or `x_previous()`
+        if `steps` is negative) `steps` times.
+
+        Returns `None` if the domain ends before, or if `clamp` is `True`,
+        the last `x` value reached.
+        """
+        for _ in range(abs(steps)):
+            if steps > 0:
+                x1 = self.x_next(x, min_step=min_step)
+            else:
+                x1 = self.x_previous(x, min_step=min_step)
+            if x1 is None:
+                return x if clamp else None
+            x = x1
+        return x
+
+    def x_grid(self):
+        """
+        Returns the `Points` whose `x` values are returned by `x_next()`,
+        `x_previous()`, `x_step()` and `x_range()`, or `None` if the `x`
+        values are not those of any points.
+        """
+        return None
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        """
+        Returns an array of the `x` values in `domain` which are found by
+        calling `x_next()` repeatedly, if they can be found in bulk.
+        Otherwise returns `None`.
+        """
+        return None
+
     def previous_point(self, x, min_step=MIN_STEP):
         x1 = self.x_previous(x, min_step=min_step)
         if x1 is None:
@@ -165,29 +221,41 @@ class Curve:
         else:
             return max(min_step, self.min_step)
 
-    def sample_points(self, domain=None, min_step=MIN_STEP, step=None):
+    def sample_points(self, domain=None, min_step=MIN_STEP, step=None, as_arrays=False):
+        """
+        Returns a list of `(x, y)` points. If `as_arrays` is `True`,
+        returns a tuple of `x` and `y` arrays instead (see `y_many()`).
+        """
         min_step = self.resolve_min_step(min_step)
         if domain is None:
             domain = self.domain
         else:
             domain = Interval.intersection([self.domain, domain])
         if domain.is_empty:
-            return []
+            return _sampled([], as_arrays)
         elif not domain.is_finite:
             raise Exception("Cannot sample points on an infinite domain {}. Specify a finite domain.".format(domain))
         x_start, x_end = domain
+        if step is not None:
+            # Use integer multiples of the step to avoid accumulating errors
+            xs = x_start + step * np.arange(0 if not domain.start_open else 1, math.floor((x_end - x_start) / step) + 2)
+            xs = xs[xs <= x_end]
+            ys = self.y_many(xs)
+            if as_arrays:
+                return xs, ys
+            return list(zip(xs.tolist(), util.array_to_values(ys)))
+        xs = self._sample_xs(domain, min_step)
+        if xs is not None:
+            ys = self.y_many(xs)
+            if as_arrays:
+                return xs, ys
+            return list(zip(xs.tolist(), util.array_to_values(ys) if ys.dtype != object else ys.tolist()))
         x_end_bin = round(x_end / min_step) if min_step is not None else x_end
         if domain.start_open:
             points = []
         else:
             points = [(x_start, self.y(x_start))]
-        if step is not None:
-            x = x_start + step
-            while x <= x_end:
-                y = self.y(x)
-                points.append((x, y))
-                x += step
-        elif min_step is not None and min_step > 0:
+        if min_step is not None and min_step > 0:
             x = self.x_next(x_start, min_step=min_step, limit=x_end)
             while x is not None and x <= x_end:
                 y = self.y(x)
@@ -207,7 +275,23 @@ class Curve:
         else:
             raise Exception("Bad functions sample parameters.")
 
-        return points
+        return _sampled(points, as_arrays)
+
+    def _sample_xs(self, domain, min_step):
+        # Same as the x values sampled with `x_next()`, if they can be found in bulk
+        if min_step is None or min_step <= 0:
+            return None
+        xs = self.x_range(domain, min_step=min_step)
+        if xs is None:
+            return None
+        x_start, x_end = domain
+        if not domain.start_open and (len(xs) == 0 or xs[0] != x_start):
+            if len(xs) != 0 and xs[0] < x_start + min_step:
+                return None
+            xs = np.concatenate(([x_start], xs))
+        if not domain.end_open and (len(xs) == 0 or xs[-1] != x_end):
+            xs = np.concatenate((xs, [x_end]))
+        return xs
 
     def sample_points_from_x(self, x, limit, backward=False, open=False, min_step=None):
         assert limit is not None
@@ -410,31 +494,68 @@ class Curve:
 
         # TODO: does saving strong references to callbacks create a retain cycle?
         self._observer_data[token] = (obj_ref, domain, begin, end, begin_with_interval, end_with_interval)
-        if prioritize:
-            self._ordered_observer_tokens.insert(0, token)
-        else:
-            self._ordered_observer_tokens.append(token)
+        self._observer_index.add(token, domain, prioritize=prioritize)
         return token
 
     def remove_observer(self, token_or_obj):
         if isinstance(token_or_obj, Number):
             if token_or_obj in self._observer_data:
                 del self._observer_data[token_or_obj]
-                self._ordered_observer_tokens.remove(token_or_obj)
+                self._observer_index.remove(token_or_obj)
         else:
-            for token in list(self._ordered_observer_tokens):
+            for token in list(self._observer_data):
                 obj_ref = self._observer_data[token][0]
                 if obj_ref is not None:
                     obj = obj_ref()
                     if obj is None or obj == token_or_obj:
                         del self._observer_data[token]
-                        self._ordered_observer_tokens.remove(token)
+                        self._observer_index.remove(token)
+
+    @classmethod
+    @contextmanager
+    def batch_update(cls):
+        """
+        Defers update notifications of all functions until the outermost
+        batch exits. On exit, each updated function notifies its observers
+        once with the union of its updated domains.
+
+        Derived functions should not be evaluated inside a batch,
+        as they have not been notified of the changes yet.
+        """
+        global _batch_depth, _batch_updates, _batch_flushed
+        _batch_depth += 1
+        try:
+            yield
+        finally:
+            _batch_depth -= 1
+            if _batch_depth == 0:
+                updates = _batch_updates
+                _batch_updates = {}
+                # Notify all beginnings first, so that dependent functions
+                # only end their update once all of their sources have ended.
+                outer_flushed = _batch_flushed
+                _batch_flushed = {}
+                try:
+                    for func, begin_interval, _ in updates.values():
+                        func.begin_update(begin_interval)
+                    for func, _, end_interval in updates.values():
+                        func.end_update(end_interval)
+                finally:
+                    _batch_flushed = outer_flushed
 
     def begin_update(self, domain):
-        if domain.is_empty or self._begin_update_interval.is_superset_of(domain):
+        if domain.is_empty:
+            return
+        if _batch_depth != 0:
+            self._defer_update(begin_interval=domain)
+            return
+        if self._begin_update_interval.is_superset_of(domain):
             return
         self._begin_update_interval = Interval.union([self._begin_update_interval, domain])
-        for token in self._ordered_observer_tokens:
+        for token in self._observer_tokens_intersecting(domain):
+            if token not in self._observer_data:
+                # Removed by a previous callback
+                continue
             _, callback_interval, callback, _, callback_with_interval, _ = self._observer_data[token]
             if callback_interval is None or domain.intersects(callback_interval):
                 if callback is not None:
@@ -444,8 +565,19 @@ class Curve:
                         callback()
 
     def end_update(self, domain):
-        if domain.is_empty or self._end_update_interval.is_superset_of(domain):
+        if domain.is_empty:
+            return
+        if _batch_depth != 0:
+            self._defer_update(end_interval=domain)
+            self.set_needs_interval_update()
+            return
+        if self._end_update_interval.is_superset_of(domain):
             return
+        if _batch_flushed is not None and self._begin_update_interval.is_empty:
+            flushed_interval = _batch_flushed.get(id(self))
+            if flushed_interval is not None and flushed_interval.is_superset_of(domain):
+                # Already notified observers of this batch
+                return
         self._end_update_interval = Interval.union([self._end_update_interval, domain])
         if not self._end_update_interval.is_superset_of(self._begin_update_interval):
             # Keep collecting updates
@@ -456,7 +588,12 @@ class Curve:
         self._begin_update_interval = Interval.empty()
         self._end_update_interval = Interval.empty()
         self.set_needs_interval_update()
-        for token in list(self._ordered_observer_tokens):
+        if _batch_flushed is not None:
+            _batch_flushed[id(self)] = update_interval
+        for token in self._observer_tokens_intersecting(update_interval):
+            if token not in self._observer_data:
+                # Removed by a previous callback
+                continue
             _, callback_interval, _, callback, _, callback_with_interval = self._observer_data[token]
             if callback_interval is None or update_interval.intersects(callback_interval):
                 if callback is not None:
@@ -465,6 +602,23 @@ class Curve:
                     else:
                         callback()
 
+    def _observer_tokens_intersecting(self, domain):
+        """
+        Returns a list of observer tokens, in notification order, whose
+        domains may intersect `domain`. See `_ObserverIndex`.
+        """
+        if len(self._observer_data) < OBSERVER_INDEX_MIN_COUNT:
+            return self._observer_index.ordered()
+        return self._observer_index.intersecting(domain)
+
+    def _defer_update(self, begin_interval=None, end_interval=None):
+        func, begin, end = _batch_updates.get(id(self), (self, Interval.empty(), Interval.empty()))
+        if begin_interval is not None:
+            begin = Interval.union([begin, begin_interval])
+        if end_interval is not None:
+            end = Interval.union([end, end_interval])
+        _batch_updates[id(self)] = (func, begin, end)
+
     @property
     def needs_domain_update(self):
         return self._domain is None
@@ -474,7 +628,11 @@ class Curve:
 
     def map(self, tfm, skip_none=False, name=None, **kwargs):
         from .map import Map
-        return Map(self, tfm, skip_none=skip_none, name=name, **kwargs)
+        create = lambda: Map(self, tfm, skip_none=skip_none, name=name, **kwargs)
+        if name is None:
+            return create()
+        from .registry import canonical
+        return canonical('map', [self, tfm, name, skip_none], kwargs, create)
 
     def accumulator_map(self, tfm, degree, is_period=False, interpolation=None, min_step=MIN_STEP, uniform=True):
         from .accumulator_map import AccumulatorMap
@@ -490,7 +648,8 @@ class Curve:
 
     def offset(self, x, duration=None):
         from .offset import Offset
-        return Offset(self, x, duration=duration)
+        from .registry import canonical
+        return canonical('offset', [self, x, duration], {}, lambda: Offset(self, x, duration=duration))
 
     def add(self, func):
         return Curve.add_many([self, func])
@@ -519,13 +678,13 @@ class Curve:
         return Integral(self, const=const, interpolation=interpolation, uniform=uniform)
 
     def additive_inverse(self):
-        return self.map(_additive_inverse)
+        return self.map(_additive_inverse, tfm_many=_additive_inverse_many)
 
     def multiplicative_inverse(self):
-        return self.map(_multiplicative_inverse)
+        return self.map(_multiplicative_inverse, tfm_many=_multiplicative_inverse_many)
 
     def abs(self):
-        return self.map(_abs)
+        return self.map(_abs, tfm_many=_abs_many)
 
     def blend(self, func, x_blend_start, x_blend_stop):
         from .aggregate import Aggregate
@@ -535,7 +694,10 @@ class Curve:
         def blend_f(x, ys):
             u = (x - x_blend_start) / x_blend_period
             return (1.0 - u) * ys[0] + u * ys[1]
-        c = Aggregate([self, func], tfm=blend_f, name='blend')
+        def blend_many_f(xs, yss):
+            u = (xs - x_blend_start) / x_blend_period
+            return (1.0 - u) * yss[0] + u * yss[1]
+        c = Aggregate([self, func], tfm=blend_f, tfm_many=blend_many_f, name='blend')
 
         funcs = [self, c, func]
         domains = self.domain.partition([x_blend_start, x_blend_stop])
@@ -588,11 +750,13 @@ class Curve:
 
     def sma(self, degree, is_period=False, **kwargs):
         from .sma import SMA
-        return SMA(self, degree, is_period=is_period, **kwargs)
+        from .registry import canonical
+        return canonical('sma', [self, degree, is_period], kwargs, lambda: SMA(self, degree, is_period=is_period, **kwargs))
 
     def ema(self, degree, is_period=False, init=None, **kwargs):
         from .ema import EMA
-        return EMA(self, degree, is_period=is_period, init=init, **kwargs)
+        from .registry import canonical
+        return canonical('ema', [self, degree, is_period, init], kwargs, lambda: EMA(self, degree, is_period=is_period, init=init, **kwargs))
 
     def smma(self, degree, **kwargs):
         from .sma import SMA
@@ -648,9 +812,14 @@ class Curve:
         rsi.name = f'rsi({degree})'
         return rsi
 
-    def trailing_min(self, degree, is_period=False, interpolation=None, min_step=MIN_STEP, uniform=True):
+    def rolling_quantile(self, q, degree, is_period=False, interpolation=None, min_step=MIN_STEP, uniform=True):
+        """
+        Returns the `q`-th quantile of the last `degree` points, or of the
+        points within `period` before each point (inclusive).
+        """
+        from .reducer import Quantile
         return self.accumulator_map(
-            min,
+            Quantile(q),
             degree,
             is_period=is_period,
             interpolation=interpolation,
@@ -658,15 +827,29 @@ class Curve:
             uniform=uniform
         )
 
+    def trailing_min(self, degree, is_period=False, interpolation=None, min_step=MIN_STEP, uniform=True):
+        from .trailing import TrailingExtreme
+        from .registry import canonical
+        kwargs = dict(interpolation=interpolation, min_step=min_step, uniform=uniform)
+        return canonical('trailing_min', [self, degree, is_period], kwargs, lambda: TrailingExtreme(
+            self,
+            degree,
+            is_period=is_period,
+            is_max=False,
+            **kwargs
+        ))
+
     def trailing_max(self, degree, is_period=False, interpolation=None, min_step=MIN_STEP, uniform=True):
-        return self.accumulator_map(
-            max,
+        from .trailing import TrailingExtreme
+        from .registry import canonical
+        kwargs = dict(interpolation=interpolation, min_step=min_step, uniform=uniform)
+        return canonical('trailing_max', [self, degree, is_period], kwargs, lambda: TrailingExtreme(
+            self,
             degree,
             is_period=is_period,
-            interpolation=interpolation,
-            min_step=min_step,
-            uniform=uniform
-        )
+            is_max=True,
+            **kwargs
+        ))
 
     def differential(self, forward=False):
         from .map import Map
@@ -674,6 +857,24 @@ class Curve:
         d.name = 'diff'
         return d
 
+    def cache(self, maxsize=None):
+        """
+        Returns a function which memoizes the values of the receiver.
+        See `Cache`.
+        """
+        from .cache import Cache
+        from .registry import canonical
+        return canonical('cache', [self, maxsize], {}, lambda: Cache(self, maxsize=maxsize))
+
+    def compile(self):
+        """
+        Returns a function with the same values as the receiver,
+        which evaluates `y_many()` with a flat list of vectorized steps.
+        See `Compiled`.
+        """
+        from .compiled import Compiled
+        return Compiled(self)
+
     def subset(self, domain):
         from .generic import Generic
         return Generic(self, domain=domain, min_step=self.min_step)
@@ -693,14 +894,21 @@ class Curve:
                     return v
             return None
 
+        def first_val_many(xs, yss):
+            result = yss[-1]
+            for ys in reversed(yss[:-1]):
+                result = np.where(np.isnan(ys), result, ys)
+            return result
+
         funcs = Curve.parse_many(funcs)
-        return Aggregate(funcs, tfm=first_val, union=True, name='first')        
+        return Aggregate(funcs, tfm=first_val, tfm_many=first_val_many, union=True, name='first')
 
     @classmethod
     def min(cls, funcs, *args, ignore_empty=False):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def min_vals(x, vals):
             best = None
@@ -712,15 +920,19 @@ class Curve:
         def min_vals_with_empty(x, vals):
             return min(filter(lambda y: y is not None, vals), default=None)
 
+        def min_vals_many(xs, yss):
+            return np.fmin.reduce(yss)
+
         funcs = Curve.parse_many(funcs)
         t = min_vals_with_empty if ignore_empty else min_vals
-        return Aggregate(funcs, tfm=t, union=ignore_empty, name='min')
+        return canonical('min', funcs, {'ignore_empty': ignore_empty}, lambda: Aggregate(funcs, tfm=t, tfm_many=min_vals_many, union=ignore_empty, name='min'))
 
     @classmethod
     def max(cls, funcs, *args, ignore_empty=False):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def max_vals(x, vals):
             best = None
@@ -732,28 +944,39 @@ class Curve:
         def max_vals_with_empty(x, vals):
             return max(filter(lambda y: y is not None, vals), default=None)
 
+        def max_vals_many(xs, yss):
+            return np.fmax.reduce(yss)
+
         funcs = Curve.parse_many(funcs)
         t = max_vals_with_empty if ignore_empty else max_vals
-        return Aggregate(funcs, tfm=t, union=ignore_empty, name='max')
+        return canonical('max', funcs, {'ignore_empty': ignore_empty}, lambda: Aggregate(funcs, tfm=t, tfm_many=max_vals_many, union=ignore_empty, name='max'))
 
     @classmethod
     def add_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def add_f(x, ys):
             for y in ys:
                 if y is None:
                     return None
             return sum(ys)
-        return Aggregate(funcs, tfm=add_f, name='add', operator='+')
+
+        def add_many_f(xs, yss):
+            result = yss[0]
+            for ys in yss[1:]:
+                result = result + ys
+            return result
+        return canonical('add', funcs, {}, lambda: Aggregate(funcs, tfm=add_f, tfm_many=add_many_f, name='add', operator='+'))
 
     @classmethod
     def subtract_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def sub_f(x, ys):
             result = 0
@@ -765,13 +988,20 @@ class Curve:
                 else:
                     result -= y
             return result
-        return Aggregate(funcs, tfm=sub_f, name='sub', operator='-')
+
+        def sub_many_f(xs, yss):
+            result = yss[0]
+            for ys in yss[1:]:
+                result = result - ys
+            return result
+        return canonical('sub', funcs, {}, lambda: Aggregate(funcs, tfm=sub_f, tfm_many=sub_many_f, name='sub', operator='-'))
 
     @classmethod
     def multiply_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def mult_f(x, ys):
             geo_sum = 1.0
@@ -780,13 +1010,20 @@ class Curve:
                     return None
                 geo_sum *= y
             return geo_sum
-        return Aggregate(funcs, tfm=mult_f, name='mult', operator='*')
+
+        def mult_many_f(xs, yss):
+            result = yss[0]
+            for ys in yss[1:]:
+                result = result * ys
+            return result
+        return canonical('mult', funcs, {}, lambda: Aggregate(funcs, tfm=mult_f, tfm_many=mult_many_f, name='mult', operator='*'))
 
     @classmethod
     def divide_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def div_f(x, ys):
             result = 0
@@ -800,13 +1037,23 @@ class Curve:
                 else:
                     result /= y
             return result
-        return Aggregate(funcs, tfm=div_f, name='div', operator='/')
+
+        def div_many_f(xs, yss):
+            result = yss[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for ys in yss[1:]:
+                    inf = np.where(result >= 0, math.inf, -math.inf)
+                    inf[np.isnan(result)] = np.nan
+                    result = np.where(ys == 0, inf, result / ys)
+            return result
+        return canonical('div', funcs, {}, lambda: Aggregate(funcs, tfm=div_f, tfm_many=div_many_f, name='div', operator='/'))
 
     @classmethod
     def pow_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def log_f(x, ys):
             result = 0
@@ -818,13 +1065,21 @@ class Curve:
                 else:
                     result = result ** y
             return result
-        return Aggregate(funcs, tfm=log_f, name='pow', operator='^')
+
+        def pow_many_f(xs, yss):
+            result = yss[0]
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                for ys in yss[1:]:
+                    result = result ** ys
+            return result
+        return canonical('pow', funcs, {}, lambda: Aggregate(funcs, tfm=log_f, tfm_many=pow_many_f, name='pow', operator='^'))
 
     @classmethod
     def log_many(cls, funcs, *args):
         if not isinstance(funcs, Sequence):
             funcs = [funcs] + list(args)
         from .aggregate import Aggregate
+        from .registry import canonical
 
         def log_f(x, ys):
             result = 0
@@ -836,7 +1091,14 @@ class Curve:
                 else:
                     result = math.log(result, y)
             return result
-        return Aggregate(funcs, tfm=log_f, name='log')
+
+        def log_many_f(xs, yss):
+            result = yss[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for ys in yss[1:]:
+                    result = np.log(result) / np.log(ys)
+            return result
+        return canonical('log', funcs, {}, lambda: Aggregate(funcs, tfm=log_f, tfm_many=log_many_f, name='log'))
 
     @classmethod
     def zero(cls, value):
@@ -1126,6 +1388,116 @@ def _abs(x, y):
         return None
     return abs(y)
 
+def _additive_inverse_many(xs, ys):
+    return -ys
+
+def _multiplicative_inverse_many(xs, ys):
+    with np.errstate(divide='ignore'):
+        return 1 / ys
+
+def _abs_many(xs, ys):
+    return np.abs(ys)
+
+class _ObserverIndex:
+
+    """
+    Observer domains indexed for update dispatch, maintained
+    incrementally as observers are added and removed.
+
+    Observers with finite domains are grouped by length into buckets of
+    powers of 2, each sorted by start. A lookup only visits observers in
+    each bucket which start within the bucket's maximum length of `domain`:
+    O(b log n + m), where b is the number of buckets and m is the number of
+    those observers. Observers with infinite domains are checked one by
+    one, as they usually intersect any update.
+
+    Each observer has a key in notification order. Prioritized observers
+    get decreasing keys and others increasing keys.
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._first_key = 0
+        self._last_key = 0
+        # Buckets of ([(start, key, end, token)], [start]) sorted by (start, key),
+        # by the exponent of the maximum length of their domains
+        self._buckets = {}
+        self._bounded_buckets = {}
+        self._unbounded = {}
+
+    def add(self, token, domain, prioritize=False):
+        if prioritize:
+            self._first_key -= 1
+            key = self._first_key
+        else:
+            self._last_key += 1
+            key = self._last_key
+        self._keys[token] = key
+        if domain.is_empty:
+            return
+        if domain.is_finite:
+            # The length is less than 2 ** exponent
+            _, exponent = math.frexp(domain.end - domain.start)
+            entries, starts = self._buckets.setdefault(exponent, ([], []))
+            i = bisect.bisect_left(entries, (domain.start, key))
+            entries.insert(i, (domain.start, key, domain.end, token))
+            starts.insert(i, domain.start)
+            self._bounded_buckets[token] = (exponent, domain.start)
+        else:
+            self._unbounded[token] = (key, domain.start, domain.end)
+
+    def remove(self, token):
+        key = self._keys.pop(token, None)
+        if key is None:
+            return
+        if self._unbounded.pop(token, None) is not None:
+            return
+        bucket = self._bounded_buckets.pop(token, None)
+        if bucket is None:
+            return
+        exponent, start = bucket
+        entries, starts = self._buckets[exponent]
+        # Keys are unique, so (start, key) finds the observer
+        i = bisect.bisect_left(entries, (start, key))
+        del entries[i]
+        del starts[i]
+        if len(entries) == 0:
+            del self._buckets[exponent]
+
+    def ordered(self):
+        """
+        Returns the tokens of all observers in notification order.
+        """
+        keys = self._keys
+        return sorted(keys, key=keys.get)
+
+    def intersecting(self, domain):
+        """
+        Returns the tokens of observers whose domains intersect `domain`,
+        including boundaries, in notification order.
+        """
+        if domain.is_empty:
+            return []
+        matches = [
+            (key, token) for token, (key, start, end) in self._unbounded.items()
+            if start <= domain.end and end >= domain.start
+        ]
+        for exponent, (entries, starts) in self._buckets.items():
+            i0 = bisect.bisect_left(starts, domain.start - 2.0 ** exponent)
+            i1 = bisect.bisect_right(starts, domain.end)
+            for _, key, end, token in entries[i0:i1]:
+                if end >= domain.start:
+                    matches.append((key, token))
+        matches.sort()
+        return [token for _, token in matches]
+
+
+def _sampled(points, as_arrays):
+    if not as_arrays:
+        return points
+    xs = np.array([p[0] for p in points], dtype=float)
+    return xs, util.values_to_array([p[1] for p in points])
+
 def _callable_arg_len(f, vararg_ret_val):
     args, varargs, _, _ = inspect.getargspec(f)
     if varargs is not None:
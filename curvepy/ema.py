@@ -1,8 +1,14 @@
 import math
+import numpy as np
 from .accumulator import Accumulator
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 
+# Number of points evaluated at once by the EMA recurrence
+EMA_CHUNK_SIZE = 256
+# Smallest decay factor of a chunk before falling back to a loop
+_MIN_DECAY = 1e-150
+
 class EMA(Accumulator):
     """
     Only forward direction is supported.
@@ -10,15 +16,24 @@ class EMA(Accumulator):
 
     # TODO: investigate difference between regular EMA and irregular EMA
 
-    def __init__(self, func, degree, is_period=True, init=None, min_step=MIN_STEP, uniform=True):
+    def __init__(self, func, degree, is_period=True, init=None, tolerance=None, min_step=MIN_STEP, uniform=True):
+        """
+        If `tolerance` is specified, the EMA starts a warm-up window before
+        the first evaluated `x`, instead of at the start of the function.
+        The window is long enough for values before it to have a combined
+        weight of at most `tolerance`, and is extended over missing values.
+        """
         self.alpha = None
         self.period = None
         self.init_func = Curve.parse(init) if init is not None else None
+        if tolerance is not None and not 0 < tolerance < 1:
+            raise Exception('EMA tolerance must be between 0 and 1')
+        self.tolerance = tolerance
         if is_period:
             self.period = degree
         else:
             self.alpha = degree
-        super().__init__(func, self._ema_scan, min_step=min_step, uniform=uniform)
+        super().__init__(func, self._ema_scan, min_step=min_step, uniform=uniform, tfm_many=self._ema_scan_many)
 
     def __repr__(self):
         try:
@@ -26,15 +41,59 @@ class EMA(Accumulator):
         except Exception as e:
             return super().__repr__() + f'({e})'
 
-    # TODO: EMA doesn't have to initialise from the start of the underlying function
-    # def init_scan(self, x):
-    #     if self.period is not None:
-    #         period = self.period
-    #     elif self.alpha is not None:
-    #         period = 1 / self.alpha
-    #     else:
-    #         raise Exception('Bad SMA configuration')       
-    #     return self.curve.x_next(x - period, min_step=self.min_step)
+    def init_scan(self, x):
+        x0 = super().init_scan(x)
+        if self.tolerance is None or x0 is None:
+            return x0
+        x_warmup = self._warmup_start(x)
+        if x_warmup is None or x_warmup < x0:
+            return x0
+        return x_warmup
+
+    @property
+    def warmup_steps(self):
+        """
+        The number of steps needed to reach the tolerance, if `alpha` is specified.
+        """
+        if self.tolerance is None or self.alpha is None:
+            return None
+        if self.alpha >= 1:
+            return 1
+        if self.alpha <= 0:
+            return None
+        return max(1, int(math.ceil(math.log(self.tolerance) / math.log(1 - self.alpha))))
+
+    @property
+    def warmup_period(self):
+        """
+        The length of `x` needed to reach the tolerance, if `period` is specified.
+        """
+        if self.tolerance is None or self.period is None:
+            return None
+        # Each step decays by at most exp(-x_delta / period)
+        return self.period * math.log(1 / self.tolerance)
+
+    def _warmup_start(self, x):
+        if self.period is not None:
+            length = self.warmup_period
+        else:
+            length = self.warmup_steps
+            if length is None:
+                return None
+        # Missing values leave the EMA unchanged, so only
+        # values after the start count towards the window
+        covered = 0
+        x1 = x
+        while x1 is not None:
+            x0 = self.curve.x_previous(x1, min_step=self.min_step)
+            if self.curve.y(x1) is not None:
+                if covered >= length:
+                    return x1
+                if x0 is None:
+                    break
+                covered += x1 - x0 if self.period is not None else 1
+            x1 = x0
+        return None
 
     def _ema_scan(self, x, y, ema):
         if y is None:
@@ -52,6 +111,70 @@ class EMA(Accumulator):
         elif self.alpha is not None:
             return ema + self.alpha * (y - ema)
 
+    def _ema_scan_many(self, xs, ys, ema):
+        # Same as calling `_ema_scan()` for each point
+        ys = np.asarray(ys, dtype=float)
+        emas = np.full(len(xs), np.nan)
+        has_y = ~np.isnan(ys)
+        i0 = 0
+        if ema is None:
+            # Find the first value
+            if self.init_func is not None:
+                init_ys = np.full(len(xs), np.nan)
+                init_ys[has_y] = self.init_func.y_many(xs[has_y])
+                starts = (~np.isnan(init_ys)).nonzero()[0]
+            else:
+                init_ys = ys
+                starts = has_y.nonzero()[0]
+            if len(starts) == 0:
+                return emas
+            i0 = starts[0]
+            ema = init_ys[i0]
+            emas[i0] = ema
+            i0 += 1
+            if i0 == len(xs):
+                return emas
+
+        if self.period is not None:
+            if i0 == 0:
+                x0 = self.curve.x_previous(xs[0], min_step=self.min_step)
+                dxs = np.diff(xs, prepend=x0)
+            else:
+                dxs = np.diff(xs[i0 - 1:])
+            alphas = np.abs(dxs / self.period)
+        elif self.alpha is not None:
+            alphas = np.full(len(xs) - i0, float(self.alpha))
+        else:
+            raise Exception('Bad EMA configuration')
+        # Missing values leave the EMA unchanged
+        alphas = np.where(has_y[i0:], alphas, 0.0)
+        emas[i0:] = _ema_many(ema, alphas, np.where(has_y[i0:], ys[i0:], 0.0))
+        return emas
+
+
+def _ema_many(ema, alphas, ys):
+    """
+    Returns the values of the recurrence `ema += alpha * (y - ema)`.
+
+    Within a chunk, `ema_i = d_i * (ema_0 + sum_j(alpha_j * y_j / d_j))`,
+    where `d_i` is the product of the decay factors `1 - alpha_j` up to `i`.
+    """
+    emas = np.empty(len(ys))
+    for i in range(0, len(ys), EMA_CHUNK_SIZE):
+        chunk = slice(i, i + EMA_CHUNK_SIZE)
+        decays = np.cumprod(1.0 - alphas[chunk])
+        if (np.abs(decays) >= _MIN_DECAY).all():
+            chunk_emas = decays * (ema + np.cumsum(alphas[chunk] * ys[chunk] / decays))
+        else:
+            # Decays too fast to divide by
+            chunk_emas = np.empty(len(decays))
+            for j, (alpha, y) in enumerate(zip(alphas[chunk].tolist(), ys[chunk].tolist())):
+                ema = ema + alpha * (y - ema)
+                chunk_emas[j] = ema
+        emas[chunk] = chunk_emas
+        ema = chunk_emas[-1]
+    return emas
+
 
 # # Reference: http://www.thalesians.com/archive/public/academic/finance/papers/Zumbach_2000.pdf
 # x0 = self.x_previous(x, min_step=self.min_step)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 
@@ -16,6 +17,9 @@ class Empty(Curve):
     def y(self, x):
         return None
 
+    def y_many(self, xs):
+        return np.full(len(xs), np.nan)
+
     def d_y(self, x, forward=False, min_step=MIN_STEP, limit=None):
         return None
 
@@ -1,4 +1,5 @@
 import bisect
+import numpy as np
 from .scan import Scan
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
@@ -16,7 +17,7 @@ class Extremas(Scan):
         self.possible_extrema = None
         self.possible_extrema_phase = None
         self._did_update_extremas()
-        super().__init__(func, self._extrema_scan, min_step=min_step)
+        super().__init__(func, self._extrema_scan, min_step=min_step, tfm_many=self._extrema_scan_many)
         self._ref_observer_token = self.ref_func.add_observer(begin=self.begin_update, end=self.end_update)
 
     def __del__(self):
@@ -62,8 +63,28 @@ class Extremas(Scan):
             return x1
         return self.curve.x_next(x, min_step=min_step, limit=limit)
 
+    def get_scan_state(self):
+        # Extremas are only appended while scanning
+        return (len(self.extremas), self.possible_extrema, self.possible_extrema_phase)
+
+    def restore_scan_state(self, state):
+        count, possible_extrema, possible_extrema_phase = state
+        del self.extremas[count:]
+        del self.extrema_xs[count:]
+        self._did_update_extremas()
+        self.possible_extrema = possible_extrema
+        self.possible_extrema_phase = possible_extrema_phase
+
     def begin_update(self, domain):
         super().begin_update(domain)
+        if self.current is not None:
+            if domain.start > self.current or (domain.start == self.current and domain.start_open):
+                # The scan was rolled back to a checkpoint before the update
+                return
+            # The reference function was updated
+            if self._restore_checkpoint(domain):
+                return
+
         # remove stale points
         for i in reversed(range(len(self.extremas))):
             x = self.extrema_xs[i]
@@ -77,14 +98,20 @@ class Extremas(Scan):
         if extrema_count == 0:
             self.current = None
         else:
+            # the last extrema is confirmed again when scanning
             last_extrema = self.extremas[-1]
             x = last_extrema[0]
+            self._remove_extrema_index(extrema_count - 1)
             self.current = x
             self.possible_extrema = last_extrema
             self.possible_extrema_phase = last_extrema[1] - self.ref_func(x)
 
-    def sample_points(self, domain=None, min_step=MIN_STEP, step=None):
-        points = super().sample_points(domain=domain, min_step=min_step, step=step)
+    def sample_points(self, domain=None, min_step=MIN_STEP, step=None, as_arrays=False):
+        points = super().sample_points(domain=domain, min_step=min_step, step=step, as_arrays=as_arrays)
+        if as_arrays:
+            xs, ys = points
+            mask = np.array([y is not None for y in ys], dtype=bool) if ys.dtype == object else ~np.isnan(ys)
+            return xs[mask], ys[mask]
         return list(filter(lambda p: p[1] is not None, points))
 
     def _extrema_scan(self, x, y):
@@ -113,6 +140,50 @@ class Extremas(Scan):
             self.possible_extrema = (x, y)
             self.possible_extrema_phase = phase
     
+    def _extrema_scan_many(self, xs, ys):
+        # Same as calling `_extrema_scan()` for each point
+        y0s = self.ref_func.y_many(xs)
+        if y0s.dtype == object or (y0s == 0).any():
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                self._extrema_scan(x, None if np.isnan(y) else y)
+            return
+
+        with np.errstate(invalid='ignore'):
+            mask = ~np.isnan(ys) & ~np.isnan(y0s)
+            mask[mask] = np.abs(ys[mask] / y0s[mask] - 1) > self.min_deviation
+        xs = xs[mask]
+        ys = ys[mask]
+        phases = ys - y0s[mask]
+        if len(xs) == 0:
+            return
+        if self.possible_extrema is not None:
+            # Continue from the possible extrema
+            xs = np.concatenate(([self.possible_extrema[0]], xs))
+            ys = np.concatenate(([self.possible_extrema[1]], ys))
+            phases = np.concatenate(([self.possible_extrema_phase], phases))
+
+        # Split into segments with the same phase and find the
+        # first maximum (or minimum) in each segment
+        signs = np.sign(phases)
+        starts = np.flatnonzero(np.concatenate(([True], signs[1:] != signs[:-1])))
+        segments = np.cumsum(np.concatenate(([0], signs[1:] != signs[:-1])))
+        values = ys * signs
+        best_values = np.maximum.reduceat(values, starts)
+        best_indexes = np.flatnonzero(values == best_values[segments])
+        _, first = np.unique(segments[best_indexes], return_index=True)
+        best_indexes = best_indexes[first]
+
+        possible_i = best_indexes[-1]
+        possible_extrema = (xs[possible_i].item(), ys[possible_i].item())
+        possible_extrema_phase = phases[possible_i].item()
+        confirmed = best_indexes[:-1]
+        if len(confirmed) != 0:
+            self.extremas += list(zip(xs[confirmed].tolist(), ys[confirmed].tolist()))
+            self.extrema_xs += xs[confirmed].tolist()
+            self._did_update_extremas()
+        self.possible_extrema = possible_extrema
+        self.possible_extrema_phase = possible_extrema_phase
+
     def _remove_extrema_index(self, i):
         del self.extremas[i]
         del self.extrema_xs[i]
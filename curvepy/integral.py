@@ -1,5 +1,5 @@
+import numpy as np
 from .accumulator import Accumulator
-from .line import Line
 from .points import Points
 from .curve import MIN_STEP
 from intervalpy import Interval
@@ -8,10 +8,11 @@ from intervalpy import Interval
 class Integral(Accumulator):
 
     def __init__(self, func, const=0, interpolation=None, **kwargs):
-        super().__init__(func, self._integral_scan, interpolation=None, **kwargs)
+        super().__init__(func, self._integral_scan, interpolation=None, tfm_many=self._integral_scan_many, **kwargs)
         self.const = const
         self.integral_interpolation = interpolation or Points.interpolation.linear
-        self._line = Line(const=0, slope=0)
+        # The last scanned point of the function
+        self._previous_point = None
 
     def scanned_y(self, x):
         y = super().scanned_y(x)
@@ -19,33 +20,84 @@ class Integral(Accumulator):
             return y
         return y + self.const
 
+    def scanned_y_many(self, xs):
+        return super().scanned_y_many(xs) + self.const
+
+    def reset_scan(self):
+        super().reset_scan()
+        self._previous_point = None
+
+    def get_scan_state(self):
+        state = super().get_scan_state()
+        state['previous_point'] = self._previous_point
+        return state
+
+    def restore_scan_state(self, state):
+        super().restore_scan_state(state)
+        self._previous_point = state['previous_point']
+
     def _integral_scan(self, x, y, integral_sum):
+        previous_point = self._previous_point
+        self._previous_point = (x, y)
         if y is None:
             return integral_sum
         if integral_sum is None:
             integral_sum = 0.0
 
-        x0 = self.accumulated_points.x_previous(x)
-        if x0 is not None:
+        last_point = self.accumulated_points.last_point()
+        if last_point is None:
+            return integral_sum
+        x0 = last_point[0]
+        if previous_point is not None and previous_point[0] == x0:
+            y0 = previous_point[1]
+        else:
             y0 = self.curve.y(x0)
+        if y0 is None:
+            return integral_sum
+
+        interpolation = self.integral_interpolation
+        if interpolation == Points.interpolation.linear:
+            area = (y0 + y) * 0.5 * (x - x0)
+        elif interpolation == Points.interpolation.previous:
+            area = y0 * (x - x0)
+        elif interpolation == Points.interpolation.next:
+            area = y * (x - x0)
         else:
-            y0 = None
-
-        if y0 is not None:
-            interpolation = self.integral_interpolation
-            if interpolation == Points.interpolation.linear:
-                p1 = (x0, y0)
-                p2 = (x, y)
-            elif interpolation == Points.interpolation.previous:
-                p1 = (x0, y0)
-                p2 = (x, y0)
-            elif interpolation == Points.interpolation.next:
-                p1 = (x0, y)
-                p2 = (x, y)
-            else:
-                raise Exception(f'Unsupported interpolation: {self.interpolation}')
-            self._line.set(p1=p1, p2=p2)
-            area = self._line.partial_integration(x0, x)
-            integral_sum += area
-
-        return integral_sum
+            raise Exception(f'Unsupported interpolation: {interpolation}')
+        return integral_sum + area
+
+    def _integral_scan_many(self, xs, ys, integral_sum):
+        # Same as calling `_integral_scan()` for each point
+        ys = np.asarray(ys, dtype=float)
+        if self.accumulated_points.domain.is_empty:
+            x0 = np.nan
+            y0 = np.nan
+        else:
+            x0 = self.accumulated_points.domain.end
+            y0 = self.curve.y(x0)
+            if y0 is None:
+                y0 = np.nan
+        x0s = np.concatenate(([x0], xs[:-1]))
+        y0s = np.concatenate(([y0], ys[:-1]))
+        dxs = xs - x0s
+
+        interpolation = self.integral_interpolation
+        if interpolation == Points.interpolation.linear:
+            areas = (y0s + ys) * 0.5 * dxs
+        elif interpolation == Points.interpolation.previous:
+            areas = y0s * dxs
+        elif interpolation == Points.interpolation.next:
+            areas = ys * dxs
+        else:
+            raise Exception(f'Unsupported interpolation: {interpolation}')
+        has_y = ~np.isnan(ys)
+        areas = np.where(has_y & ~np.isnan(y0s) & ~np.isnan(dxs), areas, 0.0)
+
+        self._previous_point = (float(xs[-1]), float(ys[-1]) if has_y[-1] else None)
+
+        # Sum in order, starting from the last sum
+        sums = np.cumsum(np.concatenate(([integral_sum or 0.0], areas)))[1:]
+        started = np.logical_or.accumulate(has_y)
+        if integral_sum is not None:
+            started[:] = True
+        return np.where(started, sums, np.nan)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 
@@ -66,6 +67,10 @@ class Line(Curve):
     def y(self, x):
         return self.ref_point[1] + self.slope * (x - self.ref_point[0])
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        return self.ref_point[1] + self.slope * (xs - self.ref_point[0])
+
     def d_y(self, x, forward=False, min_step=MIN_STEP, limit=None):
         return self.slope
 
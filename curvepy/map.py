@@ -1,12 +1,19 @@
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
+from . import util
 
 class Map(Curve):
 
     def get_domain(self):
         return self.curve.domain
 
-    def __init__(self, func, tfm, skip_none=False, min_step=MIN_STEP, name=None):
+    def __init__(self, func, tfm, skip_none=False, min_step=MIN_STEP, name=None, tfm_many=None):
+        """
+        If `tfm_many` is specified, it is used by `y_many()` as a vectorized
+        version of `tfm`, which takes and returns arrays (with `NaN`
+        in place of `None`).
+        """
         if bool(func.min_step) and func.min_step > min_step:
             min_step = func.min_step
         super().__init__(min_step=min_step)
@@ -20,6 +27,14 @@ class Map(Curve):
         self._map_tfm_with_x = tfm_ags > 1
         self.map_tfm = tfm
 
+        self.map_tfm_many = None
+        if tfm_many is not None:
+            tfm_many_ags = type(self).count_positional_args(tfm_many)
+            if tfm_many_ags == 0 or tfm_many_ags > 2:
+                raise Exception('Unable to adapt function')
+            self._map_tfm_many_with_x = tfm_many_ags > 1
+            self.map_tfm_many = tfm_many
+
         self._observer_token = self.curve.add_observer(begin=self.begin_update, end=self.end_update, prioritize=True)
     
     def __repr__(self):
@@ -38,6 +53,29 @@ class Map(Curve):
             return None
         return self._map(x, y)
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        ys = self.curve.y_many(xs)
+        if self.map_tfm_many is None or ys.dtype == object:
+            # Transform each value
+            values = []
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                y = util.none_if_nan(y)
+                if y is None and self.skip_none:
+                    values.append(None)
+                else:
+                    values.append(self._map(x, y))
+            return util.values_to_array(values)
+
+        if self._map_tfm_many_with_x:
+            result = self.map_tfm_many(xs, ys)
+        else:
+            result = self.map_tfm_many(ys)
+        result = np.asarray(result, dtype=float)
+        if self.skip_none:
+            result = np.where(np.isnan(ys), np.nan, result)
+        return result
+
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         min_step = self.resolve_min_step(min_step)
         return self.curve.x_previous(x, min_step=min_step, limit=limit)
@@ -46,6 +84,17 @@ class Map(Curve):
         min_step = self.resolve_min_step(min_step)
         return self.curve.x_next(x, min_step=min_step, limit=limit)
 
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        min_step = self.resolve_min_step(min_step)
+        return self.curve.x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_grid(self):
+        return self.curve.x_grid()
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        min_step = self.resolve_min_step(min_step)
+        return self.curve.x_range(domain, min_step=min_step)
+
     def _map(self, x, y):
         if self._map_tfm_with_x:
             return self.map_tfm(x, y)
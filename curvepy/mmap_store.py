@@ -0,0 +1,149 @@
+import os
+import numpy as np
+
+MAGIC = b'CURVEPY\x00'
+VERSION = 1
+HEADER_SIZE = 64
+# Header fields (int64) after the magic bytes
+_VERSION = 0
+_COLUMNS = 1
+_COUNT = 2
+_INTERPOLATION = 3
+_UNIFORM = 4
+_HEADER_FIELDS = 5
+MIN_CAPACITY = 1024
+
+
+class MmapStore:
+
+    """
+    A memory-mapped file of points.
+
+    The file starts with a header of `HEADER_SIZE` bytes, followed by
+    contiguous blocks of little-endian float64 values for each column:
+    `x`, then `y`, or `y_0, ..., y_n` if the points have columns.
+    Missing values are stored as `NaN`.
+
+    Each block has room for `capacity` values, of which the first `count`
+    are used. The file grows geometrically when more values are needed,
+    in which case the blocks are moved to their new offsets.
+    """
+
+    @property
+    def count(self):
+        return int(self._header[_COUNT])
+
+    @count.setter
+    def count(self, value):
+        self._header[_COUNT] = value
+
+    @property
+    def capacity(self):
+        return self._blocks.shape[1]
+
+    @property
+    def columns(self):
+        columns = int(self._header[_COLUMNS])
+        return columns if columns != 0 else None
+
+    @property
+    def interpolation(self):
+        return int(self._header[_INTERPOLATION])
+
+    @property
+    def uniform(self):
+        return bool(self._header[_UNIFORM])
+
+    @property
+    def is_read_only(self):
+        return self.mode == 'r'
+
+    @property
+    def xs(self):
+        return self._blocks[0]
+
+    @property
+    def ys(self):
+        if self.columns is None:
+            return self._blocks[1]
+        # Points are indexed by row
+        return self._blocks[1:].T
+
+    @classmethod
+    def open(cls, path, columns=None, interpolation=0, uniform=True, mode='r+'):
+        """
+        Opens the file at `path`, creating it if it does not exist
+        (unless `mode` is `'r'`). `columns`, `interpolation` and `uniform`
+        are only used when creating a file.
+        """
+        if mode not in ('r', 'r+'):
+            raise Exception(f'Unsupported mode: {mode}')
+        if not os.path.exists(path):
+            if mode == 'r':
+                raise Exception(f'File not found: {path}')
+            cls._create(path, columns, interpolation, uniform)
+        return cls(path, mode=mode)
+
+    @classmethod
+    def _create(cls, path, columns, interpolation, uniform):
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            header = np.zeros(_HEADER_FIELDS, dtype='<i8')
+            header[_VERSION] = VERSION
+            header[_COLUMNS] = columns or 0
+            header[_INTERPOLATION] = interpolation
+            header[_UNIFORM] = int(bool(uniform))
+            f.write(header.tobytes())
+            f.write(bytes(HEADER_SIZE - f.tell()))
+
+    def __init__(self, path, mode='r+'):
+        self.path = path
+        self.mode = mode
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise Exception(f'Not a points file: {path}')
+        self._header = np.memmap(path, dtype='<i8', mode=mode, offset=len(MAGIC), shape=(_HEADER_FIELDS,))
+        if self._header[_VERSION] != VERSION:
+            raise Exception(f'Unsupported points file version: {self._header[_VERSION]}')
+        self._blocks = None
+        self._map_blocks()
+
+    def reserve(self, capacity):
+        """
+        Ensures that the file can hold at least `capacity` points.
+        """
+        if capacity <= self.capacity:
+            return
+        if self.is_read_only:
+            raise Exception('Attempting to modify a read-only points file')
+        old_capacity = self.capacity
+        capacity = max(capacity, old_capacity * 2, MIN_CAPACITY)
+        self.flush()
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + capacity * self._row_size)
+        self._map_blocks()
+        # Blocks only move forward, so the last block is moved first
+        values = self._blocks.reshape(-1)
+        count = self.count
+        for i in reversed(range(1, self._row_width)):
+            values[i * capacity:i * capacity + count] = values[i * old_capacity:i * old_capacity + count].copy()
+
+    def flush(self):
+        self._header.flush()
+        if isinstance(self._blocks, np.memmap):
+            self._blocks.flush()
+
+    @property
+    def _row_width(self):
+        return 1 + (self.columns or 1)
+
+    @property
+    def _row_size(self):
+        return self._row_width * 8
+
+    def _map_blocks(self):
+        capacity = (os.path.getsize(self.path) - HEADER_SIZE) // self._row_size
+        if capacity == 0:
+            self._blocks = np.empty((self._row_width, 0))
+            return
+        self._blocks = np.memmap(self.path, dtype='<f8', mode=self.mode, offset=HEADER_SIZE, shape=(self._row_width, capacity))
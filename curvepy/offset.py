@@ -1,7 +1,9 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 from pyduration import Duration
+from . import util
 
 
 class Offset(Curve):
@@ -37,6 +39,51 @@ class Offset(Curve):
     def y(self, x):
         return self._interpolated_func(self.curve.y, x)
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        if self.duration is None:
+            x0s = xs - self.offset
+            ys = self.curve.y_many(x0s)
+            return util.set_missing(ys, ~util.interval_mask(self.curve.domain, x0s))
+
+        step = self._uniform_step()
+        if step is not None:
+            x0s = np.floor(xs / step) * step - self.offset * step
+            x1s = np.ceil(xs / step) * step - self.offset * step
+        else:
+            # Steps depend on the calendar, find them one by one
+            x0s = np.full(len(xs), np.nan)
+            x1s = np.full(len(xs), np.nan)
+            for i, x in enumerate(xs.tolist()):
+                x0 = self._unoffset_x(x, floor=True)
+                x1 = self._unoffset_x(x, floor=False)
+                if x0 is not None and x1 is not None:
+                    x0s[i] = x0
+                    x1s[i] = x1
+        valid = util.interval_mask(self.curve.domain, x0s) & util.interval_mask(self.curve.domain, x1s)
+        ys = np.full(len(xs), np.nan)
+        if not valid.any():
+            return ys
+        x0s = x0s[valid]
+        x1s = x1s[valid]
+        y0s = self.curve.y_many(x0s)
+        if y0s.dtype == object:
+            return super().y_many(xs)
+        y1s = y0s.copy()
+        between = x0s != x1s
+        if between.any():
+            y1s[between] = self.curve.y_many(x1s[between])
+            if step is not None:
+                _x0s = x0s[between] + self.offset * step
+                _x1s = x1s[between] + self.offset * step
+            else:
+                _x0s = np.array([self._offset_x(x, floor=True) for x in x0s[between].tolist()])
+                _x1s = np.array([self._offset_x(x, floor=False) for x in x1s[between].tolist()])
+            u = (xs[valid][between] - _x0s) / (_x1s - _x0s)
+            y0s[between] = y0s[between] * (1 - u) + y1s[between] * u
+        ys[valid] = y0s
+        return ys
+
     def d_y(self, x, **kwargs):
         return self._interpolated_func(self.curve.d_y, x, **kwargs)
 
@@ -83,12 +130,52 @@ class Offset(Curve):
             return None
         return self._offset_x(x1, floor=True)
 
+    def x_range(self, domain, min_step=MIN_STEP):
+        domain = Interval.intersection([self.domain, Interval.parse(domain)])
+        if domain.is_empty:
+            return np.empty(0)
+        if self.duration is None:
+            xs = self.curve.x_range(
+                Interval(domain.start - self.offset, domain.end - self.offset, start_open=domain.start_open, end_open=domain.end_open),
+                min_step=min_step
+            )
+            if xs is None:
+                return None
+            return xs + self.offset
+
+        # Steps are the same as `duration` steps if they are uniform
+        step = self._uniform_step()
+        if step is None or not domain.is_finite:
+            return None
+        min_step = self.resolve_min_step(min_step)
+        if min_step is not None and min_step > step:
+            return None
+        if self.duration.floor(self.domain.start) != self.domain.start or self.duration.floor(self.domain.end) != self.domain.end:
+            return None
+        x_start = self.duration.ceil(domain.start)
+        if domain.start_open and x_start == domain.start:
+            x_start += step
+        # Use integer multiples of the step to avoid accumulating errors
+        xs = x_start + step * np.arange(max(math.floor((domain.end - x_start) / step) + 1, 0))
+        if domain.end_open:
+            xs = xs[xs < domain.end]
+        return xs
+
     def begin_offset_update(self, domain):
         self.begin_update(self._offset_interval(domain))
 
     def end_offset_update(self, domain):
         self.end_update(self._offset_interval(domain))
 
+    def _uniform_step(self):
+        """
+        Returns the length of `duration` if its steps are multiples
+        of its length, otherwise returns `None`.
+        """
+        if self.duration is None or not self.duration.is_uniform or self.duration.is_calendar_required:
+            return None
+        return self.duration.ave_seconds
+
     def _offset_x(self, x, floor=False):
         if x is None or math.isinf(x):
             return x
@@ -1,5 +1,7 @@
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
+from . import util
 
 class Piecewise(Curve):
 
@@ -32,6 +34,21 @@ class Piecewise(Curve):
             f = self.funcs[i]
             return f.y(x)
         return None
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        ys = np.full(len(xs), np.nan)
+        # Each value belongs to the first sub-domain which does not end before it
+        remaining = np.ones(len(xs), dtype=bool)
+        for d, f in zip(self.domains, self.funcs):
+            before_end = remaining & util.interval_mask(d, xs, enforce_start=False)
+            inside = before_end & util.interval_mask(d, xs, enforce_end=False)
+            if inside.any():
+                ys[inside] = f.y_many(xs[inside])
+            remaining &= ~before_end
+            if not remaining.any():
+                break
+        return ys
     
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         # FIXME: infinite funcs don't work (unit tests disabled)
@@ -1,6 +1,9 @@
 import math
+import numbers
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
+from . import util
 
 PREVIOUS_INTERPOLATION = -1
 LINEAR_INTERPOLATION = 0
@@ -12,9 +15,21 @@ ALL_INTERPOLATIONS = [
     NEXT_INTERPOLATION
 ]
 
+MIN_CAPACITY = 16
+
 
 class Points(Curve):
 
+    """
+    Points are stored in two contiguous arrays of `x` and `y` values.
+    Numeric values are stored as floats, with `NaN` in place of `None`.
+    Other values (such as tuples) are stored in an object array.
+
+    If `columns` is specified, each value is a sequence of (at most)
+    `columns` numbers, stored in a 2D float array. Use `column()`
+    to get a function of a single column.
+    """
+
     class interpolation:
 
         previous = PREVIOUS_INTERPOLATION
@@ -30,28 +45,87 @@ class Points(Curve):
             return True
         return self._is_equally_spaced
 
+    @property
+    def xs(self):
+        """
+        Returns a read-only view of the `x` values.
+        """
+        return _read_only(self._xs[:self._count])
+
+    @property
+    def ys(self):
+        """
+        Returns a read-only view of the `y` values.
+        """
+        return _read_only(self._ys[:self._count])
+
+    @property
+    def _points(self):
+        """
+        Returns a new list of points as `(x, y)` tuples.
+        """
+        return self._point_list(0, self._count)
+
     def get_domain(self):
-        if len(self._points) == 0:
+        if self._count == 0:
             return Interval.empty()
-        return Interval(self._points[0][0], self._points[-1][0], start_open=False, end_open=False)
+        return Interval(self._x_at(0), self._x_at(self._count - 1), start_open=False, end_open=False)
 
-    def __init__(self, points, interpolation=None, uniform=True):
+    def __init__(self, points, interpolation=None, uniform=True, columns=None):
         """
         `points` are assumed to be strictly ordered in ascending order w.r.t. to `x`.
         """
         super().__init__()
-        
+
         if interpolation is None:
             interpolation = Points.interpolation.default
         if interpolation not in ALL_INTERPOLATIONS:
             raise Exception('Invalid interpolation')
         self.interpolation = interpolation
         self.interval = None
-        self._points = []
+        self.columns = columns
+        self._xs = np.empty(0)
+        self._ys = np.empty(0) if columns is None else np.empty((0, columns))
+        self._count = 0
         self._force_equally_spaced = uniform
         self._is_equally_spaced = None
+        self._store = None
+        # If `True`, the last point is expected to be replaced, such as
+        # a quote which is still open, and scans of the points keep their
+        # state before the last point (see `Scan.provisional_last_point`).
+        self.provisional_last_point = False
         self.set(points)
 
+    @classmethod
+    def open_mmap(cls, path, columns=None, interpolation=None, uniform=True, mode='r+'):
+        """
+        Returns points stored in a memory-mapped file at `path` (see `MmapStore`).
+        The file is created if it does not exist, in which case `columns`,
+        `interpolation` and `uniform` are used. Otherwise they are read from the file.
+        Changes to the points are written to the file.
+        """
+        from .mmap_store import MmapStore
+
+        if interpolation is None:
+            interpolation = Points.interpolation.default
+        store = MmapStore.open(path, columns=columns, interpolation=interpolation, uniform=uniform, mode=mode)
+        points = cls([], interpolation=store.interpolation, uniform=store.uniform, columns=store.columns)
+        points._store = store
+        points._xs = store.xs
+        points._ys = store.ys
+        points._count = store.count
+        points._is_equally_spaced = points._xs_equally_spaced(points._xs[:0], points._xs[:points._count])
+        points._did_change_points()
+        points.set_needs_interval_update()
+        return points
+
+    def flush(self):
+        """
+        Writes changes to a memory-mapped file, if any.
+        """
+        if self._store is not None:
+            self._store.flush()
+
     def append(self, point):
         """
         `points` are assumed to be strictly ordered in ascending order w.r.t. to `x`.
@@ -62,29 +136,37 @@ class Points(Curve):
         """
         `points` are assumed to be strictly ordered in ascending order w.r.t. to `x`.
         """
-        points_len = len(self._points)
-        if points_len == 0:
+        if self._count == 0:
             return self.set(points)
-        new_points_len = len(points)
-        if new_points_len == 0:
+        if len(points) == 0:
             return
-
-        if points[0][0] <= self._points[-1][0]:
+        if points[0][0] <= self._x_at(-1):
             raise Exception('Attempting to append points in non-ascending order')
+        xs, ys = self._point_arrays(points)
+        self._append_point_arrays(xs, ys)
 
-        if self.domain.is_empty:
-            domain = Interval.closed(points[0][0], points[-1][0])
-        else:
-            domain = Interval(self.domain.end, points[-1][0], start_open=True, end_open=False)
-        self.begin_update(domain)
-        self._is_equally_spaced = self._points_equally_spaced(self._points, points)
-        if self._force_equally_spaced and not self._is_equally_spaced:
-            raise Exception('Attempting to append points at non-regular intervals: {}{} + {}{}'.format('...' if len(self._points) > 2 else '', self._points[len(self._points) - 2:], points[:2], '...' if len(points) > 2 else ''))
-        self._points += points
-        self._did_change_points()
-        self.end_update(domain)
+    def last_point(self):
+        if self._count == 0:
+            return None
+        return (self._x_at(-1), self._y_at(-1))
+
+    def append_arrays(self, xs, ys):
+        """
+        Appends an array of `x` values and an array of values
+        (or a 2D array if `columns` is specified).
+        Unlike `append_list()`, the order of `xs` is validated.
+        """
+        xs, ys = self._validated_arrays(xs, ys)
+        if self._count == 0:
+            return self._set_point_arrays(xs, ys)
+        if len(xs) == 0:
+            return
+        if xs[0] <= self._x_at(-1):
+            raise Exception('Attempting to append points in non-ascending order')
+        self._append_point_arrays(xs, ys)
 
     def replace(self, point, or_append=False):
+        self._check_writable()
         if not self.domain.contains(point[0]):
             if or_append:
                 return self.append(point)
@@ -95,21 +177,22 @@ class Points(Curve):
         self.begin_update(update_domain)
 
         nearest_i = int(math.ceil(self.x_index(point[0])))
-        nearest_p = self._points[nearest_i]
-        if point[0] != nearest_p[0]:
+        nearest_x = self._x_at(nearest_i)
+        if point[0] != nearest_x:
             if self._force_equally_spaced:
-                raise Exception('Attempting to replace point {} between existing points. The nearest is {}.'.format(point, nearest_p))
+                raise Exception('Attempting to replace point {} between existing points. The nearest is {}.'.format(point, (nearest_x, self._y_at(nearest_i))))
             else:
-                self._points.insert(nearest_i, point)
+                self._insert_point(nearest_i, point)
                 self._is_equally_spaced = False
         else:
-            self._points[nearest_i] = point
+            self._set_y_at(nearest_i, point[1])
 
         self._did_change_points()
-        self.end_update(update_domain)    
+        self.end_update(update_domain)
 
     def reset(self, domain=None):
-        points_len = len(self._points)
+        self._check_writable()
+        points_len = self._count
         if points_len == 0:
             return
         if domain is None:
@@ -127,133 +210,172 @@ class Points(Curve):
         if remove_start_i == remove_end_i:
             # Nothing to remove
             return
-        head = self._points[:remove_start_i]
-        tail = self._points[remove_end_i:]
-        if len(head) != 0 and domain.contains(head[-1][0]):
-            del head[-1]
-        if len(tail) != 0 and domain.contains(tail[0][0]):
-            del tail[0]
-        head_len = len(head)
-        tail_len = len(tail)
+        head_len = remove_start_i
+        tail_start = remove_end_i
+        if head_len != 0 and domain.contains(self._x_at(head_len - 1)):
+            head_len -= 1
+        if tail_start != points_len and domain.contains(self._x_at(tail_start)):
+            tail_start += 1
+        tail_len = points_len - tail_start
         if head_len + tail_len == 0:
             self.set([])
             return
-        points = head + tail
 
-        update_start = self._points[0][0]
+        update_start = self._x_at(0)
         update_start_open = False
         if head_len != 0:
-            update_start = head[-1][0]
+            update_start = self._x_at(head_len - 1)
             update_start_open = True
 
-        update_end = self._points[-1][0]
+        update_end = self._x_at(-1)
         update_end_open = False
         if tail_len != 0:
-            update_end = tail[0][0]
+            update_end = self._x_at(tail_start)
             update_end_open = True
 
         update_domain = Interval(update_start, update_end, start_open=update_start_open, end_open=update_end_open)
 
-        self.set(points, update_domain=update_domain)
+        if tail_len == 0:
+            xs = self._xs[:head_len]
+        else:
+            xs = np.concatenate((self._xs[:head_len], self._xs[tail_start:points_len]))
 
-    def set(self, points, update_domain=None):
-        """
-        `points` are assumed to be strictly ordered in ascending order w.r.t. to `x`.
-        """
-        if update_domain is None:
-            points_len = len(points)
-            if points_len == 0:
-                update_domain = self.domain
-            else:
-                update_domain = Interval.union([self.domain, Interval.closed(points[0][0], points[-1][0])])
         self.begin_update(update_domain)
-        self._is_equally_spaced = self._points_equally_spaced([], points)
+        self._is_equally_spaced = self._xs_equally_spaced(self._xs[:0], xs)
         if self._force_equally_spaced and not self._is_equally_spaced:
             raise Exception('Attempting to set points at non-regular intervals')
-        self._points = list(points)
+        # Remove points in place
+        if tail_len != 0:
+            self._xs[head_len:head_len + tail_len] = self._xs[tail_start:points_len]
+            self._ys[head_len:head_len + tail_len] = self._ys[tail_start:points_len]
+        self._count = head_len + tail_len
         self._did_change_points()
         self.end_update(update_domain)
 
-    def sample_points(self, domain=None, min_step=None, step=None):
+    def set(self, points, update_domain=None):
+        """
+        `points` are assumed to be strictly ordered in ascending order w.r.t. to `x`.
+        """
+        xs, ys = self._point_arrays(points)
+        self._set_point_arrays(xs, ys, update_domain=update_domain)
+
+    def set_arrays(self, xs, ys, update_domain=None):
+        """
+        Sets points from an array of `x` values and an array of values
+        (or a 2D array if `columns` is specified).
+        Unlike `set()`, the order of `xs` is validated.
+        """
+        xs, ys = self._validated_arrays(xs, ys)
+        self._set_point_arrays(xs, ys, update_domain=update_domain)
+
+    def sample_points(self, domain=None, min_step=None, step=None, as_arrays=False):
         domain = Interval.parse(domain, default_inf=True)
 
         if self.domain.is_empty:
-            return []
+            return self._sampled(0, 0, as_arrays)
 
         if self.interval is not None and ((min_step is not None and min_step > self.interval) or (step is not None and step != self.interval)):
             # Irregular sampling
-            return super().sample_points(domain=domain, min_step=min_step, step=step)
+            return super().sample_points(domain=domain, min_step=min_step, step=step, as_arrays=as_arrays)
 
         if domain is None or domain.is_superset_of(self.domain):
             # Sample all
-            return list(self._points)
+            i0, i1 = 0, self._count
+        else:
+            # Sample some
+            domain = Interval.intersection([self.domain, domain])
+            if domain.is_empty:
+                i0, i1 = 0, 0
+            else:
+                i0, i1 = self._domain_indexes(domain)
+        return self._sampled(i0, i1, as_arrays)
 
-        # Sample some
-        domain = Interval.intersection([self.domain, domain])
-        if domain.is_empty:
-            return []
-        i0, i1 = self._domain_indexes(domain)
-        return self._points[i0:i1]
+    def column(self, column, name=None, min_step=None):
+        """
+        Returns a function of the values in `column`.
+        Requires `columns` to be specified.
+        """
+        if self.columns is None:
+            raise Exception('Points do not have columns')
+        return PointsColumn(self, column, name=name, min_step=min_step)
 
     def _did_change_points(self):
         self.interval = None
-        len_points = len(self._points)
+        len_points = self._count
         if len_points > 1:
-            self.interval = (self._points[-1][0] - self._points[0][0]) / (len_points - 1)
+            self.interval = (self._x_at(-1) - self._x_at(0)) / (len_points - 1)
+        if self._store is not None and not self._store.is_read_only:
+            self._store.count = len_points
 
-    def _points_equally_spaced(self, old_points, new_points):
-        old_points_len = len(old_points)
-        new_points_len = len(new_points)
+    def _xs_equally_spaced(self, old_xs, new_xs):
+        old_points_len = len(old_xs)
+        new_points_len = len(new_xs)
         if new_points_len == 0 or old_points_len + new_points_len < 2:
             return True
 
         if old_points_len != 0:
-            start = old_points[-1][0]
+            start = float(old_xs[-1])
             steps = new_points_len
         else:
-            start = new_points[0][0]
+            start = float(new_xs[0])
             steps = new_points_len - 1
 
-        if self.interval is not None:
+        if self.interval is not None and (old_points_len != 0 or self._force_equally_spaced):
             interval = self.interval
         elif old_points_len == 1:
-            interval = new_points[0][0] - old_points[-1][0]
+            interval = float(new_xs[0]) - float(old_xs[-1])
         else:
-            interval = new_points[1][0] - new_points[0][0]
+            interval = float(new_xs[1]) - float(new_xs[0])
 
         expected_last_x = start + interval * steps
-        return new_points[-1][0] == expected_last_x
+        return float(new_xs[-1]) == expected_last_x
 
     def y(self, x):
         if not self.domain.contains(x):
             return None
         i_ = self.x_index(x)
+        if self.columns is not None:
+            row = _interpolate_many(self._ys[:self._count], np.array([i_]), self.interpolation)[0]
+            return _row_value(row)
         u = i_ % 1.0
         i = int(i_)
         if u == 0:
-            return self._points[i][1]
+            return self._y_at(i)
         if self.interpolation == Points.interpolation.linear:
-            y1 = self._points[i][1]
-            y2 = self._points[i + 1][1]
+            y1 = self._y_at(i)
+            y2 = self._y_at(i + 1)
             if y1 is None or y2 is None:
                 return None
             return (1.0 - u) * y1 + u * y2
         elif self.interpolation == Points.interpolation.previous:
-            return self._points[i][1]
+            return self._y_at(i)
         elif self.interpolation == Points.interpolation.next:
-            return self._points[i + 1][1]
+            return self._y_at(i + 1)
         else:
             raise Exception('Unknown interpolation')
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        if self._ys.dtype == object or self.columns is not None:
+            return super().y_many(xs)
+
+        ys = np.full(len(xs), np.nan)
+        mask = util.interval_mask(self.domain, xs)
+        if not mask.any():
+            return ys
+        indexes = self.x_index_many(xs[mask])
+        ys[mask] = _interpolate_many(self._ys[:self._count], indexes, self.interpolation)
+        return ys
+
     def y_start(self):
         if self.domain.is_empty:
             return None
-        return self._points[0][1]
+        return self._y_at(0)
 
     def y_end(self):
         if self.domain.is_empty:
             return None
-        return self._points[-1][1]
+        return self._y_at(-1)
 
     # TODO: optimise d_y()
 
@@ -267,7 +389,7 @@ class Points(Curve):
             return self.domain.start
         # i = max(0, int(math.floor(self.x_index(x))) + 1)
         i = max(0, int(math.ceil(self.x_index(x + min_step))))
-        return self._points[i][0]
+        return self._x_at(i)
 
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         if self.domain.is_empty:
@@ -277,32 +399,88 @@ class Points(Curve):
             return None
         if math.isinf(x) and x > 0:
             return self.domain.end
-        # i = min(len(self._points) - 1, int(math.ceil(self.x_index(x))) - 1)
-        i = min(len(self._points) - 1, int(math.floor(self.x_index(x - min_step))))
-        return self._points[i][0]
+        # i = min(self._count - 1, int(math.ceil(self.x_index(x))) - 1)
+        i = min(self._count - 1, int(math.floor(self.x_index(x - min_step))))
+        return self._x_at(i)
+
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        min_step = self.resolve_min_step(min_step)
+        if not self.is_uniform or self.interval is None or min_step is None or min_step > self.interval or abs(steps) < 2:
+            return super().x_step(x, steps, min_step=min_step, clamp=clamp)
+        # Take the first step, then move by index
+        x1 = self.x_next(x, min_step=min_step) if steps > 0 else self.x_previous(x, min_step=min_step)
+        if x1 is None:
+            return x if clamp else None
+        i = int(round(self.x_index(x1))) + (steps - 1 if steps > 0 else steps + 1)
+        if i < 0 or i >= self._count:
+            if not clamp:
+                return None
+            i = min(max(i, 0), self._count - 1)
+        return self._x_at(i)
+
+    def x_grid(self):
+        return self
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        min_step = self.resolve_min_step(min_step)
+        domain = Interval.parse(domain)
+        if self.domain.is_empty or domain.is_empty:
+            return np.empty(0)
+        i0, i1 = self._domain_indexes(domain)
+        xs = self._xs[i0:i1]
+        if min_step is not None and len(xs) > 1 and not (np.diff(xs) >= min_step).all():
+            # Points would be skipped
+            return None
+        return xs.copy()
 
     def x_index(self, x):
         if self.is_uniform:
             if self.interval is None:
                 return 0
-            return (x - self._points[0][0]) / self.interval
+            return (x - self._x_at(0)) / self.interval
         else:
-            i1 = _bisect_points(self._points, x)
+            i1 = int(np.searchsorted(self._xs[:self._count], x, side='left'))
             i0 = i1 - 1
             if i0 < 0:
                 return i1
-            if i1 >= len(self._points):
+            if i1 >= self._count:
                 return i0
-            x0 = self._points[i0][0]
-            x1 = self._points[i1][0]
+            x0 = self._x_at(i0)
+            x1 = self._x_at(i1)
             u = (x - x0) / (x1 - x0)
             return float(i0) + u
 
+    def x_index_many(self, xs):
+        """
+        Returns the fractional indexes of `xs`, same as calling `x_index()`
+        on each value.
+        """
+        xs = np.asarray(xs, dtype=float)
+        if self.is_uniform:
+            if self.interval is None:
+                return np.zeros(len(xs))
+            return (xs - self._x_at(0)) / self.interval
+
+        points_xs = self._xs[:self._count]
+        last_i = self._count - 1
+        i1 = np.searchsorted(points_xs, xs, side='left')
+        i0 = i1 - 1
+        x0 = points_xs[np.clip(i0, 0, last_i)]
+        x1 = points_xs[np.clip(i1, 0, last_i)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = (xs - x0) / (x1 - x0)
+        indexes = i0 + u
+        # Exact and out of bounds points
+        indexes = np.where(i0 < 0, i1, indexes)
+        indexes = np.where(i1 > last_i, i0, indexes)
+        indexes = np.where((i1 <= last_i) & (x1 == xs), i1, indexes)
+        return indexes.astype(float)
+
     def _domain_indexes(self, domain):
         """
         Turn a domain into start and end indexes (inclusive and exclusive respectively).
         """
-        points_len = len(self._points)
+        points_len = self._count
         if domain.is_superset_of(self.domain):
             return 0, points_len
 
@@ -310,53 +488,337 @@ class Points(Curve):
         if domain.is_empty:
             return 0, 0
 
-        if domain.is_negative_infinite:
-            start_i = 0
+        xs = self._xs[:points_len]
+        start_i = int(np.searchsorted(xs, domain.start, side='right' if domain.start_open else 'left'))
+        end_i = int(np.searchsorted(xs, domain.end, side='left' if domain.end_open else 'right'))
+        return start_i, max(start_i, end_i)
+
+    def _x_at(self, i):
+        if i < 0:
+            i += self._count
+        return float(self._xs[i])
+
+    def _y_at(self, i):
+        if i < 0:
+            i += self._count
+        y = self._ys[i]
+        if self.columns is not None:
+            return _row_value(y)
+        if self._ys.dtype == object:
+            return y
+        y = float(y)
+        if math.isnan(y):
+            return None
+        return y
+
+    def _set_y_at(self, i, y):
+        if self.columns is not None:
+            self._ys[i] = self._point_arrays([(0, y)])[1][0]
+            return
+        if y is not None and self._ys.dtype != object and not isinstance(y, numbers.Real):
+            self._check_object_values()
+            self._ys = _object_array(self._ys)
+        if self._ys.dtype == object:
+            self._ys[i] = y
+        else:
+            self._ys[i] = np.nan if y is None else y
+
+    def _sampled(self, i0, i1, as_arrays):
+        if as_arrays:
+            return self._xs[i0:i1].copy(), self._ys[i0:i1].copy()
+        return self._point_list(i0, i1)
+
+    def _point_list(self, i0, i1):
+        xs = self._xs[i0:i1].tolist()
+        ys = self._ys[i0:i1]
+        if self.columns is not None:
+            ys = [_row_value(row) for row in ys]
+        elif ys.dtype == object:
+            ys = ys.tolist()
+        else:
+            ys = util.array_to_values(ys)
+        return list(zip(xs, ys))
+
+    def _check_writable(self):
+        # Check before notifying observers of an update
+        if self._store is not None and self._store.is_read_only:
+            raise Exception(f'Attempting to modify read-only points: {self._store.path}')
+
+    def _reserve(self, capacity):
+        """
+        Ensures that the buffers can hold at least `capacity` points.
+        The buffers are grown geometrically.
+        """
+        old_capacity = len(self._xs)
+        if capacity <= old_capacity:
+            return
+        if self._store is not None:
+            self._store.reserve(capacity)
+            self._xs = self._store.xs
+            self._ys = self._store.ys
+            return
+        capacity = max(capacity, old_capacity * 2, MIN_CAPACITY)
+        count = self._count
+        xs = np.empty(capacity)
+        xs[:count] = self._xs[:count]
+        ys = np.empty((capacity,) + self._ys.shape[1:], dtype=self._ys.dtype)
+        ys[:count] = self._ys[:count]
+        self._xs = xs
+        self._ys = ys
+
+    def _set_point_arrays(self, xs, ys, update_domain=None):
+        self._check_writable()
+        if update_domain is None:
+            if len(xs) == 0:
+                update_domain = self.domain
+            else:
+                update_domain = Interval.union([self.domain, Interval.closed(float(xs[0]), float(xs[-1]))])
+        self.begin_update(update_domain)
+        self._is_equally_spaced = self._xs_equally_spaced(xs[:0], xs)
+        if self._force_equally_spaced and not self._is_equally_spaced:
+            raise Exception('Attempting to set points at non-regular intervals')
+        if self._store is None:
+            self._xs = xs
+            self._ys = ys
+            self._count = len(xs)
+        else:
+            self._count = 0
+            self._append_arrays(xs, ys)
+        self._did_change_points()
+        self.end_update(update_domain)
+
+    def _append_point(self, point):
+        """
+        Appends a point in O(1), without notifying observers if there
+        are none. Used for points which are internal to a function.
+        """
+        if len(self._observer_data) != 0 or self._count == 0 or self.columns is not None:
+            return self.append(point)
+        self._check_writable()
+        x, y = point
+        count = self._count
+        last_x = self._x_at(count - 1)
+        if x <= last_x:
+            raise Exception('Attempting to append points in non-ascending order')
+        if count > 1 and self._is_equally_spaced is not False:
+            # Same as `_xs_equally_spaced()` for one point
+            self._is_equally_spaced = x == last_x + self.interval
+            if self._force_equally_spaced and not self._is_equally_spaced:
+                raise Exception('Attempting to append points at non-regular intervals: {}{} + {}'.format('...' if count > 2 else '', self._point_list(count - 2, count), [point]))
+        self._reserve(count + 1)
+        self._count = count + 1
+        self._xs[count] = x
+        self._set_y_at(count, y)
+        self._did_change_points()
+        self.set_needs_interval_update()
+
+    def _append_point_arrays(self, xs, ys):
+        self._check_writable()
+        points_len = self._count
+        if self.domain.is_empty:
+            domain = Interval.closed(float(xs[0]), float(xs[-1]))
         else:
-            i = max(0, int(math.floor(self.x_index(domain.start))))
-            while i < points_len:
-                x = self._points[i][0]
-                if x >= domain.end:
-                    # i -= 1
-                    break
-                if domain.contains(x):
-                    break
-                i += 1
-            start_i = i
-            
-        if domain.is_positive_infinite:
-            end_i = points_len
+            domain = Interval(self.domain.end, float(xs[-1]), start_open=True, end_open=False)
+        self.begin_update(domain)
+        # Points stay irregular once a gap is appended
+        self._is_equally_spaced = self._is_equally_spaced is not False and self._xs_equally_spaced(self.xs, xs)
+        if self._force_equally_spaced and not self._is_equally_spaced:
+            new_points = list(zip(xs[:2].tolist(), ys[:2].tolist()))
+            raise Exception('Attempting to append points at non-regular intervals: {}{} + {}{}'.format('...' if points_len > 2 else '', self._point_list(max(0, points_len - 2), points_len), new_points, '...' if len(xs) > 2 else ''))
+        self._append_arrays(xs, ys)
+        self._did_change_points()
+        self.end_update(domain)
+
+    def _validated_arrays(self, xs, ys):
+        xs = np.array(xs, dtype=float)
+        if self.columns is None:
+            if isinstance(ys, np.ndarray) and ys.dtype != object:
+                ys = ys.astype(float)
+            else:
+                ys = util.values_to_array(list(ys))
+        else:
+            ys = np.array(ys, dtype=float)
+            if ys.ndim != 2 or ys.shape[1] > self.columns:
+                raise Exception(f'Expected values with at most {self.columns} columns')
+            if ys.shape[1] < self.columns:
+                ys = np.hstack((ys, np.full((len(ys), self.columns - ys.shape[1]), np.nan)))
+        if xs.ndim != 1 or len(xs) != len(ys):
+            raise Exception('Expected the same number of x values and values')
+        if len(xs) > 1 and not (np.diff(xs) > 0).all():
+            raise Exception('Attempting to set points in non-ascending order')
+        return xs, ys
+
+    def _check_object_values(self):
+        if self._store is not None:
+            raise Exception('Memory-mapped points only support numeric values')
+
+    def _point_arrays(self, points):
+        xs = np.array([p[0] for p in points], dtype=float)
+        if self.columns is None:
+            return xs, util.values_to_array([p[1] for p in points])
+        ys = np.full((len(points), self.columns), np.nan)
+        for i, p in enumerate(points):
+            if p[1] is not None:
+                row = np.array(p[1], dtype=float)
+                ys[i, :len(row)] = row
+        return xs, ys
+
+    def _append_arrays(self, xs, ys):
+        count = self._count
+        new_count = count + len(xs)
+        if ys.dtype == object and self._ys.dtype != object:
+            self._check_object_values()
+            self._ys = _object_array(self._ys[:count])
+        elif ys.dtype != object and self._ys.dtype == object:
+            ys = _object_array(ys)
+        self._reserve(new_count)
+        self._xs[count:new_count] = xs
+        self._ys[count:new_count] = ys
+        self._count = new_count
+
+    def _insert_point(self, i, point):
+        count = self._count
+        self._reserve(count + 1)
+        self._xs[i + 1:count + 1] = self._xs[i:count]
+        self._ys[i + 1:count + 1] = self._ys[i:count]
+        self._count = count + 1
+        self._xs[i] = point[0]
+        self._set_y_at(i, point[1])
+
+
+class PointsColumn(Curve):
+
+    """
+    A function of a single column of `Points`, read
+    directly from the column array.
+    """
+
+    def get_domain(self):
+        return self.points.domain
+
+    def __init__(self, points, column, name=None, min_step=None):
+        super().__init__(min_step=min_step)
+        self.points = points
+        self.column = column
+        self.name = name
+        self._observer_token = self.points.add_observer(begin=self.begin_update, end=self.end_update, prioritize=True)
+
+    def __del__(self):
+        self.points.remove_observer(self._observer_token)
+
+    def __repr__(self):
+        try:
+            return f'{self.points}.{self.name or f"column({self.column})"}'
+        except Exception as e:
+            return super().__repr__() + f'({e})'
+
+    @property
+    def ys(self):
+        """
+        Returns a read-only view of the column values.
+        """
+        return self.points.ys[:, self.column]
+
+    def y(self, x):
+        points = self.points
+        if not points.domain.contains(x):
+            return None
+        i_ = points.x_index(x)
+        u = i_ % 1.0
+        i = int(i_)
+        if u == 0 or points.interpolation == Points.interpolation.previous:
+            y = points._ys[i, self.column]
+        elif points.interpolation == Points.interpolation.next:
+            y = points._ys[i + 1, self.column]
         else:
-            i = min(points_len, int(math.ceil(self.x_index(domain.end))))
-            while i >= 0:
-                x = self._points[i][0]
-                if x <= domain.start:
-                    # i += 1
-                    break
-                if domain.contains(x):
-                    break
-                i -= 1
-            end_i = i + 1
-
-        return start_i, end_i
-
-def _bisect_points(a, x, lo=0, hi=None):
+            y = (1.0 - u) * points._ys[i, self.column] + u * points._ys[i + 1, self.column]
+        return util.none_if_nan(float(y))
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        points = self.points
+        ys = np.full(len(xs), np.nan)
+        mask = util.interval_mask(points.domain, xs)
+        if not mask.any():
+            return ys
+        indexes = points.x_index_many(xs[mask])
+        ys[mask] = _interpolate_many(points._ys[:points._count, self.column], indexes, points.interpolation)
+        return ys
+
+    def sample_points(self, domain=None, min_step=MIN_STEP, step=None, as_arrays=False):
+        interval = self.points.interval
+        if interval is not None and ((min_step is not None and min_step > interval) or (step is not None and step != interval)):
+            # Irregular sampling
+            return super().sample_points(domain=domain, min_step=min_step, step=step, as_arrays=as_arrays)
+        xs, ys = self.points.sample_points(domain=domain, as_arrays=True)
+        ys = ys[:, self.column]
+        if as_arrays:
+            return xs, ys
+        return list(zip(xs.tolist(), util.array_to_values(ys)))
+
+    def x_next(self, x, min_step=MIN_STEP, limit=None):
+        min_step = self.resolve_min_step(min_step)
+        return self.points.x_next(x, min_step=min_step, limit=limit)
+
+    def x_previous(self, x, min_step=MIN_STEP, limit=None):
+        min_step = self.resolve_min_step(min_step)
+        return self.points.x_previous(x, min_step=min_step, limit=limit)
+
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        min_step = self.resolve_min_step(min_step)
+        return self.points.x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_grid(self):
+        return self.points
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        min_step = self.resolve_min_step(min_step)
+        return self.points.x_range(domain, min_step=min_step)
+
+
+def _row_value(row):
+    """
+    Converts a row of a 2D array to a tuple, or `None` if all values are missing.
     """
-    Insert point `p` in list `a`, and keep it sorted assuming `a` is sorted.
-    If `p` is already in `a`, insert it to the left of the leftmost `p` if `no_repeat` is `False`.
-    Optional args `lo` (default `0`) and `hi` (default `len(a)`) bound the
-    slice of `a` to be searched.
+    if np.isnan(row).all():
+        return None
+    return tuple(util.array_to_values(row))
+
 
-    Source: https://github.com/python/cpython/blob/master/Lib/bisect.py
+def _object_array(a):
     """
+    Converts a float array to an object array with `None` in place of `NaN`.
+    """
+    if a.dtype == object:
+        return a
+    return np.array(util.array_to_values(a), dtype=object)
+
 
-    if lo < 0:
-        raise ValueError('lo must be non-negative')
-    a_len = len(a)
-    if hi is None:
-        hi = a_len
-    while lo < hi:
-        mid = (lo + hi) // 2
-        if a[mid][0] < x: lo = mid + 1
-        else: hi = mid
-    return lo
+def _read_only(a):
+    a = a.view()
+    a.flags.writeable = False
+    return a
+
+
+def _interpolate_many(ys, indexes, interpolation):
+    """
+    Vectorized interpolation of `ys` at fractional `indexes`.
+    """
+    last_i = len(ys) - 1
+    i = np.clip(np.floor(indexes).astype(int), 0, last_i)
+    u = indexes - i
+    if ys.ndim > 1:
+        # Interpolate all columns
+        u = u[:, np.newaxis]
+    exact = u == 0
+    y0 = ys[i]
+    if interpolation == Points.interpolation.previous:
+        return y0
+    y1 = ys[np.minimum(i + 1, last_i)]
+    if interpolation == Points.interpolation.next:
+        return np.where(exact, y0, y1)
+    elif interpolation == Points.interpolation.linear:
+        # Missing neighbours propagate, except on exact points
+        return np.where(exact, y0, (1.0 - u) * y0 + u * y1)
+    else:
+        raise Exception('Unknown interpolation')
@@ -1,5 +1,8 @@
+import csv
+import math
+import numpy as np
 from .curve import Curve, MIN_STEP
-from .map import Map
+from .aggregate import Aggregate
 from .points import Points
 from intervalpy import Interval
 from pyduration import Duration
@@ -19,59 +22,55 @@ VOLUME = 4
 class Quotes(Curve):
     """
     Represents quotes as [open, high, low, close, (volume)].
+
+    Quotes are stored as columns of floats, with a missing
+    volume stored as `NaN`.
     """
 
+    @property
+    def provisional_last_quote(self):
+        """
+        If `True`, the last quote is expected to be replaced, such as
+        a quote which is still open, and derived scans keep their state
+        before the last quote. See `Points.provisional_last_point`.
+        """
+        return self._quote_points.provisional_last_point
+
+    @provisional_last_quote.setter
+    def provisional_last_quote(self, value):
+        self._quote_points.provisional_last_point = value
+
     @property
     def close(self):
         if self._close is None:
-            self._close = Map(
-                self,
-                lambda q: q[CLOSE],
-                skip_none=True,
-                name='close'
-            )
+            self._close = self._column(CLOSE)
         return self._close
 
     @property
     def open(self):
         if self._open is None:
-            self._open = Map(
-                self,
-                lambda q: q[OPEN],
-                skip_none=True,
-                name='open'
-            )
+            self._open = self._column(OPEN)
         return self._open
 
     @property
     def high(self):
         if self._high is None:
-            self._high = Map(
-                self,
-                lambda q: q[HIGH],
-                skip_none=True,
-                name='high'
-            )
+            self._high = self._column(HIGH)
         return self._high
 
     @property
     def low(self):
         if self._low is None:
-            self._low = Map(
-                self,
-                lambda q: q[LOW],
-                skip_none=True,
-                name='low'
-            )
+            self._low = self._column(LOW)
         return self._low
 
     @property
     def hl2(self):
         if self._hl2 is None:
-            self._hl2 = Map(
-                self,
-                lambda q: (q[HIGH] + q[LOW]) / 2,
-                skip_none=True,
+            self._hl2 = Aggregate(
+                [self.high, self.low],
+                tfm=_hl2,
+                tfm_many=_hl2_many,
                 name='hl2'
             )
         return self._hl2
@@ -79,12 +78,7 @@ class Quotes(Curve):
     @property
     def volume(self):
         if self._volume is None:
-            self._volume = Map(
-                self,
-                lambda q: q[VOLUME],
-                skip_none=True,
-                name='volume'
-            )
+            self._volume = self._column(VOLUME)
         return self._volume
 
     def get_domain(self):
@@ -109,9 +103,9 @@ class Quotes(Curve):
         self.duration = duration
         super().__init__(min_step=duration.min_seconds * 0.01, **kwargs)
         self.encoder = encoder
-        self._quote_points = Points(
-            [], interpolation=Points.interpolation.previous, uniform=duration.is_uniform)
-        self._quote_points.add_observer(begin=self.begin_update, end=self.end_update, prioritize=True)
+        self._quote_points = None
+        self._set_quote_points(Points(
+            [], interpolation=Points.interpolation.previous, uniform=duration.is_uniform, columns=OHLC_POINT_COUNT))
         self._close = None
         self._open = None
         self._high = None
@@ -122,6 +116,101 @@ class Quotes(Curve):
         if quote_points is not None:
             self.set(quote_points)
 
+    @classmethod
+    def open_mmap(cls, path, duration, mode='r+', **kwargs):
+        """
+        Returns quotes stored in a memory-mapped file at `path`,
+        creating the file if it does not exist. See `Points.open_mmap()`.
+        Appended quotes are written to the file.
+        """
+        duration = Duration.parse(duration)
+        quote_points = Points.open_mmap(
+            path,
+            columns=OHLC_POINT_COUNT,
+            interpolation=Points.interpolation.previous,
+            uniform=duration.is_uniform,
+            mode=mode
+        )
+        if quote_points.columns != OHLC_POINT_COUNT:
+            raise Exception(f'Expected {OHLC_POINT_COUNT} columns in quotes file, found: {quote_points.columns}')
+        quotes = cls(duration, **kwargs)
+        quotes._set_quote_points(quote_points)
+        return quotes
+
+    @classmethod
+    def from_arrays(cls, t, o, h, l, c, v=None, duration=None, **kwargs):
+        """
+        Returns quotes with timestamps `t` and `open`, `high`, `low`, `close`
+        and (optionally) `volume` arrays. See `set_arrays()`.
+
+        If `duration` is not specified, it is the time between the first two quotes.
+        """
+        if duration is None:
+            if len(t) < 2:
+                raise Exception('Duration is required with less than two quotes')
+            duration = float(t[1]) - float(t[0])
+        quotes = cls(duration, **kwargs)
+        quotes.set_arrays(t, o, h, l, c, v=v)
+        return quotes
+
+    @classmethod
+    def from_csv(cls, path, duration=None, columns=None, delimiter=',', **kwargs):
+        """
+        Returns quotes read from a CSV file with a header row.
+
+        `columns` are the names of the timestamp, open, high, low, close
+        and (optionally) volume columns, in that order. Timestamps must be
+        numeric. Defaults to `['date', 'open', 'high', 'low', 'close', 'volume']`,
+        where the volume is ignored if it is not in the file.
+        """
+        if columns is None:
+            columns = ['date'] + OHLC_KEYS
+            optional_columns = 1
+        else:
+            optional_columns = 0
+        with open(path, newline='') as f:
+            header = next(csv.reader(f, delimiter=delimiter))
+        header = [name.strip() for name in header]
+        indexes = []
+        for i, name in enumerate(columns):
+            if name not in header:
+                if i >= len(columns) - optional_columns:
+                    continue
+                raise Exception(f'Column not found: {name}')
+            indexes.append(header.index(name))
+        data = np.loadtxt(path, delimiter=delimiter, skiprows=1, usecols=indexes, ndmin=2)
+        return cls.from_arrays(*data.T, duration=duration, **kwargs)
+
+    def set_arrays(self, t, o, h, l, c, v=None):
+        """
+        Sets quotes with timestamps `t` and `open`, `high`, `low`, `close`
+        and (optionally) `volume` arrays, with a single update.
+
+        Timestamps are validated to be in ascending order,
+        with no gaps, at the receiver's duration.
+        """
+        t, values = self._validated_arrays(t, o, h, l, c, v)
+        self._quote_points.set_arrays(t, values)
+
+    def append_arrays(self, t, o, h, l, c, v=None):
+        """
+        Appends quotes in the same form as `set_arrays()`, with a single update.
+        """
+        if self.domain.is_empty:
+            return self.set_arrays(t, o, h, l, c, v=v)
+        t, values = self._validated_arrays(t, o, h, l, c, v)
+        if len(t) == 0:
+            return
+        if self.duration.next(self.domain.end) != t[0]:
+            raise Exception(f'Expected the next quote at {self.duration.next(self.domain.end)}, got: {t[0]}')
+        self._quote_points.append_arrays(t, values)
+
+    def flush(self):
+        """
+        Writes changes to a memory-mapped file, if any.
+        """
+        self._quote_points.flush()
+
     def __repr__(self):
         try:
             return f'quotes({self.duration})'
@@ -135,17 +224,15 @@ class Quotes(Curve):
         return self.y_start()
 
     def get_range(self, domain=None, **kwargs):
-        quotes = self.sample(domain=domain, **kwargs)
-        low = None
-        high = None
-        for q in quotes:
-            if low is None or q.low < low:
-                low = q.low
-            if high is None or q.high > high:
-                high = q.high
-        if low is None or high is None:
+        domain = Interval.parse(domain, default_inf=True)
+        if domain.is_empty or self.domain.is_empty:
             return Interval.empty()
-        return Interval(low, high)
+        domain = self.duration.span(domain, start_open=False)
+        _, lows = self.low.sample_points(domain=domain, as_arrays=True, **kwargs)
+        _, highs = self.high.sample_points(domain=domain, as_arrays=True, **kwargs)
+        if np.isnan(lows).all() or np.isnan(highs).all():
+            return Interval.empty()
+        return Interval(float(np.nanmin(lows)), float(np.nanmax(highs)))
 
     def ao(self):
         """
@@ -166,16 +253,24 @@ class Quotes(Curve):
         smoothed averages that slow down indicator turns.
         """
         uniform = self.duration.is_uniform
-        jaw = self.hl2.sma(13, uniform=uniform).offset(8, duration=self.duration)
-        teeth = self.hl2.sma(8, uniform=uniform).offset(5, duration=self.duration)
-        lips = self.hl2.sma(5, uniform=uniform).offset(3, duration=self.duration)
+        hl2 = self.hl2
+        jaw = hl2.sma(13, uniform=uniform).offset(8, duration=self.duration)
+        teeth = hl2.sma(8, uniform=uniform).offset(5, duration=self.duration)
+        lips = hl2.sma(5, uniform=uniform).offset(3, duration=self.duration)
         return jaw, teeth, lips
 
+    def resample(self, duration):
+        """
+        Returns quotes aggregated over a longer `duration`.
+        See `ResampledQuotes`.
+        """
+        return ResampledQuotes(self, duration)
+
     def trailing_high(self, degree, is_period=False):
         return self.high.trailing_max(degree, is_period=is_period, interpolation=-1, uniform=self.duration.is_uniform)
 
     def trailing_low(self, degree, is_period=False):
-        return self.low.trailing_max(degree, is_period=is_period, interpolation=-1, uniform=self.duration.is_uniform)
+        return self.low.trailing_min(degree, is_period=is_period, interpolation=-1, uniform=self.duration.is_uniform)
 
     def append(self, quote_point):
         """
@@ -185,6 +280,17 @@ class Quotes(Curve):
         """
         self.append_list([self.encode_one(quote_point)])
 
+    def replace(self, quote_point):
+        """
+        Replaces the quote with the same timestamp as `quote_point`,
+        which is in the same form as in `append()`.
+
+        Replacing the last quote (such as a quote which is still open)
+        only scans the last step of derived scans again if
+        `provisional_last_quote` is `True`.
+        """
+        self._quote_points.replace(self.encode_one(quote_point))
+
     def append_list(self, quote_points):
         """
         `quote_points` are assumed to be in the form [timestamp, [o, h, l, c, v]],
@@ -221,12 +327,12 @@ class Quotes(Curve):
         )
         return [p[1] for p in points]
 
-    def sample_points(self, domain=None, min_step=MIN_STEP, step=None):
+    def sample_points(self, domain=None, min_step=MIN_STEP, step=None, as_arrays=False):
         domain = Interval.parse(domain, default_inf=True)
         if domain.is_empty:
-            return []
+            return super().sample_points(domain=domain, as_arrays=as_arrays)
         pinterval = self.duration.span(domain, start_open=False)
-        return self._quote_points.sample_points(domain=pinterval, min_step=min_step, step=step)
+        return self._quote_points.sample_points(domain=pinterval, min_step=min_step, step=step, as_arrays=as_arrays)
 
     def y(self, x):
         return self._quote_points.y(x)
@@ -238,3 +344,158 @@ class Quotes(Curve):
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         # return self.duration.previous(x)
         return self._quote_points.x_previous(x, min_step=min_step, limit=limit)
+
+    def x_step(self, x, steps, min_step=MIN_STEP, clamp=False):
+        return self._quote_points.x_step(x, steps, min_step=min_step, clamp=clamp)
+
+    def x_grid(self):
+        return self._quote_points
+
+    def x_range(self, domain, min_step=MIN_STEP):
+        return self._quote_points.x_range(domain, min_step=min_step)
+
+    def _set_quote_points(self, quote_points):
+        if self._quote_points is not None:
+            self._quote_points.remove_observer(self._quote_points_token)
+        self._quote_points = quote_points
+        self._quote_points_token = quote_points.add_observer(begin=self.begin_update, end=self.end_update, prioritize=True)
+
+    def _validated_arrays(self, t, o, h, l, c, v):
+        t = np.array(t, dtype=float)
+        columns = [o, h, l, c]
+        if v is not None:
+            columns.append(v)
+        values = np.full((len(t), OHLC_POINT_COUNT), np.nan)
+        for i, column in enumerate(columns):
+            column = np.asarray(column, dtype=float)
+            if column.shape != t.shape:
+                raise Exception(f'Expected {len(t)} {OHLC_KEYS[i]} values, got: {len(column)}')
+            values[:, i] = column
+        if len(t) > 1:
+            if self.duration.is_uniform:
+                steps = np.diff(t)
+                valid = (steps == self.duration.ave_seconds).all()
+            else:
+                valid = all(self.duration.next(x) == x1 for x, x1 in zip(t[:-1].tolist(), t[1:].tolist()))
+            if not valid:
+                raise Exception(f'Expected quotes in ascending order with no gaps, at intervals of {self.duration}')
+        return t, values
+
+    def _column(self, column):
+        return self._quote_points.column(column, name=OHLC_KEYS[column], min_step=self.min_step)
+
+
+class ResampledQuotes(Quotes):
+
+    """
+    Quotes aggregated from `base` quotes over a longer `duration`.
+
+    The open of each quote is the first open in its interval, the high
+    is the maximum high, the low is the minimum low, the close is the
+    last close and the volume is the total volume.
+
+    When the base quotes are updated, only the quotes with intervals
+    from the start of the update onwards are aggregated again.
+    """
+
+    def __init__(self, base, duration, **kwargs):
+        super().__init__(duration, **kwargs)
+        self.base = base
+        self._base_token = self.base.add_observer(end=self.end_base_update)
+        self._resample(self.base.domain)
+
+    def __del__(self):
+        self.base.remove_observer(self._base_token)
+
+    def __repr__(self):
+        try:
+            return f'{self.base}.resample({self.duration})'
+        except Exception as e:
+            return super().__repr__() + f'({e})'
+
+    def set(self, quote_points):
+        raise Exception('Resampled quotes are read-only')
+
+    def append_list(self, quote_points):
+        raise Exception('Resampled quotes are read-only')
+
+    def replace(self, quote_point):
+        raise Exception('Resampled quotes are read-only')
+
+    def set_arrays(self, t, o, h, l, c, v=None):
+        raise Exception('Resampled quotes are read-only')
+
+    def append_arrays(self, t, o, h, l, c, v=None):
+        raise Exception('Resampled quotes are read-only')
+
+    @property
+    def provisional_last_quote(self):
+        return self.base.provisional_last_quote
+
+    @provisional_last_quote.setter
+    def provisional_last_quote(self, value):
+        raise Exception('Resampled quotes are read-only')
+
+    def end_base_update(self, domain):
+        self._resample(domain)
+
+    def _resample(self, domain):
+        base_points = self.base._quote_points
+        # The last quote is aggregated again when the base quotes are updated
+        self._quote_points.provisional_last_point = base_points.provisional_last_point
+        if base_points.domain.is_empty:
+            if not self._quote_points.domain.is_empty:
+                self._quote_points.reset()
+            return
+        base_domain = base_points.domain
+        if domain.is_empty:
+            return
+        start = max(domain.start, base_domain.start)
+        start = self.duration.floor(start)
+        end = base_domain.end
+
+        # Interval starts, including the end of the last interval
+        if self.duration.is_uniform:
+            step = self.duration.ave_seconds
+            bounds = start + step * np.arange(math.floor((end - start) / step) + 2)
+        else:
+            bounds = [start]
+            while bounds[-1] <= end:
+                bounds.append(self.duration.next(bounds[-1]))
+            bounds = np.array(bounds)
+
+        xs = base_points.xs
+        bound_indexes = np.searchsorted(xs, bounds, side='left')
+        ts = bounds[:-1]
+        starts = bound_indexes[:-1]
+        ends = bound_indexes[1:]
+        non_empty = ends > starts
+        ts = ts[non_empty]
+        starts = starts[non_empty]
+        ends = ends[non_empty]
+
+        base_values = base_points.ys
+        values = np.empty((len(ts), OHLC_POINT_COUNT))
+        if len(ts) != 0:
+            values[:, OPEN] = base_values[starts, OPEN]
+            values[:, HIGH] = np.fmax.reduceat(base_values[:, HIGH], starts)
+            values[:, LOW] = np.fmin.reduceat(base_values[:, LOW], starts)
+            values[:, CLOSE] = base_values[ends - 1, CLOSE]
+            volumes = base_values[:, VOLUME]
+            values[:, VOLUME] = np.add.reduceat(np.nan_to_num(volumes), starts)
+            has_volume = np.add.reduceat((~np.isnan(volumes)).astype(int), starts) != 0
+            values[~has_volume, VOLUME] = np.nan
+
+        with Curve.batch_update():
+            self._quote_points.reset(Interval.gte(start))
+            self._quote_points.append_arrays(ts, values)
+
+
+def _hl2(x, ys):
+    if ys[0] is None or ys[1] is None:
+        return None
+    return (ys[0] + ys[1]) / 2
+
+
+def _hl2_many(xs, yss):
+    return (yss[0] + yss[1]) / 2
@@ -0,0 +1,278 @@
+import copy
+import heapq
+import math
+
+
+class Reducer:
+
+    """
+    Reduces a sliding window of values incrementally.
+
+    Values are added in ascending order of `x` with `add()`, and the
+    oldest values are removed with `remove()` as the window slides.
+    `result()` returns the reduced value of the window, or `None`.
+
+    Pass a reducer instead of a transform to `Curve.accumulator_map()`
+    to update the window in O(1) for each point.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Removes all values.
+        """
+        raise Exception("Not implemented")
+
+    def add(self, y):
+        raise Exception("Not implemented")
+
+    def remove(self, y):
+        raise Exception("Not implemented")
+
+    def result(self):
+        raise Exception("Not implemented")
+
+    def copy(self):
+        """
+        Returns an empty reducer with the same configuration.
+        """
+        reducer = copy.copy(self)
+        reducer.reset()
+        return reducer
+
+
+class Sum(Reducer):
+
+    def reset(self):
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, y):
+        self.count += 1
+        self.sum += y
+
+    def remove(self, y):
+        self.count -= 1
+        if self.count == 0:
+            # Avoid accumulating errors
+            self.sum = 0.0
+        else:
+            self.sum -= y
+
+    def result(self):
+        if self.count == 0:
+            return None
+        return self.sum
+
+
+class Mean(Sum):
+
+    def result(self):
+        if self.count == 0:
+            return None
+        return self.sum / self.count
+
+
+class Variance(Reducer):
+
+    """
+    Uses Welford's algorithm, which is also reversible for removals.
+    `ddof` is the delta degrees of freedom (use 1 for the sample variance).
+    """
+
+    def __init__(self, ddof=0):
+        self.ddof = ddof
+        super().__init__()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last = None
+
+    def add(self, y):
+        self.count += 1
+        delta = y - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (y - self.mean)
+        self.last = y
+
+    def remove(self, y):
+        self.count -= 1
+        if self.count == 0:
+            self.reset()
+            return
+        delta = y - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (y - self.mean)
+
+    def result(self):
+        if self.count <= self.ddof:
+            return None
+        return max(self.m2, 0.0) / (self.count - self.ddof)
+
+
+class StandardDeviation(Variance):
+
+    def result(self):
+        variance = super().result()
+        if variance is None:
+            return None
+        return math.sqrt(variance)
+
+
+class ZScore(StandardDeviation):
+
+    """
+    The number of standard deviations of the last value from the mean.
+    """
+
+    def result(self):
+        std = super().result()
+        if std is None or std == 0:
+            return None
+        return (self.last - self.mean) / std
+
+
+class LinearWeightedSum(Reducer):
+
+    """
+    Weights the oldest value by 1, the next by 2, and so on.
+    If `normalize` is `True`, returns the weighted mean.
+    """
+
+    def __init__(self, normalize=False):
+        self.normalize = normalize
+        super().__init__()
+
+    def reset(self):
+        self.count = 0
+        self.sum = 0.0
+        self.weighted_sum = 0.0
+
+    def add(self, y):
+        self.count += 1
+        self.sum += y
+        self.weighted_sum += self.count * y
+
+    def remove(self, y):
+        # The weight of every other value decreases by 1
+        self.count -= 1
+        if self.count == 0:
+            self.reset()
+            return
+        self.weighted_sum -= self.sum
+        self.sum -= y
+
+    def result(self):
+        if self.count == 0:
+            return None
+        if self.normalize:
+            return self.weighted_sum / (self.count * (self.count + 1) / 2)
+        return self.weighted_sum
+
+
+class Quantile(Reducer):
+
+    """
+    The `q`-th quantile of the window, with linear interpolation
+    between values (same as `numpy.quantile()`).
+
+    Values are split between a max-heap of the lower values and
+    a min-heap of the upper values, so that the top of the lower heap
+    is the value at the quantile. Removed values are deleted lazily
+    when they reach the top of a heap. Each step is O(log w).
+    """
+
+    def __init__(self, q):
+        if q is None or not 0 <= q <= 1:
+            raise Exception('Quantile must be between 0 and 1')
+        self.q = q
+        super().__init__()
+
+    def reset(self):
+        # Values are keyed by (y, i) to make them unique,
+        # where i is the order in which they were added.
+        # The lower heap has negated keys.
+        self._lower = []
+        self._upper = []
+        self._lower_size = 0
+        self._upper_size = 0
+        self._removed = set()
+        self._first = 0
+        self._next = 0
+
+    def add(self, y):
+        key = (y, self._next)
+        self._next += 1
+        if self._lower_size != 0 and key <= self._lower_top():
+            heapq.heappush(self._lower, (-y, -key[1]))
+            self._lower_size += 1
+        else:
+            heapq.heappush(self._upper, key)
+            self._upper_size += 1
+        self._balance()
+
+    def remove(self, y):
+        # Values are removed in the order they were added
+        key = (y, self._first)
+        self._first += 1
+        self._removed.add(key)
+        if self._lower_size != 0 and key <= self._lower_top():
+            self._lower_size -= 1
+        else:
+            self._upper_size -= 1
+        self._prune()
+        self._balance()
+        if len(self._removed) > self._lower_size + self._upper_size + 16:
+            self._compact()
+
+    def result(self):
+        count = self._lower_size + self._upper_size
+        if count == 0:
+            return None
+        h = (count - 1) * self.q
+        u = h - math.floor(h)
+        y0 = self._lower_top()[0]
+        if u == 0:
+            return y0
+        y1 = self._upper[0][0]
+        return y0 + u * (y1 - y0)
+
+    def _lower_top(self):
+        y, i = self._lower[0]
+        return (-y, -i)
+
+    def _balance(self):
+        count = self._lower_size + self._upper_size
+        lower_size = int(math.floor((count - 1) * self.q)) + 1 if count != 0 else 0
+        while self._lower_size > lower_size:
+            heapq.heappush(self._upper, self._lower_top())
+            heapq.heappop(self._lower)
+            self._lower_size -= 1
+            self._upper_size += 1
+            self._prune()
+        while self._lower_size < lower_size:
+            y, i = heapq.heappop(self._upper)
+            heapq.heappush(self._lower, (-y, -i))
+            self._lower_size += 1
+            self._upper_size -= 1
+            self._prune()
+
+    def _prune(self):
+        while len(self._lower) != 0 and self._lower_top() in self._removed:
+            self._removed.remove(self._lower_top())
+            heapq.heappop(self._lower)
+        while len(self._upper) != 0 and self._upper[0] in self._removed:
+            self._removed.remove(self._upper[0])
+            heapq.heappop(self._upper)
+
+    def _compact(self):
+        # Drop removed values which have not reached the top of a heap
+        self._lower = [k for k in self._lower if (-k[0], -k[1]) not in self._removed]
+        self._upper = [k for k in self._upper if k not in self._removed]
+        heapq.heapify(self._lower)
+        heapq.heapify(self._upper)
+        self._removed.clear()
@@ -0,0 +1,97 @@
+import weakref
+from numbers import Number
+from pyduration import Duration
+
+_registries = []
+
+
+class Registry:
+
+    """
+    Deduplicates functions created while the registry is active.
+
+    Creating a function which is equivalent to a live function created
+    earlier (same method, same input functions and same arguments)
+    returns the existing function, along with its accumulated state.
+
+    Usage:
+
+        with Registry():
+            a = quotes.close.sma(20)
+            b = quotes.close.sma(20)
+        assert a is b
+
+    Functions are held weakly and are forgotten once they are
+    no longer referenced elsewhere.
+    """
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the innermost active registry, or `None`.
+        """
+        if len(_registries) == 0:
+            return None
+        return _registries[-1]
+
+    def __init__(self):
+        self._funcs = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._funcs)
+
+    def __enter__(self):
+        _registries.append(self)
+        return self
+
+    def __exit__(self, *args):
+        _registries.remove(self)
+
+    def get(self, key, create):
+        """
+        Returns the function registered with `key`, or creates
+        and registers a new function with `create()`.
+        """
+        func = self._funcs.get(key)
+        if func is None:
+            func = create()
+            self._funcs[key] = func
+        return func
+
+    def clear(self):
+        self._funcs.clear()
+
+
+def canonical(method, args, kwargs, create):
+    """
+    Returns the function created with `create()`, or an equivalent
+    live function if a registry is active.
+
+    `args` and `kwargs` are the inputs of `method`. Functions and callables
+    are compared by identity and other arguments by value. If an argument can not be
+    compared, a new function is always created.
+    """
+    registry = Registry.current()
+    if registry is None:
+        return create()
+    try:
+        key = (method, tuple(_arg_key(arg) for arg in args), tuple(sorted((k, _arg_key(v)) for k, v in kwargs.items())))
+        hash(key)
+    except TypeError:
+        return create()
+    return registry.get(key, create)
+
+
+def _arg_key(arg):
+    from .curve import Curve
+
+    if isinstance(arg, Curve):
+        return ('func', id(arg))
+    if arg is None or isinstance(arg, (Number, str, Duration)):
+        return ('value', arg)
+    if isinstance(arg, (list, tuple)):
+        return ('list', tuple(_arg_key(item) for item in arg))
+    if callable(arg):
+        # Held by the registered function
+        return ('callable', id(arg))
+    raise TypeError('Unable to compare argument')
@@ -1,19 +1,43 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from .constant import Constant
 from intervalpy import Interval
 
+# Scans at least this many points at once with `tfm_many`
+BULK_SCAN_MIN_COUNT = 16
+# Default number of steps between scan checkpoints
+CHECKPOINT_INTERVAL = 256
+
 class Scan(Curve):
 
     def get_domain(self):
         return self.curve.domain
 
-    def __init__(self, func, tfm, min_step=MIN_STEP):
+    def __init__(self, func, tfm, min_step=MIN_STEP, tfm_many=None):
+        """
+        If `tfm_many` is specified, it is called with arrays of `x` values
+        and values (with `NaN` in place of `None`) to scan many points at once,
+        when the `x` values of the function can be found in bulk (see `x_range()`).
+        It must have the same effect as calling `tfm` for each point.
+        """
         super().__init__(min_step=min_step)
         self.curve = Curve.parse(func)
         self.tfm = tfm
+        self.tfm_many = tfm_many
         self.scan_start = None
         self.current = None
+        # Checkpoints as (x, state), see `get_scan_state()`
+        self.checkpoint_interval = CHECKPOINT_INTERVAL
+        self._checkpoints = []
+        self._checkpoint_steps = 0
+        # If `True`, the last point of the function is provisional and
+        # the state before it is kept, so that only the last step is
+        # scanned again when the last point is replaced. If `None`, the
+        # last point is provisional if it is in the points of the function
+        # (see `x_grid()` and `Points.provisional_last_point`).
+        self.provisional_last_point = None
+        self._last_point_checkpoint = None
         self._observer_token = self.curve.add_observer(begin=self.begin_scan_update, end=self.end_scan_update, prioritize=True)
 
     def __del__(self):
@@ -48,11 +72,45 @@ class Scan(Curve):
     def reset_scan(self):
         self.scan_start = None
         self.current = None
+        self._checkpoints = []
+        self._checkpoint_steps = 0
+        self._last_point_checkpoint = None
+
+    def get_scan_state(self):
+        """
+        Returns the state of the scan at `current`, or `None`
+        if the scan can only be restarted from the beginning.
+
+        The state is recorded every `checkpoint_interval` steps. When the
+        function is updated, the scan rolls back to the last checkpoint
+        before the update instead of restarting. The state must not change
+        as the scan continues, and is restored with `restore_scan_state()`.
+        """
+        return None
+
+    def restore_scan_state(self, state):
+        """
+        Restores a state returned by `get_scan_state()`, after `current`
+        is set to the `x` value of the state. The state may be restored
+        more than once.
+        """
+        raise Exception("Not implemented")
+
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        mask = np.isfinite(xs)
+        if mask.any():
+            # Scan in bulk before evaluating each value
+            self.scan(np.min(xs[mask]))
+            self.scan(np.max(xs[mask]))
+        return super().y_many(xs)
 
     def scan(self, x0):
         x = self.offset_scan(x0)
         if self.scan_start is not None and x < self.scan_start:
             self.reset_scan()
+        if self.tfm_many is not None:
+            self._bulk_scan(x, x0)
         while self.current is None or self.continue_scan(x0):
             if self.current is None:
                 self.scan_start = self.init_scan(x)
@@ -63,22 +121,109 @@ class Scan(Curve):
                 break
             if self.current is not None and current <= self.current:
                 raise Exception('Next scan x value ({}) is smaller than or equal to the current scan x value ({}).'.format(current, self.current))
+            if self.current is not None and current == self.curve.domain.end and self._is_last_point_provisional():
+                self._add_last_point_checkpoint()
             self.tfm(current, self.curve.y(current))
             self.current = current
+            self._checkpoint_steps += 1
+            if self.checkpoint_interval is not None and self._checkpoint_steps >= self.checkpoint_interval:
+                self._add_checkpoint()
+
+    def _bulk_scan(self, x, x0):
+        if self.current is None:
+            if self.curve.domain.is_empty:
+                return
+            start = self.init_scan(x)
+            if start is None or start > x0:
+                return
+            domain = Interval.closed(start, x0)
+        else:
+            if self.current >= x0:
+                return
+            start = None
+            domain = Interval(self.current, x0, start_open=True, end_open=False)
+        xs = self.curve.x_range(domain, min_step=self.min_step)
+        if xs is None:
+            return
+        if len(xs) != 0 and xs[-1] == self.curve.domain.end and self._is_last_point_provisional():
+            # Leave the last point to be scanned after a checkpoint
+            xs = xs[:-1]
+        if len(xs) < BULK_SCAN_MIN_COUNT:
+            return
+        if start is not None and xs[0] != start:
+            # The scan starts between points
+            return
+        ys = self.curve.y_many(xs)
+        if ys.dtype == object:
+            # Values are not numeric
+            return
+        self.tfm_many(xs, ys)
+        if start is not None:
+            self.scan_start = start
+        self.current = float(xs[-1])
+        if self.checkpoint_interval is not None:
+            self._add_checkpoint()
+
+    def _is_last_point_provisional(self):
+        if self.provisional_last_point is not None:
+            return self.provisional_last_point
+        grid = self.curve.x_grid()
+        return grid is not None and grid.provisional_last_point
+
+    def _add_checkpoint(self):
+        self._checkpoint_steps = 0
+        state = self.get_scan_state()
+        if state is not None:
+            self._checkpoints.append((self.current, state))
+
+    def _add_last_point_checkpoint(self):
+        if self._last_point_checkpoint is not None and self._last_point_checkpoint[0] == self.current:
+            # Restored from this checkpoint
+            return
+        state = self.get_scan_state()
+        if state is not None:
+            self._last_point_checkpoint = (self.current, state)
+
+    def _restore_checkpoint(self, domain):
+        """
+        Rolls back the scan to the last checkpoint before `domain`.
+        Returns `False` if there is no such checkpoint.
+        """
+        def is_before(x):
+            return x < domain.start or (x == domain.start and domain.start_open)
+
+        i = len(self._checkpoints)
+        while i != 0 and not is_before(self._checkpoints[i - 1][0]):
+            i -= 1
+        del self._checkpoints[i:]
+        checkpoint = self._checkpoints[-1] if i != 0 else None
+        last_point_checkpoint = self._last_point_checkpoint
+        if last_point_checkpoint is not None and is_before(last_point_checkpoint[0]):
+            if checkpoint is None or last_point_checkpoint[0] > checkpoint[0]:
+                checkpoint = last_point_checkpoint
+        else:
+            self._last_point_checkpoint = None
+        if checkpoint is None:
+            return False
+        x, state = checkpoint
+        self.current = x
+        self._checkpoint_steps = 0
+        self.restore_scan_state(state)
+        return True
 
-    def sample_points(self, domain=None, min_step=MIN_STEP, step=None):
+    def sample_points(self, domain=None, min_step=MIN_STEP, step=None, as_arrays=False):
         min_step = self.resolve_min_step(min_step)
         if domain is None:
             domain = self.domain
         else:
             domain = Interval.intersection([self.domain, domain])
         if domain.is_empty:
-            return []
+            return super().sample_points(domain=domain, as_arrays=as_arrays)
         elif domain.is_infinite:
             raise Exception("Cannot sample points on an infinite domain. Specify a finite domain.")
         self.scan(domain.start)
         self.scan(domain.end)
-        return super().sample_points(domain=domain, min_step=min_step, step=step)
+        return super().sample_points(domain=domain, min_step=min_step, step=step, as_arrays=as_arrays)
 
     def x_previous(self, x, min_step=MIN_STEP, limit=None):
         min_step = self.resolve_min_step(min_step)
@@ -99,7 +244,8 @@ class Scan(Curve):
         domain = self._update_interval(domain)
         if self.current is not None:
             if domain.start < self.current or (domain.start == self.current and not domain.start_open):
-                self.reset_scan()
+                if not self._restore_checkpoint(domain):
+                    self.reset_scan()
 
         if self.current is not None and self.scan_start is not None and self.current < self.scan_start:
             self.reset_scan()
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from intervalpy import Interval
 
@@ -39,6 +40,10 @@ class Sin(Curve):
     def y(self, x):
         return self.amplitude * math.sin(self.x_coef * x + self.phase)
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        return self.amplitude * np.sin(self.x_coef * xs + self.phase)
+
     def d_y(self, x, forward=False, min_step=MIN_STEP, limit=None):
         return self.amplitude * math.cos(self.x_coef * x + self.phase)
         
\ No newline at end of file
@@ -1,7 +1,9 @@
 import math
+import numpy as np
 from .curve import Curve, MIN_STEP
 from .points import Points
 from .integral import Integral
+from . import util
 from intervalpy import Interval
 
 class SMA(Integral):
@@ -21,11 +23,9 @@ class SMA(Integral):
             else:
                 p = x - d.start
         elif self.degree is not None:
-            x = d.start
-            for _ in range(self.degree - 1):
-                x = self.curve.x_next(x, min_step=self.min_step)
-                if x is None:
-                    return Interval.empty()
+            x = self.curve.x_step(d.start, self.degree - 1, min_step=self.min_step)
+            if x is None:
+                return Interval.empty()
             p = x - d.start
         else:
             raise Exception('Bad SMA configuration')
@@ -111,16 +111,62 @@ class SMA(Integral):
             return sma
         return sma
 
+    def y_many(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        mask = util.interval_mask(self.domain, xs)
+        if not mask.any():
+            return np.full(len(xs), np.nan)
+        grid = self.curve.x_range(self.curve.domain, min_step=self.min_step)
+        if grid is None or len(grid) == 0:
+            return util.values_to_array([self.y(x) for x in xs.tolist()])
+
+        # Find the SMA steps of the points of the function by index
+        i = np.searchsorted(grid, xs).clip(0, len(grid) - 1)
+        on_grid = mask & (grid[i] == xs)
+        x0s, x1s = self._sma_bounds_many(grid, i[on_grid])
+        if len(x0s) != 0:
+            self.scan(np.min(x0s))
+            self.scan(np.max(x1s))
+
+        ys = np.full(len(xs), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            smas = (self.accumulated_points.y_many(x1s) - self.accumulated_points.y_many(x0s)) / (x1s - x0s)
+        on_grid_xs = xs[on_grid]
+        is_curve = (x0s == on_grid_xs) | (x0s == x1s)
+        on_grid_ys = np.where(x1s == on_grid_xs, smas, np.nan)
+        if is_curve.any():
+            # SMA step is smaller than or equal to the underlying step
+            on_grid_ys[is_curve] = self.curve.y_many(on_grid_xs[is_curve])
+        ys[on_grid] = on_grid_ys
+
+        # Evaluate offset values one by one
+        others = (mask & ~on_grid).nonzero()[0].tolist()
+        others += on_grid.nonzero()[0][~is_curve & (x1s != on_grid_xs)].tolist()
+        for j in others:
+            y = self.y(float(xs[j]))
+            ys[j] = np.nan if y is None else y
+        return ys
+
+    def _sma_bounds_many(self, grid, i):
+        # Same as `_sma_start()` and `_sma_end()` on the points `grid[i]`
+        n = len(grid)
+        if self.period is not None:
+            min_step = self.curve.resolve_min_step(self.min_step) or 0
+            i0 = np.searchsorted(grid, grid[i] - self.period + min_step, side='left')
+            i0 = i0.clip(0, n - 1)
+            i1 = np.searchsorted(grid, grid[i0] + self.period - min_step, side='right') - 1
+        elif self.degree is not None:
+            i0 = (i - (self.degree - 1)).clip(0, n - 1)
+            i1 = (i0 + (self.degree - 1)).clip(0, n - 1)
+        else:
+            raise Exception('Bad SMA configuration')
+        return grid[i0], grid[i1.clip(0, n - 1)]
+
     def _sma_start(self, x):
         if self.period is not None:
             x0 = self.curve.x_next(x - self.period, min_step=self.min_step)
         elif self.degree is not None:
-            x0 = x
-            for _ in range(0, self.degree - 1):
-                x1 = self.curve.x_previous(x0, min_step=self.min_step)
-                if x1 is None:
-                    return x0
-                x0 = x1
+            x0 = self.curve.x_step(x, -(self.degree - 1), min_step=self.min_step, clamp=True)
         else:
             raise Exception('Bad SMA configuration')
         return x0
@@ -129,12 +175,7 @@ class SMA(Integral):
         if self.period is not None:
             x0 = self.curve.x_previous(x + self.period, min_step=self.min_step)
         elif self.degree is not None:
-            x0 = x
-            for _ in range(0, self.degree - 1):
-                x1 = self.curve.x_next(x0, min_step=self.min_step)
-                if x1 is None:
-                    return x0
-                x0 = x1
+            x0 = self.curve.x_step(x, self.degree - 1, min_step=self.min_step, clamp=True)
         else:
             raise Exception('Bad SMA configuration')
         return x0
@@ -0,0 +1,97 @@
+from collections import deque
+from .accumulator import Accumulator
+from .curve import MIN_STEP
+
+
+class TrailingExtreme(Accumulator):
+
+    """
+    The minimum or maximum of the last `degree` points, or of the
+    points within `period` before each point (inclusive).
+
+    Candidate extremes are kept in a monotonic deque, which makes
+    each step O(1) amortized. A missing value ends the window.
+    """
+
+    def __init__(
+            self,
+            func,
+            degree,
+            is_period=True,
+            is_max=True,
+            interpolation=None,
+            uniform=True,
+            min_step=MIN_STEP):
+        super().__init__(
+            func,
+            self._trailing_scan,
+            interpolation=interpolation,
+            uniform=uniform,
+            min_step=min_step
+        )
+        self.is_max = is_max
+        self.degree = None
+        self.period = None
+        if is_period:
+            self.period = degree
+            if self.period is None or self.period <= 0:
+                raise Exception('Trailing period must be a positive number')
+        else:
+            self.degree = int(degree)
+            if self.degree <= 0:
+                raise Exception('Trailing degree must be a positive integer')
+        # Candidates as (index, x, y) with monotonic values
+        self._window = deque()
+        self._index = 0
+
+    def __repr__(self):
+        try:
+            name = 'trailing_max' if self.is_max else 'trailing_min'
+            return f'{self.curve}.{name}({self.degree or self.period})'
+        except Exception as e:
+            return super().__repr__() + f'({e})'
+
+    def reset_scan(self):
+        super().reset_scan()
+        self._window.clear()
+        self._index = 0
+
+    def get_scan_state(self):
+        state = super().get_scan_state()
+        state['window'] = tuple(self._window)
+        state['index'] = self._index
+        return state
+
+    def restore_scan_state(self, state):
+        super().restore_scan_state(state)
+        self._window = deque(state['window'])
+        self._index = state['index']
+
+    def _trailing_scan(self, x, y, _):
+        window = self._window
+        i = self._index
+        self._index += 1
+        if y is None:
+            window.clear()
+            return None
+
+        while len(window) != 0 and not self._is_beyond(window[-1][2], y):
+            window.pop()
+        window.append((i, x, y))
+
+        if self.degree is not None:
+            while window[0][0] <= i - self.degree:
+                window.popleft()
+            return window[0][2]
+        elif self.period is not None:
+            while window[0][1] < x - self.period:
+                window.popleft()
+            return window[0][2]
+        else:
+            raise Exception('Bad config')
+
+    def _is_beyond(self, y0, y1):
+        if self.is_max:
+            return y0 > y1
+        else:
+            return y0 < y1
@@ -90,6 +90,22 @@ class Trend(Scan):
 
         return is_empty
 
+    def reset_scan(self):
+        super().reset_scan()
+        self.points = []
+        self.nested_upper_lines = [[]]
+        self.nested_lower_lines = [[]]
+
+    def get_scan_state(self):
+        # Points are only appended while scanning, but lines change
+        return (len(self.points), _nested_line_states(self.nested_upper_lines), _nested_line_states(self.nested_lower_lines))
+
+    def restore_scan_state(self, state):
+        count, upper_states, lower_states = state
+        del self.points[count:]
+        self.nested_upper_lines = _restore_nested_lines(upper_states)
+        self.nested_lower_lines = _restore_nested_lines(lower_states)
+
     def begin_update(self, domain):
         super().begin_update(domain)
 
@@ -373,6 +389,17 @@ class TrendLine(Sequence):
     def copy(self):
         return copy.copy(self)
 
+    def get_state(self):
+        """
+        Returns the state of the line, which is restored
+        with `restore_state()`.
+        """
+        # Lists are modified in place, other values are replaced
+        return {k: list(v) if isinstance(v, list) else v for k, v in self.__dict__.items()}
+
+    def restore_state(self, state):
+        self.__dict__ = {k: list(v) if isinstance(v, list) else v for k, v in state.items()}
+
     def y(self, x):
         """Return the y value at which the `line` crosses the vertical line at `x`."""
         return _line_y(self._line, x)
@@ -1073,4 +1100,19 @@ def _insort_point_left(a, p, lo=0, hi=None, no_repeat=False):
     a.insert(lo, p)
 
 def _average_point_of_2(p1, p2):
-    return ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
\ No newline at end of file
+    return ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
+
+
+def _nested_line_states(nested_lines):
+    return [[(line, line.get_state()) for line in lines] for lines in nested_lines]
+
+
+def _restore_nested_lines(nested_states):
+    nested_lines = []
+    for states in nested_states:
+        lines = []
+        for line, state in states:
+            line.restore_state(state)
+            lines.append(line)
+        nested_lines.append(lines)
+    return nested_lines
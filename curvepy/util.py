@@ -1,4 +1,6 @@
+import math
 import inspect
+import numpy as np
 from typing import Mapping, Iterable
 
 
@@ -45,3 +47,71 @@ def count_positional_args(f, default=1):
             param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
             count += 1
     return count
+
+
+
+def values_to_array(values):
+    """
+    Converts a list of curve values to a float array with `NaN`
+    in place of `None`. Falls back to an object array if the values
+    are not numbers.
+    """
+    try:
+        a = np.array([np.nan if v is None else v for v in values], dtype=float)
+        if a.ndim == 1:
+            return a
+    except (TypeError, ValueError):
+        pass
+    a = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        a[i] = v
+    return a
+
+
+def array_to_values(a):
+    """
+    Converts an array returned by `values_to_array()` back to a list
+    of curve values with `None` in place of `NaN`.
+    """
+    return [none_if_nan(v) for v in a.tolist()]
+
+
+def none_if_nan(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def set_missing(a, mask):
+    """
+    Marks values of `a` at `mask` as missing.
+    """
+    a[mask] = None if a.dtype == object else np.nan
+    return a
+
+
+def interval_mask(interval, xs, enforce_start=True, enforce_end=True):
+    """
+    Vectorized version of `Interval.contains()`.
+    """
+    xs = np.asarray(xs, dtype=float)
+    if interval.is_empty:
+        return np.zeros(len(xs), dtype=bool)
+    mask = np.ones(len(xs), dtype=bool)
+    if enforce_start:
+        if interval.start_open:
+            mask &= xs > interval.start
+        else:
+            mask &= xs >= interval.start
+    if enforce_end:
+        if interval.end_open:
+            mask &= xs < interval.end
+        else:
+            mask &= xs <= interval.end
+        if interval.start_open:
+            mask &= xs != interval.start
+    if interval.is_negative_infinite:
+        mask |= xs == -math.inf
+    if interval.is_positive_infinite:
+        mask |= xs == math.inf
+    return mask
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from curvepy.accumulator import Accumulator
 
 def test_x():
@@ -15,3 +16,12 @@ def test_x():
     assert f.x_previous(2.6) == 2
     assert f.x_previous(3) == 2
     assert f.x_previous(4) == 3
+
+
+def test_accumulate_out_of_order():
+    f = Accumulator([(1, 1), (2, 2), (3, 3)], lambda x, y, _: y)
+    assert f(3) == 3
+    with pytest.raises(Exception):
+        f._accumulate(2, 2)
+    with pytest.raises(Exception):
+        f._accumulate_many(np.array([2.0, 3.0]), np.array([2.0, 3.0]))
@@ -99,6 +99,53 @@ def test_step():
     assert f.x_previous(4.5) == 4
 
 
+def test_shared_grid_step():
+    points = Points([(i, (i, i + 2)) for i in range(100)], columns=2)
+    high = points.column(1)
+    low = points.column(0)
+    f = (high + low) / 2
+    # Delegates to the shared points, ignoring the constant
+    assert f.x_grid() is points
+    assert f.x_step(10, 50) == 60
+    assert f.x_step(30, -20) == 10
+    assert f.x_step(10, -20) is None
+    assert f.x_step(90, 20) is None
+    assert f.x_step(90, 20, clamp=True) == 99
+    assert f.x_next(98) == 99
+    assert f.x_next(99) is None
+    assert f.x_previous(1) == 0
+
+    # Different points fall back to stepping through each function
+    g = high + Points([(i * 2, 1) for i in range(50)])
+    assert g.x_grid() is None
+    assert g.x_step(10, 5) == 15
+    assert g.x_step(10, 5) == super(Aggregate, g).x_step(10, 5)
+
+
+def test_shared_grid_range():
+    points = Points([(i, (i, i + 2)) for i in range(100)], columns=2)
+    f = (points.column(1) + points.column(0)) / 2
+    assert np.array_equal(f.x_range((10, 20)), np.arange(10, 21))
+
+    # Separate points with the same x values
+    g = f + Points([(i, 1) for i in range(100)])
+    assert g.x_grid() is None
+    assert np.array_equal(g.x_range((10, 20)), np.arange(10, 21))
+    assert g.x_range((10, 20)) is not None
+    assert (g + Points([(i * 2, 1) for i in range(50)])).x_range((10, 20)) is None
+
+    # Scans in bulk
+    for provisional_last_point, expected_xs in [(False, []), (True, [99])]:
+        points.provisional_last_point = provisional_last_point
+        integral = f.integral()
+        tfm = integral.tfm
+        xs = []
+        integral.tfm = lambda x, y: xs.append(x) or tfm(x, y)
+        assert integral(99) == pytest.approx(99 ** 2 / 2 + 99)
+        # The provisional last point is scanned one by one
+        assert xs == expected_xs
+
+
 def test_update():
     p1 = Points([(0, 1), (1, 1)])
     p2 = Points([(2, 2), (4, 2)])
@@ -275,3 +322,24 @@ def test_duplicate_multiple_nested_function_update():
 #     # assert delta.domain == Interval.closed(20, 24)
 #     # assert delta(19) is None
 #     # assert delta(20) is not None
+
+
+def test_y_many():
+    p1 = Points(test_util.point_gen([1, 2, 3, 4]))
+    p2 = Points(test_util.point_gen([4, 0, None, 1], t_start=1))
+    xs = np.array([-1, 0, 1, 1.5, 2, 3, 4, 5])
+    funcs = [
+        p1 + p2,
+        p1 - p2 * 2,
+        p1 / p2,
+        p1 ** 2,
+        p1.log(2),
+        Aggregate.min([p1, p2]),
+        Aggregate.max([p1, p2], ignore_empty=True),
+        Aggregate.first([p2, p1]),
+        p1.blend(p2, 1, 3),
+        Aggregate([p1, p2], tfm=lambda x, ys: None if None in ys else x * ys[0] * ys[1]),
+    ]
+    for f in funcs:
+        expected = [np.nan if f(x) is None else f(x) for x in xs]
+        assert np.allclose(f.y_many(xs), expected, equal_nan=True)
@@ -0,0 +1,73 @@
+import numpy as np
+from curvepy.cache import Cache
+from curvepy.points import Points
+from intervalpy import Interval
+from . import test_util
+
+
+def test_cache():
+    ps = Points(test_util.point_gen([1, 2, 3, 4]))
+    calls = []
+    f = ps.map(lambda x, y: calls.append(x) or y * 10)
+    c = f.cache()
+    assert c.y(1) == 20
+    assert c.y(1) == 20
+    assert calls == [1]
+
+    assert np.allclose(c.y_many([0, 1, 2]), [10, 20, 30])
+    assert calls == [1, 0, 2]
+
+    ps.replace((1, 5))
+    assert c.y(0) == 10
+    assert c.y(1) == 50
+    assert calls == [1, 0, 2, 1]
+
+
+def test_cache_domain_update():
+    ps = Points(test_util.point_gen([1, 2]))
+    c = Cache(ps)
+    assert c.y(2) is None
+    ps.append((2, 3))
+    assert c.domain == Interval.closed(0, 2)
+    assert c.y(2) == 3
+
+
+def _counted_cache(values, maxsize=None):
+    ps = Points(test_util.point_gen(values), uniform=False)
+    calls = []
+    c = ps.map(lambda x, y: calls.append(x) or y * 10).cache(maxsize=maxsize)
+    return ps, c, calls
+
+
+def test_cache_maxsize():
+    _, c, calls = _counted_cache([1, 2, 3, 4], maxsize=2)
+    for x in [0, 1, 2, 3]:
+        c.y(x)
+    assert calls == [0, 1, 2, 3]
+    calls.clear()
+    c.y(2)
+    c.y(3)
+    assert calls == []
+    # Evicts the least recently used value
+    c.y(0)
+    c.y(3)
+    c.y(2)
+    assert calls == [0, 2]
+
+
+def test_cache_evict():
+    ps, c, calls = _counted_cache(list(range(10)))
+    for x in range(10):
+        c.y(x)
+
+    for update, expected_calls in [
+        (lambda: ps.replace((8, 100)), [8]),
+        # Updates (2, 5)
+        (lambda: ps.reset(Interval(2, 4, start_open=True, end_open=False)), [3, 4]),
+        (lambda: ps.reset(Interval.open(5, 7)), [6]),
+    ]:
+        update()
+        calls.clear()
+        ys = [c.y(x) for x in range(10)]
+        assert calls == expected_calls
+        assert ys == [ps.y(x) * 10 for x in range(10)]
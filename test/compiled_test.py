@@ -0,0 +1,36 @@
+import numpy as np
+from curvepy.curve import Curve
+from curvepy.compiled import Compiled
+from curvepy.points import Points
+from . import test_util
+
+
+def test_compile():
+    a = Points(test_util.point_gen([1, 2, None, 4, 5]))
+    b = Points(test_util.point_gen([4, 3, 2, 1]))
+    f = abs((a + b) / 2 - a * b) ** 2 + Curve.max([a, b]) - a.log(2)
+    c = f.compile()
+    xs = np.linspace(-1, 5, 25)
+    expected = [np.nan if f.y(x) is None else f.y(x) for x in xs]
+    assert np.allclose(c.y_many(xs), expected, equal_nan=True)
+    assert c.y(1) == f.y(1)
+    assert c.domain == f.domain
+
+
+def test_compile_shared_nodes():
+    calls = []
+    a = Points(test_util.point_gen([1, 2, 3]))
+    opaque = a.map(lambda y: calls.append(y) or y * 2)
+    f = opaque + opaque * opaque
+    c = Compiled(f)
+    # opaque, multiply, add
+    assert c.step_count == 3
+    assert np.allclose(c.y_many([0, 1, 2]), [6, 20, 42])
+    assert calls == [1, 2, 3]
+
+
+def test_compile_update():
+    a = Points(test_util.point_gen([1, 2, 3]))
+    c = (a * 2).compile()
+    a.append((3, 4))
+    assert np.allclose(c.y_many([2, 3]), [6, 8])
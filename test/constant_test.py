@@ -23,3 +23,8 @@ def test_constant():
     f = Constant(1)
     f.value = 2
     assert f(0) == 2
+
+
+def test_y_many():
+    assert np.array_equal(Constant(2).y_many([-1, 0, 1]), [2, 2, 2])
+    assert np.isnan(Constant(None).y_many([0])).all()
@@ -54,6 +54,23 @@ def test_sample_infinite():
         f.sample_points(domain=Interval.lte(0))
 
 
+def test_sample_step():
+    f = Line(const=0, slope=1)
+    assert f.sample_points(domain=(0, 1), step=0.25) == [(0, 0), (0.25, 0.25), (0.5, 0.5), (0.75, 0.75), (1, 1)]
+    xs, ys = f.sample_points(domain=Interval.open(0, 1), step=0.3, as_arrays=True)
+    assert np.allclose(xs, [0.3, 0.6, 0.9])
+    assert np.allclose(ys, [0.3, 0.6, 0.9])
+
+    # No accumulated drift
+    points = f.sample_points(domain=(0, 1000), step=0.1)
+    assert len(points) == 10001
+    assert points[-1][0] == 1000
+
+    xs, ys = (f + Points([(0, 1), (1, None), (2, 3)])).sample_points(domain=(0, 2), step=0.5, as_arrays=True)
+    assert np.allclose(xs, [0, 0.5, 1, 1.5, 2])
+    assert np.allclose(ys, [1, np.nan, np.nan, np.nan, 5], equal_nan=True)
+
+
 def test_func_update():
     begin_update_count = 0
     begin_update_interval = None
@@ -102,6 +119,98 @@ def test_func_update():
     assert end_update_count == 1
 
 
+def test_batch_update():
+    a = Points(test_util.point_gen([1, 2]))
+    b = Points(test_util.point_gen([3, 4]))
+    f = a + b
+    end_intervals = []
+    f.add_observer(end=lambda domain: end_intervals.append(domain))
+
+    with Curve.batch_update():
+        a.append((2, 3))
+        a.append((3, 4))
+        with Curve.batch_update():
+            b.append_list([(2, 5), (3, 6)])
+        assert a.domain == Interval.closed(0, 3)
+        assert end_intervals == []
+    assert end_intervals == [Interval(1, 3, start_open=True, end_open=False)]
+    assert f.y(3) == 10
+
+    with pytest.raises(Exception):
+        with Curve.batch_update():
+            a.append((4, 5))
+            raise Exception('Interrupted')
+    assert len(end_intervals) == 2
+    assert f.domain == Interval.closed(0, 3)
+
+
+def test_update_observer_index():
+    f = Curve()
+    called = []
+
+    def observer(i):
+        return lambda: called.append(i)
+
+    for i in range(100):
+        f.add_observer(domain=Interval.closed(i, i + 1), begin=observer(i))
+    f.add_observer(begin=lambda: called.append('all'), prioritize=True)
+    f.add_observer(domain=Interval.open(50, 51), begin=lambda: called.append('open'))
+
+    f.begin_update(Interval.closed(50, 50.5))
+    assert called == ['all', 49, 50, 'open']
+    f.end_update(Interval.closed(50, 50.5))
+
+    called = []
+    f.begin_update(Interval.closed(51, 60))
+    assert called == ['all'] + list(range(50, 61))
+    f.end_update(Interval.closed(51, 60))
+
+
+def test_update_observer_index_add_remove():
+    f = Curve()
+    called = []
+
+    def observer(i):
+        return lambda: called.append(i)
+
+    # Observers in notification order, checked one by one below
+    order = []
+    domains = {}
+    tokens = {}
+
+    def add(i, domain, prioritize=False):
+        domains[i] = domain
+        tokens[i] = f.add_observer(domain=domain, begin=observer(i), prioritize=prioritize)
+        if prioritize:
+            order.insert(0, i)
+        else:
+            order.append(i)
+
+    for i in range(100):
+        add(i, Interval.closed(i, i + 1 + i % 7), prioritize=i % 3 == 0)
+    for i in range(0, 100, 4):
+        f.remove_observer(tokens[i])
+        order.remove(i)
+    add(100, Interval.closed(0, 1000))
+    add(101, Interval.gte(55), prioritize=True)
+    add(102, Interval.closed(60, 60))
+    add(103, Interval.closed(51.75, 52.25))
+
+    def check():
+        nonlocal called
+        for domain in [Interval.closed(50, 52), Interval.closed(60, 60), Interval.open(90, 200)]:
+            called = []
+            f.begin_update(domain)
+            assert called == [i for i in order if domains[i].intersects(domain)]
+            f.end_update(domain)
+
+    check()
+    for i in [100, 103]:
+        f.remove_observer(tokens[i])
+        order.remove(i)
+    check()
+
+
 def test_update_with_obj():
     begin_update_count = 0
 
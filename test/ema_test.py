@@ -42,6 +42,31 @@ def test_update_ema_from_empty_non_zero_start():
     points.append_list([(1, 1), (2, 2), (3, 1)])
     assert np.allclose(f.sample_points(), [(1, 1), (2, 1.5), (3, 1.25)])
 
+def test_bulk_ema():
+    values = [None] + [float((i * 7) % 13) for i in range(600)]
+    values[300] = None
+    for degree, is_period in [(0.1, False), (1, False), (3, True)]:
+        points = Points(test_util.point_gen(values))
+        f = points.ema(degree, is_period=is_period)
+        expected = points.ema(degree, is_period=is_period)
+        expected.tfm_many = None
+        xs, ys = f.sample_points(as_arrays=True)
+        assert np.isnan(ys[0])
+        assert np.allclose(ys[1:], [expected(x) for x in xs[1:]])
+
+        # Continue from bulk scan
+        points.append((601, 5))
+        assert f(601) == approx(expected(601))
+
+def test_bulk_smma():
+    points = Points(test_util.point_gen([float((i * 7) % 13) for i in range(100)]))
+    f = points.smma(14)
+    expected = points.smma(14)
+    expected.tfm_many = None
+    expected.init_func.tfm_many = None
+    assert f(12) is None
+    assert np.allclose(f.y_many(range(13, 100)), [expected(x) for x in range(13, 100)])
+
 # def test_ema_irregular():
 #     f = Points(test_util.point_gen([1, 2, 1, 2])).ema(3, is_period=True)
 #     assert f(0) == 1
@@ -61,3 +86,30 @@ def test_update_ema_from_empty_non_zero_start():
 #     f = points.ema(3, is_period=True)
 #     points.append_list([(2, 1), (3, 2), (4, 1)])
 #     assert np.allclose(f.sample_points(), [(2, 1), (3, 1.15), (4, 1.24)], rtol=0.01)
+
+def test_ema_warm_start():
+    values = [float((i * 7) % 13) for i in range(2000)]
+    points = Points(test_util.point_gen(values))
+    for degree, is_period in [(0.1, False), (10, True)]:
+        expected = points.ema(degree, is_period=is_period)
+        f = points.ema(degree, is_period=is_period, tolerance=1e-6)
+        assert f(1999) == approx(expected(1999), abs=13e-6)
+        assert len(f.accumulated_points.xs) < 200
+
+        # Starts from the beginning if the window is longer
+        f = points.ema(degree, is_period=is_period, tolerance=1e-6)
+        assert f(50) == expected(50)
+        assert f.accumulated_points.domain.start == 0
+
+    with pytest.raises(Exception):
+        points.ema(0.1, tolerance=0)
+
+
+def test_ema_warm_start_missing_values():
+    values = [100] * 40 + [None] * 18 + [0] * 3
+    points = Points(test_util.point_gen(values))
+    for degree, is_period in [(0.5, False), (1.5, True)]:
+        expected = points.ema(degree, is_period=is_period)
+        f = points.ema(degree, is_period=is_period, tolerance=1e-6)
+        assert f(60) == approx(expected(60), abs=100e-6)
+        assert f.accumulated_points.domain.start > 0
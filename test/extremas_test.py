@@ -3,6 +3,7 @@ import numpy as np
 from curvepy.extremas import Extremas
 from curvepy.constant import Constant
 from curvepy.points import Points
+from curvepy.scan import CHECKPOINT_INTERVAL
 from . import test_util
 
 def test_extrema():
@@ -44,3 +45,104 @@ def test_update_ref_func():
     assert np.allclose(e.sample_points(), [(0, 1), (1, 3), (2, 1.5), (3, 3.5)])
     ref_f.value = 1.25
     assert np.allclose(e.sample_points(), [(0, 1), (3, 3.5)])
+
+def _bulk_values(count):
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(size=count)) + 100
+    values[rng.integers(0, count, size=count // 20)] = np.nan
+    values = values.tolist()
+    return [None if np.isnan(y) else y for y in values]
+
+def test_bulk_scan():
+    values = _bulk_values(2000)
+    for min_deviation in [0, 0.01]:
+        ps = Points(test_util.point_gen(values))
+        ref_f = Points(test_util.point_gen(values)).sma(20, is_period=False)
+        e = Extremas(ps, ref_f, min_deviation=min_deviation, min_step=1)
+        expected = Extremas(ps, ref_f, min_deviation=min_deviation, min_step=1)
+        expected.tfm_many = None
+        e.scan(1000)
+        assert len(e.extremas) > 20
+        expected.scan(1000)
+        assert e.extremas == expected.extremas
+        assert e.possible_extrema == expected.possible_extrema
+        assert e.possible_extrema_phase == expected.possible_extrema_phase
+        assert e.sample_points() == expected.sample_points()
+
+def test_bulk_scan_update():
+    values = _bulk_values(2000)
+    ps = Points(test_util.point_gen(values[:1000]))
+    e = Extremas(ps, Constant(100), min_step=1)
+    e.scan(999)
+    # Resumes from the last extrema
+    ps.append_list(test_util.point_gen(values[1000:], t_start=1000))
+    ps.replace((1500, 150))
+    expected = Extremas(Points(test_util.point_gen(values[:1500] + [150] + values[1501:])), Constant(100), min_step=1)
+    expected.tfm_many = None
+    assert e.sample_points() == expected.sample_points()
+
+def test_bulk_scan_zero_ref():
+    ps = Points(test_util.point_gen(_bulk_values(100)))
+    e = Extremas(ps, Points(test_util.point_gen([0] + [100] * 99)), min_step=1)
+    with pytest.raises(ZeroDivisionError):
+        e.sample_points()
+
+def _count_steps(f):
+    tfm = f.tfm
+    counter = {'steps': 0}
+
+    def counting_tfm(x, y):
+        counter['steps'] += 1
+        return tfm(x, y)
+
+    f.tfm = counting_tfm
+    return counter
+
+def test_checkpoint_update():
+    values = [100 + 10 * np.sin(i / 5) for i in range(1000)]
+    ps = Points(test_util.point_gen(values))
+    e = Extremas(ps, Constant(100), min_step=1)
+    e.tfm_many = None
+    counter = _count_steps(e)
+    e.sample_points()
+
+    ps.replace((900, 120))
+    values[900] = 120
+    expected = Extremas(Points(test_util.point_gen(values)), Constant(100), min_step=1)
+    expected.tfm_many = None
+    counter['steps'] = 0
+    assert e.sample_points() == expected.sample_points()
+    assert e.extremas == expected.extremas
+    # Resumes from the last checkpoint before the update
+    assert counter['steps'] == 999 - (3 * CHECKPOINT_INTERVAL - 1)
+
+def test_checkpoint_update_ref_func():
+    values = [100 + 10 * np.sin(i / 5) for i in range(1000)]
+    ps = Points(test_util.point_gen(values))
+    ref_values = [100] * 1000
+    ref_f = Points(test_util.point_gen(ref_values))
+    e = Extremas(ps, ref_f, min_step=1)
+    e.tfm_many = None
+    counter = _count_steps(e)
+    e.sample_points()
+
+    ref_f.replace((600, 115))
+    ref_values[600] = 115
+    expected = Extremas(ps, Points(test_util.point_gen(ref_values)), min_step=1)
+    expected.tfm_many = None
+    counter['steps'] = 0
+    assert e.sample_points() == expected.sample_points()
+    assert e.extremas == expected.extremas
+    assert counter['steps'] == 999 - (2 * CHECKPOINT_INTERVAL - 1)
+
+def test_update_no_checkpoint():
+    values = [100 + 10 * np.sin(i / 5) for i in range(100)]
+    ps = Points(test_util.point_gen(values))
+    e = Extremas(ps, Constant(100), min_step=1)
+    e.sample_points()
+    # Resumes from the last extrema
+    ps.replace((60, 120))
+    values[60] = 120
+    expected = Extremas(Points(test_util.point_gen(values)), Constant(100), min_step=1)
+    assert e.sample_points() == expected.sample_points()
+    assert e.extremas == expected.extremas
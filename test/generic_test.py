@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from curvepy.generic import Generic
 
 def test_generic():
@@ -7,4 +8,8 @@ def test_generic():
     assert g(0) == 0
     assert g(1) == 2
     assert g(1.1) is None
-    assert g.d_y(0.5) == 2
\ No newline at end of file
+    assert g.d_y(0.5) == 2
+
+def test_y_many():
+    f = Generic(lambda x: x * 2 if x != 1 else None, domain=(0, 2))
+    assert np.allclose(f.y_many([-1, 0, 1, 2]), [np.nan, 0, np.nan, 4], equal_nan=True)
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from curvepy.constant import Constant
 from curvepy.line import Line
 from curvepy.points import Points
@@ -132,3 +133,39 @@ def test_updates():
     assert f(2) == 2
     ps.set([(0, 2), (1, 2), (2, 2)])
     assert f(2) == 4
+
+
+def test_bulk_scan():
+    values = [None, None] + [float((i * 7) % 13) for i in range(100)]
+    values[50] = None
+    for interpolation in [Points.interpolation.linear, Points.interpolation.previous, Points.interpolation.next]:
+        ps = Points(test_util.point_gen(values))
+        f = ps.integral(interpolation=interpolation)
+        expected = ps.integral(interpolation=interpolation)
+        expected.tfm_many = None
+        assert f(101) == pytest.approx(expected(101))
+        assert len(f.accumulated_points.xs) == len(values)
+        for x in range(len(values)):
+            if expected(x) is None:
+                assert f(x) is None
+            else:
+                assert f(x) == pytest.approx(expected(x))
+
+        # Continue from bulk scan
+        ps.append_list(test_util.point_gen([float(i % 5) for i in range(20)], t_start=len(values)))
+        assert f(121) == pytest.approx(expected(121))
+        assert f(110.5) == pytest.approx(expected(110.5))
+
+
+def test_incremental_scan():
+    values = [float((i * 7) % 13) for i in range(40)]
+    for interpolation in [Points.interpolation.linear, Points.interpolation.previous, Points.interpolation.next]:
+        ps = Points(test_util.point_gen(values))
+        f = ps.integral(interpolation=interpolation)
+        f.tfm_many = None
+        ys = [f(x) for x in range(40)]
+        # Same values as the bulk scan
+        assert np.array_equal(ys, ps.integral(interpolation=interpolation).y_many(range(40)))
+
+        ps.replace((20, 100))
+        assert f(39) == ps.integral(interpolation=interpolation)(39)
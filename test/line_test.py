@@ -52,3 +52,8 @@ def test_partial_integration():
     l = Line(const=3, slope=5)
     assert l(3) == 18
     assert l.partial_integration(0, 3) == 31.5
+
+
+def test_y_many():
+    l = Line(p1=(1, 2), p2=(3, 6))
+    assert np.allclose(l.y_many([-1, 0, 1, 2.5]), [l(-1), l(0), l(1), l(2.5)])
@@ -67,3 +67,13 @@ def test_get_map_after_update_observer_before_map():
 
     points.append_list(test_util.point_gen([1, 2, 3]))
     assert callback_count == 1
+
+def test_y_many():
+    points = Points(test_util.point_gen([1, None, -3]))
+    xs = [-1, 0, 0.5, 1, 2]
+
+    f = points.map(lambda y: y * 2, skip_none=True)
+    assert np.allclose(f.y_many(xs), [np.nan, 2, np.nan, np.nan, -6], equal_nan=True)
+
+    f = -points.abs()
+    assert np.allclose(f.y_many(xs), [np.nan, -1, np.nan, np.nan, -3], equal_nan=True)
@@ -222,3 +222,35 @@ def test_offset_with_duration_non_uniform():
     assert f.x_previous(22 * HOUR) == 20 * HOUR
     assert f.x_previous(DAY + 10 * HOUR) == DAY
     assert f.x_previous(DAY + 20.5 * HOUR) == DAY + 20 * HOUR
+
+
+def test_y_many():
+    points = Points(test_util.point_gen([1, 2, 3], t_step=DAY))
+    xs = np.arange(-1, 5) * DAY + HOUR
+    for f in [points.offset(0.5 * DAY), points.offset(1, duration=DAY)]:
+        expected = [np.nan if f(x) is None else f(x) for x in xs]
+        assert np.allclose(f.y_many(xs), expected, equal_nan=True)
+
+
+def _x_next_range(f, domain):
+    xs = []
+    x = f.x_next(max(domain[0], f.domain.start) - 1)
+    while x is not None and x <= domain[1]:
+        xs.append(x)
+        x = f.x_next(x)
+    return xs
+
+
+def test_x_range():
+    points = Points(test_util.point_gen(list(range(100)), t_step=60))
+    for f in [points.offset(90), points.offset(3, duration='1m'), points.offset(-2, duration='1m')]:
+        for domain in [(0, 6000), (250, 1000), (300, 1200)]:
+            xs = f.x_range(domain)
+            assert xs is not None
+            assert xs.tolist() == _x_next_range(f, domain)
+        assert np.allclose(f.sample_points(as_arrays=True)[1], [f(x) for x in _x_next_range(f, (f.domain.start, f.domain.end))])
+
+    duration = Duration('20h')
+    raw_points = [(ts.start, float(i + 1)) for i, ts in enumerate(duration.walk(0, limit=3))]
+    f = Points(raw_points, uniform=False).offset(1, duration=duration)
+    assert f.x_range((0, 2 * DAY)) is None
@@ -37,3 +37,10 @@ def test_varying_step():
     assert pw(3.1) is None
     assert np.allclose(pw.sample_points(domain=(0, 3), step=0.5), [(1, 2), (1.5, 2), (2, 3), (2.5, 3.5), (3, 4)])
     # assert np.allclose(pw.sample_points(domain=(0, 3), min_step=0.5), [(1, 2), (2, 3), (3, 4)])
+
+def test_y_many():
+    c1 = Constant(2)
+    c2 = Points(test_util.point_gen([3, 4], t_start=2))
+    pw = Piecewise([c1, c2], Interval(1, 3).partition([2]))
+    xs = np.array([0.9, 1, 1.9, 2, 2.5, 3, 3.1])
+    assert np.allclose(pw.y_many(xs), [np.nan, 2, 2, 3, 3.5, 4, np.nan], equal_nan=True)
@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 from pytest import approx
 from curvepy.points import Points
+from curvepy.mmap_store import HEADER_SIZE
 from intervalpy import Interval
 from . import test_util
 
@@ -136,6 +137,9 @@ def test_update_equally_spaced_with_non_equally_spaced():
     assert np.array_equal(points.sample_points(), [(0, 1), (1, 2), (3, 4)])
     assert np.array_equal(points.sample_points(step=1), [
                           (0, 1), (1, 2), (2, 3), (3, 4)])
+    points.append((4, 5))
+    assert not points.is_uniform
+    assert points(3.5) == 4.5
 
 
 def test_replace():
@@ -161,6 +165,19 @@ def test_replace():
     assert points(2) == 3
 
 
+def test_replace_numpy_scalar():
+    points = Points([(0, 1), (1, 2)], uniform=False)
+    points.replace((1, np.int64(3)))
+    points.replace((2, np.float32(4)), or_append=True)
+    assert points._ys.dtype == float
+    assert points(1) == 3
+    assert points(2) == 4
+
+    points.replace((2, 'a'))
+    assert points._ys.dtype == object
+    assert points(2) == 'a'
+
+
 def test_reset():
     update_interval = None
 
@@ -269,3 +286,127 @@ def test_interval_indexes():
 
     i0, i1 = points._domain_indexes(Interval.open(3, 4))
     assert i0 == i1
+
+
+def test_y_many():
+    xs = np.array([-1, 0, 0.5, 1, 1.25, 2, 2.5, 3])
+    for interpolation in Points.interpolation.all:
+        ps = Points(test_util.point_gen([1, None, 3, 4]), interpolation=interpolation)
+        expected = [np.nan if ps(x) is None else ps(x) for x in xs]
+        assert np.allclose(ps.y_many(xs), expected, equal_nan=True)
+
+
+def test_columnar_storage():
+    ps = Points([])
+    for i in range(100):
+        ps.append((i, None if i % 10 == 0 else float(i)))
+    assert len(ps.xs) == 100
+    assert ps.y(10) is None
+    assert ps.y(11) == 11
+    assert ps.sample_points(domain=(8, 11)) == [(8, 8), (9, 9), (10, None), (11, 11)]
+
+    ps.reset(domain=Interval.closed(90, 99))
+    assert ps.domain == Interval.closed(0, 89)
+    assert ps.y_end() == 89
+    ps.append((90, 0))
+    assert ps.y(90) == 0
+
+    ps = Points([(0, 1), (1, None)])
+    ps.append((2, (1, 2)))
+    assert ps.y(1) is None
+    assert ps.y(2) == (1, 2)
+    assert ps.sample_points() == [(0, 1), (1, None), (2, (1, 2))]
+
+
+def test_y_many_non_uniform():
+    xs = np.array([-1, 0, 0.5, 1, 1.25, 2, 3, 3.5, 4, 7, 8])
+    points = [(0, 1), (1, None), (3, 3), (4, 4), (7, 2)]
+    for interpolation in Points.interpolation.all:
+        ps = Points(points, interpolation=interpolation, uniform=False)
+        expected = [np.nan if ps(x) is None else ps(x) for x in xs]
+        assert np.allclose(ps.y_many(xs), expected, equal_nan=True)
+        assert np.allclose(ps.x_index_many(xs[1:-1]), [ps.x_index(x) for x in xs[1:-1]])
+
+
+def test_mmap(tmp_path):
+    path = str(tmp_path / 'points.bin')
+    ps = Points.open_mmap(path)
+    ps.append_list(test_util.point_gen([1, None, 3]))
+    for i in range(3, 2000):
+        ps.append((i, i))
+    ps.flush()
+
+    ps = Points.open_mmap(path, mode='r')
+    assert ps.domain == Interval.closed(0, 1999)
+    assert ps.y(1) is None
+    assert ps.y(3.5) == 3.5
+    assert ps.sample_points(domain=(0, 3)) == [(0, 1), (1, None), (2, 3), (3, 3)]
+    assert np.allclose(ps.y_many([1999, 2000]), [1999, np.nan], equal_nan=True)
+    with pytest.raises(Exception):
+        ps.append((2000, 0))
+
+
+def test_mmap_columns(tmp_path):
+    path = str(tmp_path / 'points.bin')
+    ps = Points.open_mmap(path, columns=2)
+    ps.append_list([(i, (i, -i)) for i in range(100)])
+    # Grows past the initial capacity
+    ps.append_arrays(np.arange(100, 3000), np.stack([np.arange(100, 3000), -np.arange(100, 3000)], axis=1))
+    ps.flush()
+
+    ps = Points.open_mmap(path, mode='r')
+    assert ps.columns == 2
+    assert ps.domain == Interval.closed(0, 2999)
+    assert np.array_equal(ps.column(1).y_many([0, 1500, 2999]), [0, -1500, -2999])
+
+    # Columns are stored in contiguous blocks
+    values = np.fromfile(path, dtype='<f8', offset=HEADER_SIZE)
+    capacity = len(values) // 3
+    assert np.array_equal(values[:3000], np.arange(3000))
+    assert np.array_equal(values[capacity:capacity + 3000], np.arange(3000))
+    assert np.array_equal(values[2 * capacity:2 * capacity + 3000], -np.arange(3000))
+
+
+def test_mmap_read_only(tmp_path):
+    path = str(tmp_path / 'points.bin')
+    ps = Points.open_mmap(path)
+    ps.append_list(test_util.point_gen([1, 2, 3]))
+    ps.flush()
+
+    ps = Points.open_mmap(path, mode='r')
+    updates = []
+    ps.add_observer(begin=lambda domain: updates.append(domain))
+    writes = [
+        lambda: ps.append((3, 4)),
+        lambda: ps.append_arrays([3], [4]),
+        lambda: ps.replace((1, 5)),
+        lambda: ps.reset((1, 2)),
+        lambda: ps.set([(0, 1)]),
+        lambda: ps._append_point((3, 4)),
+    ]
+    for write in writes:
+        with pytest.raises(Exception, match='read-only'):
+            write()
+    # Observers are not notified and the points are unchanged
+    assert updates == []
+    assert not ps.is_updating
+    assert ps.sample_points() == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_append_point():
+    points = Points([(0, 1)], uniform=False)
+    points._append_point((1, 2))
+    points._append_point((2, None))
+    assert points.last_point() == (2, None)
+    assert points.domain.end == 2
+    assert points.is_uniform
+    points._append_point((4, 3))
+    assert not points.is_uniform
+    assert points(0.5) == 1.5
+    assert points(4) == 3
+    with pytest.raises(Exception):
+        points._append_point((4, 5))
+
+    points = Points(test_util.point_gen([1, 2, 3]))
+    with pytest.raises(Exception):
+        points._append_point((4, 4))
@@ -265,6 +265,31 @@ def test_hl2():
     assert ps(12.5) is None
 
 
+def test_hl2_sma():
+    t = np.arange(3000) * 60
+    closes = (t % 17).astype(float)
+    f = Quotes.from_arrays(t, closes, closes + 2, closes - 1, closes, duration='1m')
+    expected = f.close.sma(200) + 0.5
+    hl2 = f.hl2
+    # Steps by index through the quote points
+    assert hl2.x_grid() is f._quote_points
+    assert np.array_equal(hl2.x_range((0, t[-1])), t)
+
+    sma = hl2.sma(200)
+    tfm = sma.tfm
+    scanned_xs = []
+    sma.tfm = lambda x, y: scanned_xs.append(x) or tfm(x, y)
+    xs, ys = sma.sample_points(as_arrays=True)
+    assert np.allclose(ys, expected.sample_points(as_arrays=True)[1])
+    # Scanned in bulk
+    assert scanned_xs == []
+
+    ao = f.ao()
+    assert np.allclose(ao.sample_points(as_arrays=True)[1], (f.close.sma(5) - f.close.sma(34)).sample_points(as_arrays=True)[1])
+    for line, expected_line in zip(f.alligator(), [f.close.sma(13).offset(8, duration=f.duration) + 0.5]):
+        assert np.allclose(line.sample_points(as_arrays=True)[1], expected_line.sample_points(as_arrays=True)[1])
+
+
 def test_volume():
     ps = Quotes(1, quote_points=Quote.mock_ohlcv_points([
         (1, 2.2, 0.9, 2, 10),
@@ -380,3 +405,149 @@ def test_multiple_nested_quotes_update():
 
     assert ave.domain == Interval.closed(0, 23)
     assert ave(0) == 1
+
+
+def test_columns():
+    f = Quotes(1, quote_points=Quote.mock_ohlcv_points([
+        (1, 2.2, 0.9, 2, 10),
+        (2, 3.1, 1.9, 3, 20),
+        (3, 5.1, 2.9, 5, 30)
+    ], t_start=10, t_step=1))
+    assert np.allclose(f.close.y_many([9, 10, 10.5, 12, 13]), [np.nan, 2, 2, 5, np.nan], equal_nan=True)
+    assert np.allclose(f.hl2.y_many([10, 11.5]), [1.55, 2.5])
+    xs, ys = f.high.sample_points(as_arrays=True)
+    assert np.allclose(xs, [10, 11, 12])
+    assert np.allclose(ys, [2.2, 3.1, 5.1])
+    assert f.get_range() == Interval(0.9, 5.1)
+    assert f.get_range(domain=(10.5, 11)) == Interval(0.9, 3.1)
+
+    f.append((13, (4, 4.5, 3.5, 4)))
+    assert f(13) == (4, 4.5, 3.5, 4, None)
+    assert f.close(13) == 4
+    assert f.volume(13) is None
+
+
+def test_mmap(tmp_path):
+    path = str(tmp_path / 'quotes.bin')
+    points = Quote.mock_ohlcv_points([
+        (1, 2.2, 0.9, 2, 10),
+        (2, 3.1, 1.9, 3, 20),
+        (3, 5.1, 2.9, 5, 30)
+    ], t_start=10, t_step=1)
+    f = Quotes.open_mmap(path, 1)
+    f.set(points[:2])
+    f.append(points[2])
+    f.flush()
+
+    f = Quotes.open_mmap(path, 1)
+    assert f.sample_points() == points
+    assert f.close.sample_points() == [(10, 2), (11, 3), (12, 5)]
+
+
+def test_from_arrays():
+    updates = []
+    f = Quotes.from_arrays(
+        [10, 11, 12],
+        [1, 2, 3],
+        [2.2, 3.1, 5.1],
+        [0.9, 1.9, 2.9],
+        [2, 3, 5]
+    )
+    assert f.duration.ave_seconds == 1
+    assert f.sample_points() == [(10, (1, 2.2, 0.9, 2, None)), (11, (2, 3.1, 1.9, 3, None)), (12, (3, 5.1, 2.9, 5, None))]
+    f.close.add_observer(end=lambda: updates.append(True))
+
+    f.append_arrays([13, 14], [5, 6], [6, 7], [4, 5], [6, 7], v=[10, 20])
+    assert updates == [True]
+    assert f.close.sample_points() == [(10, 2), (11, 3), (12, 5), (13, 6), (14, 7)]
+    assert f.volume(14) == 20
+
+    with pytest.raises(Exception):
+        # Gap
+        f.append_arrays([16], [1], [1], [1], [1])
+    with pytest.raises(Exception):
+        # Not ascending
+        Quotes.from_arrays([10, 12, 11], [1] * 3, [1] * 3, [1] * 3, [1] * 3, duration=1)
+    with pytest.raises(Exception):
+        # Wrong duration
+        Quotes.from_arrays([10, 12, 14], [1] * 3, [1] * 3, [1] * 3, [1] * 3, duration=1)
+
+
+def test_from_csv(tmp_path):
+    path = tmp_path / 'quotes.csv'
+    path.write_text('date,open,high,low,close,volume\n10,1,2.2,0.9,2,10\n11,2,3.1,1.9,3,20\n')
+    f = Quotes.from_csv(str(path), 1)
+    assert f.sample_points() == [(10, (1, 2.2, 0.9, 2, 10)), (11, (2, 3.1, 1.9, 3, 20))]
+
+    path.write_text('c,t,o,h,l\n2,10,1,2.2,0.9\n3,11,2,3.1,1.9\n')
+    f = Quotes.from_csv(str(path), columns=['t', 'o', 'h', 'l', 'c'])
+    assert f.close.sample_points() == [(10, 2), (11, 3)]
+
+
+def test_resample():
+    f = Quotes.from_arrays(
+        [0, 60, 120, 180, 240, 300, 360],
+        [1, 2, 3, 4, 5, 6, 7],
+        [2, 3, 9, 5, 6, 7, 8],
+        [0.5, 1.5, 2.5, 0.1, 4.5, 5.5, 6.5],
+        [1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5],
+        v=[1, 1, 1, 1, 1, 1, 1],
+        duration='1m'
+    )
+    r = f.resample('3m')
+    assert r.sample_points() == [
+        (0, (1, 9, 0.5, 3.5, 3)),
+        (180, (4, 7, 0.1, 6.5, 3)),
+        (360, (7, 8, 6.5, 7.5, 1)),
+    ]
+    closes = r.close
+    assert closes.sample_points() == [(0, 3.5), (180, 6.5), (360, 7.5)]
+
+    updates = []
+    r.add_observer(end=lambda domain: updates.append(domain))
+    f.append_arrays([420, 480], [8, 9], [9, 10], [7, 8], [8.5, 9.5], v=[1, 1])
+    assert r(360) == (7, 10, 6.5, 9.5, 3)
+    assert closes(540) is None
+    assert updates == [Interval(180, 360, start_open=True, end_open=False)]
+
+    f.append_arrays([540], [10], [11], [9], [10.5], v=[2])
+    assert closes.sample_points() == [(0, 3.5), (180, 6.5), (360, 9.5), (540, 10.5)]
+    assert r.volume(540) == 2
+    with pytest.raises(Exception):
+        r.append((720, (1, 1, 1, 1)))
+
+
+def test_replace_last_quote():
+    t = np.arange(300) * 60
+    closes = (t % 7).astype(float)
+    f = Quotes.from_arrays(t, closes, closes + 1, closes - 1, closes, duration='1m')
+    f.provisional_last_quote = True
+    ema = f.close.ema(0.2)
+    high = f.trailing_high(10)
+    r = f.resample('5m')
+    assert r.provisional_last_quote
+    r_ema = r.close.ema(0.2)
+    scanned_xs = []
+    for scan in [ema, r_ema]:
+        tfm = scan.tfm
+        scan.tfm = lambda x, y, tfm=tfm: scanned_xs.append(x) or tfm(x, y)
+    assert ema(t[-1]) is not None
+    assert high(t[-1]) is not None
+    assert r_ema(r.domain.end) is not None
+
+    for close in [3.0, 20.0, 2.5]:
+        f.replace((t[-1], (2, close + 1, 1, close)))
+        closes[-1] = close
+        scanned_xs.clear()
+        expected = Quotes.from_arrays(t, closes, closes + 1, closes - 1, closes, duration='1m')
+        expected.replace((t[-1], (2, close + 1, 1, close)))
+        assert ema(t[-1]) == pytest.approx(expected.close.ema(0.2)(t[-1]))
+        assert high(t[-1]) == expected.trailing_high(10)(t[-1])
+        assert r_ema(r.domain.end) == pytest.approx(expected.resample('5m').close.ema(0.2)(r.domain.end))
+        # Only the last quote is scanned again
+        assert scanned_xs == [t[-1], r.domain.end]
+
+    with pytest.raises(Exception):
+        r.replace((t[-1], (2, 3, 1, 2)))
+    with pytest.raises(Exception):
+        r.provisional_last_quote = False
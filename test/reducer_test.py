@@ -0,0 +1,85 @@
+import pytest
+import statistics
+import numpy as np
+from curvepy import Points, Sum, Mean, Variance, StandardDeviation, ZScore, LinearWeightedSum
+from . import test_util
+
+VALUES = [float((i * 7) % 13) for i in range(60)]
+
+
+def _weighted_sum(ys):
+    # `ys` are newest first
+    return sum((len(ys) - i) * y for i, y in enumerate(ys))
+
+
+def _z_score(ys):
+    std = np.std(ys)
+    return (ys[0] - np.mean(ys)) / std if std != 0 else None
+
+
+REDUCERS = [
+    (Sum(), lambda ys: sum(ys)),
+    (Mean(), lambda ys: np.mean(ys)),
+    (Variance(), lambda ys: np.var(ys)),
+    (Variance(ddof=1), lambda ys: np.var(ys, ddof=1) if len(ys) > 1 else None),
+    (StandardDeviation(), lambda ys: np.std(ys)),
+    (ZScore(), _z_score),
+    (LinearWeightedSum(), _weighted_sum),
+    (LinearWeightedSum(normalize=True), lambda ys: _weighted_sum(ys) / (len(ys) * (len(ys) + 1) / 2)),
+]
+
+
+def _assert_same(f, expected, xs):
+    for x in xs:
+        y = f(x)
+        y_expected = expected(x)
+        if y_expected is None:
+            assert y is None
+        else:
+            assert y == pytest.approx(y_expected, abs=1e-9)
+
+
+def test_reducer_degree():
+    points = Points(test_util.point_gen(VALUES))
+    for reducer, tfm in REDUCERS:
+        for degree in [1, 3, 10]:
+            f = points.accumulator_map(reducer, degree)
+            expected = points.accumulator_map(tfm, degree)
+            assert f.reducer is not reducer
+            _assert_same(f, expected, range(60))
+
+
+def test_reducer_period():
+    points = Points(test_util.point_gen(VALUES, t_step=2))
+    for reducer, tfm in REDUCERS:
+        for period in [1, 5, 20]:
+            f = points.accumulator_map(reducer, period, is_period=True)
+            expected = points.accumulator_map(tfm, period, is_period=True)
+            _assert_same(f, expected, range(0, 119))
+
+
+def test_reducer_update():
+    points = Points(test_util.point_gen(VALUES))
+    f = points.accumulator_map(Mean(), 4)
+    assert f(59) == pytest.approx(np.mean(VALUES[56:]))
+    points.set(test_util.point_gen([1, 2, 3, 4, 5]))
+    assert f(4) == pytest.approx(3.5)
+    points.append((5, 10))
+    assert f(5) == pytest.approx(5.5)
+
+
+def test_rolling_quantile():
+    points = Points(test_util.point_gen(VALUES))
+    for q in [0, 0.25, 0.5, 1]:
+        for degree in [1, 4, 15]:
+            f = points.rolling_quantile(q, degree)
+            for x in range(60):
+                window = VALUES[max(0, x - degree + 1):x + 1]
+                assert f(x) == pytest.approx(np.quantile(window, q))
+
+    f = points.rolling_quantile(0.5, 10, is_period=True)
+    expected = points.accumulator_map(lambda ys: statistics.median(ys), 10, is_period=True)
+    _assert_same(f, expected, range(60))
+
+    with pytest.raises(Exception):
+        points.rolling_quantile(2, 10)
@@ -0,0 +1,31 @@
+from curvepy.points import Points
+from curvepy.registry import Registry
+from . import test_util
+
+
+def test_registry():
+    a = Points(test_util.point_gen([1, 2, 3, 4]))
+    b = Points(test_util.point_gen([1, 2, 3, 4]))
+    with Registry() as registry:
+        assert a.sma(2) is a.sma(2)
+        assert a.sma(2) is not a.sma(3)
+        assert a.sma(2) is not b.sma(2)
+        assert a.ema(0.5) is a.ema(0.5)
+        assert a.offset(1) is a.offset(1)
+        assert a + 1 is a + 1
+        assert a + b is a.add(b)
+        assert a + b is not b + a
+        double = lambda y: y * 2
+        assert a.map(double, name='double') is a.map(double, name='double')
+        scale2 = a.map(double, name='scale')
+        scale3 = a.map(lambda y: y * 3, name='scale')
+        assert scale2 is not scale3
+        assert scale3(1) == 6
+        assert a.map(lambda y: y * 2) is not a.map(lambda y: y * 2)
+
+        f = a.sma(2)
+        registry.clear()
+        assert len(registry) == 0
+        assert a.sma(2) is not f
+
+    assert a.sma(2) is not a.sma(2)
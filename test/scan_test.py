@@ -1 +1,162 @@
 # Currently tested by subclasses
+import pytest
+import numpy as np
+from curvepy.points import Points
+from curvepy.scan import CHECKPOINT_INTERVAL
+from curvepy.sma import SMA
+from curvepy.reducer import Mean, Quantile
+from . import test_util
+
+COUNT = 1000
+
+
+def _values():
+    return [float((i * 7) % 13) for i in range(COUNT)]
+
+
+def _scans(points):
+    return [
+        points.ema(0.1),
+        points.integral(),
+        points.sma(10),
+        points.accumulator_map(lambda ys: max(ys), 10),
+        points.accumulator_map(Mean(), 10),
+        points.accumulator_map(Quantile(0.5), 10),
+        points.trailing_max(5, is_period=False),
+    ]
+
+
+def _count_steps(f):
+    tfm = f.tfm
+    tfm_many = f.tfm_many
+    counter = {'steps': 0}
+
+    def counting_tfm(x, y):
+        counter['steps'] += 1
+        return tfm(x, y)
+
+    def counting_tfm_many(xs, *args):
+        counter['steps'] += len(xs)
+        return tfm_many(xs, *args)
+
+    f.tfm = counting_tfm
+    if tfm_many is not None:
+        f.tfm_many = counting_tfm_many
+    return counter
+
+
+def _resumes_from(f, counter, x):
+    # SMA only scans from the start of its window
+    if not isinstance(f, SMA):
+        assert counter['steps'] == COUNT - 1 - x
+
+
+def test_checkpoint_replace():
+    points = Points(test_util.point_gen(_values()))
+    scans = _scans(points)
+    counters = []
+    for f in scans:
+        f.tfm_many = None
+        counters.append(_count_steps(f))
+        f.y(COUNT - 1)
+
+    points.replace((900, 100.0))
+
+    expected_points = Points(test_util.point_gen(_values()))
+    expected_points.replace((900, 100.0))
+    for f, expected, counter in zip(scans, _scans(expected_points), counters):
+        expected.tfm_many = None
+        counter['steps'] = 0
+        assert f.y(COUNT - 1) == expected.y(COUNT - 1)
+        # Resumes from the last checkpoint before the update,
+        # recorded every `CHECKPOINT_INTERVAL` steps
+        _resumes_from(f, counter, 3 * CHECKPOINT_INTERVAL - 1)
+        assert f.sample_points(domain=(0, COUNT - 1)) == expected.sample_points(domain=(0, COUNT - 1))
+
+
+def test_checkpoint_bulk():
+    values = _values()
+    points = Points(test_util.point_gen(values[:500]))
+    scans = _scans(points)
+    counters = []
+    for f in scans:
+        counters.append(_count_steps(f))
+        f.y(499)
+
+    points.append_list(test_util.point_gen(values[500:], t_start=500))
+    for f in scans:
+        f.y(COUNT - 1)
+
+    points.replace((900, 100.0))
+
+    expected_points = Points(test_util.point_gen(values))
+    expected_points.replace((900, 100.0))
+    xs = np.arange(COUNT, dtype=float)
+    for f, expected, counter in zip(scans, _scans(expected_points), counters):
+        counter['steps'] = 0
+        assert np.allclose(f.y_many(xs), expected.y_many(xs), equal_nan=True)
+        if f.tfm_many is not None:
+            # Checkpoints are recorded after each bulk scan
+            _resumes_from(f, counter, 499)
+        else:
+            _resumes_from(f, counter, 3 * CHECKPOINT_INTERVAL - 1)
+
+
+def test_checkpoint_disabled():
+    points = Points(test_util.point_gen(_values()))
+    f = points.ema(0.1)
+    f.tfm_many = None
+    f.checkpoint_interval = None
+    counter = _count_steps(f)
+    f.y(COUNT - 1)
+
+    points.replace((900, 100.0))
+    counter['steps'] = 0
+    f.y(COUNT - 1)
+    assert counter['steps'] == COUNT
+
+
+def test_provisional_last_point():
+    values = _values()
+    points = Points(test_util.point_gen(values))
+    points.provisional_last_point = True
+    scans = _scans(points)
+    counters = []
+    for f in scans:
+        counters.append(_count_steps(f))
+        f.y(COUNT - 1)
+
+    for y in [100.0, -5.0, 3.0]:
+        points.replace((COUNT - 1, y))
+        expected_points = Points(test_util.point_gen(values[:-1] + [y]))
+        for f, expected, counter in zip(scans, _scans(expected_points), counters):
+            counter['steps'] = 0
+            assert f.y(COUNT - 1) == pytest.approx(expected.y(COUNT - 1))
+            # Only the last point is scanned again
+            assert counter['steps'] == 1
+
+    points.append((COUNT, 1.0))
+    points.replace((COUNT, 2.0))
+    expected_points = Points(test_util.point_gen(values[:-1] + [3.0, 2.0]))
+    for f, expected, counter in zip(scans, _scans(expected_points), counters):
+        counter['steps'] = 0
+        assert f.y(COUNT) == pytest.approx(expected.y(COUNT))
+        assert counter['steps'] == 1
+
+
+def test_provisional_last_point_disabled():
+    # Disabled by default, or for a single scan
+    for points_provisional, scan_provisional in [(False, None), (True, False)]:
+        points = Points(test_util.point_gen(_values()))
+        points.provisional_last_point = points_provisional
+        f = points.ema(0.1)
+        f.tfm_many = None
+        f.provisional_last_point = scan_provisional
+        counter = _count_steps(f)
+        f.y(COUNT - 1)
+
+        points.replace((COUNT - 1, 100.0))
+        counter['steps'] = 0
+        f.y(COUNT - 1)
+        # Resumes from the last periodic checkpoint
+        assert counter['steps'] == COUNT - 1 - (3 * CHECKPOINT_INTERVAL - 1)
@@ -26,4 +26,9 @@ def test_sin():
     assert s(2) == approx(1, rel=0.01)
     assert s(3) == approx(0, rel=0.01)
     assert s(4) == approx(-1, rel=0.01)
-    
\ No newline at end of file
+    
+
+def test_y_many():
+    s = Sin(amplitude=2, period=4, phase_x=-1)
+    xs = np.linspace(-2, 6, 17)
+    assert np.allclose(s.y_many(xs), [s(x) for x in xs])
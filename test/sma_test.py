@@ -28,6 +28,24 @@ def test_sma_degree_2_big_step():
     assert np.allclose(f.sample_points(), [(10, 1.5), (20, 2.5), (30, 3.5)])
     assert f(15) == 2
 
+def test_sma_large_degree():
+    values = [float((i * 7) % 13) for i in range(300)]
+    ps = Points(test_util.point_gen(values))
+    f = ps.sma(200)
+    assert f.domain.start == 199
+    for x in [199, 250, 299]:
+        # Average of the linear interpolation
+        window = values[x - 199:x + 1]
+        assert f(x) == pytest.approx((sum(window) - (window[0] + window[-1]) / 2) / 199)
+
+def test_x_step():
+    ps = Points(test_util.point_gen([1, 2, 3, 4, 5]))
+    for x in [-1, 0, 0.5, 2, 3.5, 4, 5]:
+        for steps in [-5, -3, -2, 2, 3, 5]:
+            for clamp in [False, True]:
+                expected = super(Points, ps).x_step(x, steps, clamp=clamp)
+                assert ps.x_step(x, steps, clamp=clamp) == expected
+
 def test_sma_period_1():
     f = Points(test_util.point_gen([1, 2, 3])).sma(1, is_period=True)
     assert np.allclose(f.sample_points(), [(0, 1), (1, 2), (2, 3)])
@@ -109,3 +127,24 @@ def test_append_to_empty():
 #     sma = runner.quote_func.close.sma(20 * 86400.0, is_period=True)
 #     sma_value = sma(sma.domain.end)
 #     assert True
+
+def test_bulk_sma():
+    values = [float((i * 7) % 13) for i in range(300)]
+    ps = Points(test_util.point_gen(values))
+    for is_period in [False, True]:
+        f = ps.sma(20, is_period=is_period)
+        expected = ps.sma(20, is_period=is_period)
+        expected.tfm_many = None
+        assert np.allclose(f.sample_points(), expected.sample_points())
+    ps.append_list(test_util.point_gen([1, 2, 3], t_start=300))
+    assert f(302) == pytest.approx(expected(302))
+
+def test_sma_y_many():
+    ps = Points([(0, 1), (1, 3), (3, 2), (4, 5), (6, 1), (7, 4), (9, 2)], uniform=False)
+    xs = [-1, 2, 3, 3.5, 4, 6, 6.5, 9, 10]
+    for degree, is_period in [(1, False), (3, False), (3, True), (5, True)]:
+        f = ps.sma(degree, is_period=is_period, uniform=False)
+        expected = [f.y(x) for x in xs]
+        f = ps.sma(degree, is_period=is_period, uniform=False)
+        ys = f.y_many(xs)
+        assert np.allclose(ys, [np.nan if y is None else y for y in expected], equal_nan=True)
@@ -0,0 +1,57 @@
+import pytest
+import math
+import numpy as np
+from curvepy import Points, Quotes
+from . import test_util
+from .quote import Quote
+
+VALUES = [float((i * 7) % 13) for i in range(100)]
+
+
+def test_trailing_degree():
+    points = Points(test_util.point_gen(VALUES))
+    for degree in [1, 2, 5, 20]:
+        f = points.trailing_max(degree)
+        g = points.trailing_min(degree)
+        for x in range(100):
+            window = VALUES[max(0, x - degree + 1):x + 1]
+            assert f(x) == max(window)
+            assert g(x) == min(window)
+
+
+def test_trailing_period():
+    points = Points(test_util.point_gen(VALUES, t_step=2))
+    for period in [1, 2, 5, 20]:
+        f = points.trailing_max(period, is_period=True)
+        expected = points.accumulator_map(max, period, is_period=True)
+        xs = np.arange(0, 198.5, 0.5)
+        assert np.allclose([f(x) for x in xs], [expected(x) for x in xs])
+
+
+def test_trailing_non_uniform():
+    points = Points([(0, 1), (1, 3), (3, 2), (4, 5), (6, 1), (7, 4), (9, 2)], uniform=False)
+    f = points.trailing_min(3, is_period=True, uniform=False)
+    assert np.allclose(f.sample_points(), [(0, 1), (1, 1), (3, 1), (4, 2), (6, 1), (7, 1), (9, 1)])
+
+
+def test_trailing_update():
+    points = Points(test_util.point_gen(VALUES))
+    f = points.trailing_max(5)
+    assert f(99) == max(VALUES[95:])
+    points.reset((50, math.inf))
+    assert f(99) is None
+    points.append_list(test_util.point_gen([1.0] * 50, t_start=50))
+    assert f(52) == max(VALUES[48:50])
+    assert f(99) == 1
+
+
+def test_quotes_trailing():
+    quotes = Quotes(1, quote_points=Quote.mock_ohlcv_points([
+        (1, 2, 0.5, 1.5),
+        (1.5, 3, 1, 2),
+        (2, 2.5, 0.8, 2.2),
+        (2.2, 2.4, 1.2, 2),
+    ], t_start=0, t_step=1))
+    assert quotes.trailing_high(2)(3) == 2.5
+    assert quotes.trailing_low(2)(3) == 0.8
+    assert quotes.trailing_low(3)(2) == 0.5
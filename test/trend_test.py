@@ -1,5 +1,53 @@
 import pytest
 import numpy as np
+from curvepy.points import Points
+from curvepy.trend import Trend
+from . import test_util
+
+
+def _trend_values(count):
+    return [100 + 10 * np.sin(i / 5) + i * 0.1 for i in range(count)]
+
+
+def _lines(trend):
+    return [list(line) for line in trend.lines]
+
+
+def test_checkpoint_update():
+    values = _trend_values(300)
+    ps = Points(test_util.point_gen(values))
+    trend = Trend(ps, 5)
+    trend.checkpoint_interval = 100
+    steps = []
+    tfm = trend.tfm
+    trend.tfm = lambda x, y: steps.append(x) or tfm(x, y)
+    trend(299)
+
+    ps.replace((250, 90))
+    values[250] = 90
+    expected = Trend(Points(test_util.point_gen(values)), 5)
+    expected(299)
+    steps.clear()
+    trend(299)
+    # Resumes from the last checkpoint before the update
+    assert steps[0] == 200
+    assert trend.points == expected.points
+    assert _lines(trend) == _lines(expected)
+
+
+def test_reset():
+    values = _trend_values(100)
+    ps = Points(test_util.point_gen(values))
+    trend = Trend(ps, 5)
+    trend(99)
+    ps.replace((50, 90))
+    values[50] = 90
+    expected = Trend(Points(test_util.point_gen(values)), 5)
+    expected(99)
+    trend(99)
+    assert trend.points == expected.points
+    assert _lines(trend) == _lines(expected)
+
 
 # def test_straight_line():
 #     ps = Points(test_util.point_gen([1, 1, 1]))